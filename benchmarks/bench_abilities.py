@@ -0,0 +1,164 @@
+"""Benchmarks for the hot paths of the built-in abilities."""
+
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+import pytz
+from harness import benchmark
+
+from bruno_abilities.abilities.alarm_ability import Alarm, AlarmAbility
+from bruno_abilities.abilities.notes_ability import NotesAbility
+from bruno_abilities.abilities.reminder_ability import Reminder, ReminderAbility
+from bruno_abilities.abilities.timer_ability import TimerAbility
+from bruno_abilities.abilities.todo_ability import TodoAbility
+from bruno_abilities.base.ability_base import AbilityContext
+from bruno_abilities.schemas import TaskStatus
+
+CONTEXT = AbilityContext(user_id="bench_user")
+WORDS = [
+    "groceries", "meeting", "project", "deadline", "review", "invoice", "travel",
+    "dentist", "birthday", "release", "budget", "report", "garden", "laundry",
+]  # fmt: skip
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Generate filler text."""
+    return " ".join(rng.choices(WORDS, k=words))
+
+
+@benchmark("timer.create_cancel", size=10_000, quick_size=1_000)
+async def timer_create_cancel(size):
+    """Create and cancel a timer while `size` timers are running."""
+    ability = TimerAbility()
+    await ability.initialize()
+    for _ in range(size):
+        await ability._create_timer({"duration": 3600}, CONTEXT)
+
+    async def op():
+        result = await ability._create_timer({"duration": 3600}, CONTEXT)
+        await ability._cancel_timer({"timer_id": result.data["timer_id"]}, CONTEXT)
+
+    yield op
+    await ability.cleanup()
+
+
+@benchmark("alarm.monitor_tick", size=100_000, quick_size=10_000)
+async def alarm_monitor_tick(size):
+    """One alarm monitor pass over `size` alarms, none of them due."""
+    ability = AlarmAbility()
+    future = datetime.now() + timedelta(days=1)
+    for index in range(size):
+        alarm_id = f"alarm_{index}"
+        ability._alarms[alarm_id] = Alarm(
+            alarm_id=alarm_id, name=alarm_id, alarm_time=future, user_id=f"user_{index % 100}"
+        )
+
+    yield lambda: ability._check_alarms(datetime.now(pytz.UTC))
+
+
+@benchmark("reminder.monitor_tick", size=100_000, quick_size=10_000)
+async def reminder_monitor_tick(size):
+    """One reminder monitor pass over `size` reminders, none of them due."""
+    ability = ReminderAbility()
+    future = datetime.now(pytz.UTC) + timedelta(days=1)
+    for index in range(size):
+        reminder_id = f"reminder_{index}"
+        ability._reminders[reminder_id] = Reminder(
+            reminder_id=reminder_id,
+            title=reminder_id,
+            remind_at=future,
+            user_id=f"user_{index % 100}",
+        )
+
+    yield lambda: ability._check_reminders(datetime.now(pytz.UTC))
+
+
+async def populated_notes(size: int) -> NotesAbility:
+    """Notes ability with `size` notes for the bench user."""
+    rng = random.Random(42)
+    ability = NotesAbility()
+    for index in range(size):
+        await ability._create_note(
+            {
+                "title": f"{sentence(rng, 3)} {index}",
+                "content": sentence(rng, 40),
+                "tags": ",".join(rng.sample(WORDS, 2)),
+            },
+            CONTEXT,
+        )
+    return ability
+
+
+@benchmark("notes.search", size=10_000, quick_size=1_000)
+async def notes_search(size):
+    """Full-text note search over `size` notes."""
+    ability = await populated_notes(size)
+    yield lambda: ability._search_notes({"search_query": "budget report"}, CONTEXT)
+
+
+async def populated_todo(size: int) -> TodoAbility:
+    """Todo ability with `size` tasks in mixed states for the bench user."""
+    rng = random.Random(42)
+    ability = TodoAbility()
+    now = datetime.now()
+    statuses = list(TaskStatus)
+    for index in range(size):
+        result = await ability._create_task(
+            {
+                "title": f"{sentence(rng, 4)} {index}",
+                "priority": rng.choice(["low", "medium", "high", "urgent"]),
+                "project": rng.choice(WORDS[:5]),
+            },
+            CONTEXT,
+        )
+        task = ability._tasks[result.data["task_id"]]
+        task.status = rng.choice(statuses)
+        if index % 3 == 0:
+            task.due_date = now + timedelta(days=rng.randint(-10, 30))
+    return ability
+
+
+@benchmark("todo.list", size=50_000, quick_size=5_000)
+async def todo_list(size):
+    """List tasks filtered by status over `size` tasks."""
+    ability = await populated_todo(size)
+    yield lambda: ability._list_tasks({"status": "todo"}, CONTEXT)
+
+
+@benchmark("todo.list_cached", size=50_000, quick_size=5_000)
+async def todo_list_cached(size):
+    """List tasks through execute, served from the result cache."""
+    ability = await populated_todo(size)
+    parameters = {"action": "list", "status": "todo"}
+    await ability.execute(parameters, CONTEXT)
+    yield lambda: ability.execute(parameters, CONTEXT)
+
+
+@benchmark("todo.stats", size=50_000, quick_size=5_000)
+async def todo_stats(size):
+    """Productivity statistics over `size` tasks."""
+    ability = await populated_todo(size)
+    yield lambda: ability._get_stats({}, CONTEXT)
+
+
+@benchmark("music.scan_library", size=20_000, quick_size=2_000, max_rounds=3)
+async def music_scan_library(size):
+    """Rescan a synthetic library of `size` files already in the library."""
+    # Scanning never plays audio, so headless machines can use SDL's null device
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    from bruno_abilities.abilities.music_ability import MusicAbility
+
+    with tempfile.TemporaryDirectory() as root:
+        for index in range(size):
+            folder = os.path.join(root, f"artist_{index % 200}", f"album_{index % 20}")
+            os.makedirs(folder, exist_ok=True)
+            extension = ".mp3" if index % 10 else ".txt"
+            open(os.path.join(folder, f"track_{index}{extension}"), "w").close()
+
+        ability = MusicAbility()
+        parameters = {"library_path": root}
+        await ability._scan_library(parameters, CONTEXT)
+
+        yield lambda: ability._scan_library(parameters, CONTEXT)
@@ -0,0 +1,119 @@
+"""Benchmarks for the ability framework and infrastructure."""
+
+import tempfile
+import time
+from pathlib import Path
+
+from harness import benchmark
+
+from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.decorators import RateLimiter
+from bruno_abilities.base.metadata import AbilityMetadata, ParameterMetadata, ParameterType
+from bruno_abilities.infrastructure.state_manager import StateManager, StateScope
+
+CONTEXT = AbilityContext(user_id="bench_user")
+
+
+class EchoAbility(BaseAbility):
+    """Ability doing no work, to isolate framework overhead."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._metadata = AbilityMetadata(
+            name="echo",
+            display_name="Echo",
+            description="Returns its input",
+            category="bench",
+            parameters=[
+                ParameterMetadata(
+                    name="action",
+                    type=str,
+                    parameter_type=ParameterType.STRING,
+                    description="Action",
+                    required=True,
+                ),
+                ParameterMetadata(
+                    name="count",
+                    type=int,
+                    parameter_type=ParameterType.INTEGER,
+                    description="Count",
+                    required=False,
+                    default=1,
+                ),
+                ParameterMetadata(
+                    name="mode",
+                    type=str,
+                    parameter_type=ParameterType.STRING,
+                    description="Mode",
+                    required=False,
+                    default="fast",
+                ),
+            ],
+        )
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return self._metadata
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        return AbilityResult(success=True, data=parameters)
+
+
+@benchmark("core.execute", number=1000)
+async def execute_overhead(size):
+    """BaseAbility.execute around a no-op _execute."""
+    ability = EchoAbility()
+    await ability.initialize()
+    parameters = {"action": "echo", "count": 3}
+    yield lambda: ability.execute(parameters, CONTEXT)
+    await ability.cleanup()
+
+
+@benchmark("core.validate_parameters", number=1000)
+async def validate_parameters(size):
+    """_validate_parameters with a coerced value and a default."""
+    ability = EchoAbility()
+    parameters = {"action": "echo", "count": "3"}
+    yield lambda: ability._validate_parameters(parameters)
+
+
+@benchmark("state.set", size=10_000, quick_size=1_000, number=100)
+async def state_set(size):
+    """StateManager.set over a store holding `size` user entries."""
+    with tempfile.TemporaryDirectory() as path:
+        manager = StateManager(storage_path=Path(path))
+        for index in range(size):
+            await manager.set(f"key_{index}", index, scope=StateScope.USER, user_id="bench_user")
+
+        counter = iter(range(10**9))
+
+        async def op():
+            index = next(counter) % size
+            await manager.set(f"key_{index}", index, scope=StateScope.USER, user_id="bench_user")
+
+        yield op
+
+
+@benchmark("state.get", size=10_000, quick_size=1_000, number=1000)
+async def state_get(size):
+    """StateManager.get over a store holding `size` user entries."""
+    with tempfile.TemporaryDirectory() as path:
+        manager = StateManager(storage_path=Path(path))
+        for index in range(size):
+            await manager.set(f"key_{index}", index, scope=StateScope.USER, user_id="bench_user")
+
+        counter = iter(range(10**9))
+
+        def op():
+            index = next(counter) % size
+            return manager.get(f"key_{index}", scope=StateScope.USER, user_id="bench_user")
+
+        yield op
+
+
+@benchmark("rate_limiter.acquire", size=1_000, number=1000)
+async def rate_limiter_acquire(size):
+    """RateLimiter.acquire with `size` calls already inside the window."""
+    limiter = RateLimiter(max_calls=size + 10**7, time_window=3600)
+    limiter.calls["bench_user"] = [time.time()] * size
+    yield lambda: limiter.acquire("bench_user")
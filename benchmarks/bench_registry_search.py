@@ -0,0 +1,107 @@
+"""
+Benchmark for AbilityRegistry.search with many registered abilities.
+
+Compares the indexed registry search against a linear scan over
+``AbilityMetadata.matches_query``, the previous implementation.
+
+The indexed search is also registered with the benchmark suite as
+``registry.search`` (see run.py).
+
+Usage:
+    python benchmarks/bench_registry_search.py [--abilities 1000] [--rounds 200]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import string
+import time
+
+from harness import benchmark
+
+from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.registry.registry import AbilityRegistry
+
+QUERIES = ["timer", "weather", "calc", "photo requests", "zzz", "note_"]
+WORDS = [
+    "timer", "alarm", "note", "todo", "music", "weather", "calendar", "email",
+    "reminder", "search", "translate", "calculate", "news", "map", "photo", "shopping",
+]  # fmt: skip
+
+
+class BenchAbility(BaseAbility):
+    """Ability with generated metadata."""
+
+    def __init__(self, index: int, rng: random.Random) -> None:
+        super().__init__()
+        words = rng.sample(WORDS, 4)
+        suffix = "".join(rng.choices(string.ascii_lowercase, k=4))
+        self._metadata = AbilityMetadata(
+            name=f"{words[0]}_{suffix}_{index}",
+            display_name=f"{words[0].title()} {index}",
+            description=f"Handles {words[1]} and {words[2]} requests for the user",
+            category=words[3],
+            tags=words[1:4],
+            aliases=[f"{words[0]} {suffix}"],
+        )
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return self._metadata
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        return AbilityResult(success=True)
+
+
+async def build_registry(count: int) -> AbilityRegistry:
+    """Register generated abilities."""
+    rng = random.Random(42)
+    registry = AbilityRegistry()
+    for index in range(count):
+        await registry.register(BenchAbility(index, rng))
+    return registry
+
+
+def linear_search(registry: AbilityRegistry, query: str) -> list[BaseAbility]:
+    """Reference implementation scanning every ability."""
+    return [a for a in registry._abilities.values() if a.metadata.matches_query(query)]
+
+
+@benchmark("registry.search", size=1000, number=len(QUERIES) * 100)
+async def registry_search(size):
+    """Indexed AbilityRegistry.search over `size` abilities."""
+    registry = await build_registry(size)
+    queries = itertools.cycle(QUERIES)
+    yield lambda: registry.search(next(queries), limit=10)
+
+
+def measure(fn, queries: list[str], rounds: int) -> float:
+    """Return mean microseconds per query."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for query in queries:
+            fn(query)
+    return (time.perf_counter() - start) / (rounds * len(queries)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--abilities", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    registry = asyncio.run(build_registry(args.abilities))
+    results = {
+        "abilities": args.abilities,
+        "indexed_us": measure(lambda q: registry.search(q, limit=10), QUERIES, args.rounds),
+        "linear_us": measure(lambda q: linear_search(registry, q), QUERIES, args.rounds),
+    }
+    results["speedup"] = results["linear_us"] / results["indexed_us"]
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Minimal benchmark harness.
+
+Benchmarks are async generator functions registered with :func:`benchmark`.
+Each one builds its fixture for a given problem size, yields the operation
+to time, and cleans up after the yield:
+
+    @benchmark("todo.list", size=50_000, quick_size=5_000)
+    async def todo_list(size):
+        ability = await populated_todo(size)
+        yield lambda: ability._list_tasks({}, CONTEXT)
+        await ability.cleanup()
+
+The operation may return an awaitable, which is then awaited. It is called
+``number`` times per round and timings are reported per call, in seconds.
+"""
+
+import asyncio
+import contextlib
+import inspect
+import statistics
+import time
+from collections.abc import AsyncIterator, Callable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+# Results file format version
+FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    """A registered benchmark."""
+
+    name: str
+    setup: Callable[[int], AsyncIterator[Callable[[], Any]]]
+    size: int
+    quick_size: int
+    number: int
+    max_rounds: int | None
+    description: str
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """Timings of one benchmark, in seconds per call."""
+
+    size: int
+    number: int
+    rounds: int
+    mean: float
+    median: float
+    min: float
+    max: float
+    stdev: float
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to JSON-compatible data."""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Median of one benchmark against its baseline."""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def change(self) -> float:
+        """Relative change (positive is slower)."""
+        return self.current / self.baseline - 1 if self.baseline else 0.0
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    size: int = 1,
+    quick_size: int | None = None,
+    number: int = 1,
+    max_rounds: int | None = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Register a benchmark.
+
+    Args:
+        name: Benchmark name (dotted, grouped by area)
+        size: Problem size for full runs
+        quick_size: Problem size for quick runs (defaults to size)
+        number: Calls of the operation per timed round
+        max_rounds: Cap on timed rounds, for slow benchmarks
+
+    Returns:
+        Decorator registering the setup function
+    """
+
+    def decorator(func: Callable) -> Callable:
+        if name in BENCHMARKS:
+            raise ValueError(f"Duplicate benchmark: {name}")
+        BENCHMARKS[name] = Benchmark(
+            name=name,
+            setup=func,
+            size=size,
+            quick_size=quick_size or size,
+            number=number,
+            max_rounds=max_rounds,
+            description=(inspect.getdoc(func) or "").split("\n")[0],
+        )
+        return func
+
+    return decorator
+
+
+async def run_benchmark(
+    bench: Benchmark, rounds: int, quick: bool = False, warmup: int = 1
+) -> BenchResult:
+    """
+    Run one benchmark.
+
+    Args:
+        bench: Benchmark to run
+        rounds: Timed rounds
+        quick: Use the quick problem size
+        warmup: Untimed rounds run first
+
+    Returns:
+        Timings per call
+    """
+    size = bench.quick_size if quick else bench.size
+    number = bench.number
+    if bench.max_rounds is not None:
+        rounds = min(rounds, bench.max_rounds)
+    samples = []
+
+    async with contextlib.asynccontextmanager(bench.setup)(size) as op:
+        # Probe whether the operation returns awaitables
+        probe = op()
+        is_async = inspect.isawaitable(probe)
+        if is_async:
+            await probe
+
+        for index in range(warmup + rounds):
+            start = time.perf_counter_ns()
+            if is_async:
+                for _ in range(number):
+                    await op()
+            else:
+                for _ in range(number):
+                    op()
+            elapsed = time.perf_counter_ns() - start
+            if index >= warmup:
+                samples.append(elapsed / number / 1e9)
+
+    return BenchResult(
+        size=size,
+        number=number,
+        rounds=rounds,
+        mean=statistics.fmean(samples),
+        median=statistics.median(samples),
+        min=min(samples),
+        max=max(samples),
+        stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    )
+
+
+def run_all(
+    names: list[str], rounds: int, quick: bool = False, report: Callable[[str], None] = print
+) -> dict[str, BenchResult]:
+    """
+    Run benchmarks, each on a fresh event loop.
+
+    Args:
+        names: Benchmarks to run
+        rounds: Timed rounds per benchmark
+        quick: Use the quick problem sizes
+        report: Called with a progress line after each benchmark
+
+    Returns:
+        Results by benchmark name
+    """
+    results = {}
+    for name in names:
+        result = asyncio.run(run_benchmark(BENCHMARKS[name], rounds, quick))
+        results[name] = result
+        report(f"{name:<32} size={result.size:<7} median={format_duration(result.median)}")
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, Any]], baseline: dict[str, dict[str, Any]]
+) -> list[Comparison]:
+    """
+    Compare medians of benchmarks present in both result sets.
+
+    Benchmarks run at a different size than in the baseline are skipped.
+
+    Args:
+        results: Current results by name
+        baseline: Baseline results by name
+
+    Returns:
+        Comparisons ordered by name
+    """
+    return [
+        Comparison(name=name, baseline=baseline[name]["median"], current=result["median"])
+        for name, result in sorted(results.items())
+        if name in baseline and baseline[name]["size"] == result["size"]
+    ]
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration with a readable unit."""
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:8.2f} {unit}"
+    return f"{seconds / 1e-9:8.2f} ns"
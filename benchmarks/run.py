@@ -0,0 +1,111 @@
+"""
+Run the benchmark suite.
+
+Results are written as JSON; given a baseline results file, medians are
+compared against it and the exit status is non-zero if any benchmark got
+slower than the threshold, so the suite can gate regressions in CI.
+
+Usage:
+    python benchmarks/run.py [-k NAME] [--quick] [--rounds 10]
+                             [--output results.json]
+                             [--baseline baseline.json] [--threshold 0.25]
+"""
+
+import argparse
+import importlib
+import json
+import logging
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import structlog
+from harness import BENCHMARKS, FORMAT_VERSION, compare, format_duration, run_all
+
+BENCH_DIR = Path(__file__).parent
+
+
+def load_benchmarks() -> None:
+    """Import every bench_*.py module so its benchmarks register."""
+    for path in sorted(BENCH_DIR.glob("bench_*.py")):
+        importlib.import_module(path.stem)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "-k",
+        dest="filters",
+        action="append",
+        default=[],
+        help="only run benchmarks whose name contains this (repeatable)",
+    )
+    parser.add_argument("--quick", action="store_true", help="use small problem sizes")
+    parser.add_argument("--rounds", type=int, default=10, help="timed rounds per benchmark")
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against this results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed relative slowdown of the median (default: 0.25)",
+    )
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args()
+
+    # Log output would dominate the timings
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    load_benchmarks()
+    names = [
+        name
+        for name in sorted(BENCHMARKS)
+        if not args.filters or any(text in name for text in args.filters)
+    ]
+
+    if args.list:
+        for name in names:
+            print(f"{name:<32} {BENCHMARKS[name].description}")
+        return 0
+
+    results = run_all(names, args.rounds, quick=args.quick)
+    data = {
+        "format": FORMAT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "benchmarks": {name: result.to_dict() for name, result in results.items()},
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(data, indent=2) + "\n")
+        print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    comparisons = compare(data["benchmarks"], baseline["benchmarks"])
+    regressions = [c for c in comparisons if c.change > args.threshold]
+
+    print(f"\nCompared with {args.baseline}:")
+    for c in comparisons:
+        flag = "  REGRESSION" if c in regressions else ""
+        print(
+            f"{c.name:<32} {format_duration(c.baseline)} -> {format_duration(c.current)}"
+            f" ({c.change:+7.1%}){flag}"
+        )
+
+    missing = sorted(set(data["benchmarks"]) - {c.name for c in comparisons})
+    if missing:
+        print(f"Not in baseline (or different size): {', '.join(missing)}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,18 +14,21 @@ from enum import Enum
 from typing import Any
 
 import pytz
-import structlog
 from dateutil import parser as date_parser
 
 from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.deadline import create_detached_task
+from bruno_abilities.base.log_policy import get_policy_logger
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
     ParameterMetadata,
     ParameterType,
 )
+from bruno_abilities.base.metrics import get_metrics
+from bruno_abilities.base.tracing import start_span
 
-logger = structlog.get_logger(__name__)
+logger = get_policy_logger(__name__, ability="alarm")
 
 
 class AlarmState(str, Enum):
@@ -150,6 +153,13 @@ class AlarmAbility(BaseAbility):
         self._user_alarms: dict[str, list[str]] = {}  # user_id -> [alarm_ids]
         self._alarm_counter = 0
         self._monitor_task: asyncio.Task | None = None
+        get_metrics().register_gauge(
+            "active_alarms", self._count_active_alarms, "Alarms scheduled to ring"
+        )
+
+    def _count_active_alarms(self) -> int:
+        """Count alarms that are scheduled to ring."""
+        return sum(alarm.state == AlarmState.ACTIVE for alarm in list(self._alarms.values()))
 
     @property
     def metadata(self) -> AbilityMetadata:
@@ -249,7 +259,7 @@ class AlarmAbility(BaseAbility):
     async def initialize(self) -> None:
         """Initialize and start alarm monitoring."""
         await super().initialize()
-        self._monitor_task = asyncio.create_task(self._monitor_alarms())
+        self._monitor_task = create_detached_task(self._monitor_alarms())
         logger.info("Alarm monitoring started")
 
     async def _execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
@@ -397,26 +407,7 @@ class AlarmAbility(BaseAbility):
         """Monitor alarms and trigger them at the right time."""
         try:
             while not self.is_cancelled():
-                now = datetime.now(pytz.UTC)
-
-                for alarm in list(self._alarms.values()):
-                    if alarm.state != AlarmState.ACTIVE:
-                        continue
-
-                    if alarm.next_trigger is None:
-                        continue
-
-                    # Make both timezone-aware for comparison
-                    next_trigger = alarm.next_trigger
-                    if next_trigger.tzinfo is None:
-                        tz = pytz.timezone(alarm.timezone)
-                        next_trigger = tz.localize(next_trigger)
-
-                    # Convert to UTC for comparison
-                    next_trigger_utc = next_trigger.astimezone(pytz.UTC)
-
-                    if now >= next_trigger_utc:
-                        await self._trigger_alarm(alarm)
+                await self._check_alarms(datetime.now(pytz.UTC))
 
                 # Check every second
                 await asyncio.sleep(1)
@@ -428,6 +419,28 @@ class AlarmAbility(BaseAbility):
         except Exception as e:
             logger.error("Alarm monitoring error", error=str(e))
 
+    async def _check_alarms(self, now: datetime) -> None:
+        """Trigger every active alarm that is due at the given UTC time."""
+        for alarm in list(self._alarms.values()):
+            if alarm.state != AlarmState.ACTIVE:
+                continue
+
+            if alarm.next_trigger is None:
+                continue
+
+            # Make both timezone-aware for comparison
+            next_trigger = alarm.next_trigger
+            if next_trigger.tzinfo is None:
+                tz = pytz.timezone(alarm.timezone)
+                next_trigger = tz.localize(next_trigger)
+
+            # Convert to UTC for comparison
+            next_trigger_utc = next_trigger.astimezone(pytz.UTC)
+
+            if now >= next_trigger_utc:
+                with start_span("alarm.trigger", {"alarm.id": alarm.alarm_id}, root=True):
+                    await self._trigger_alarm(alarm)
+
     async def _trigger_alarm(self, alarm: Alarm) -> None:
         """Trigger an alarm."""
         alarm.state = AlarmState.TRIGGERED
@@ -443,7 +456,8 @@ class AlarmAbility(BaseAbility):
         # Call notification callback if set
         if alarm.callback:
             try:
-                await alarm.callback(alarm)
+                with start_span("alarm.callback"):
+                    await alarm.callback(alarm)
             except Exception as e:
                 logger.error(
                     "Alarm callback failed",
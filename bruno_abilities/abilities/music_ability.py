@@ -19,6 +19,7 @@ from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, Bas
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
+    ConcurrencyLimits,
     ParameterMetadata,
     ParameterType,
 )
@@ -175,6 +176,7 @@ class MusicAbility(BaseAbility):
             capabilities=[
                 AbilityCapability.CANCELLABLE,
             ],
+            concurrency=ConcurrencyLimits(max_in_flight=8, max_in_flight_per_user=4, max_queue=16),
             aliases=["music", "play music", "audio", "player"],
             examples=[
                 {
@@ -16,6 +16,8 @@ from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, Bas
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
+    CachePolicy,
+    ConcurrencyLimits,
     ParameterMetadata,
     ParameterType,
 )
@@ -189,7 +191,11 @@ class NotesAbility(BaseAbility):
             ],
             capabilities=[
                 AbilityCapability.CANCELLABLE,
+                AbilityCapability.CPU_BOUND,
             ],
+            cache=CachePolicy(read_actions=["read", "search", "list", "list_templates"]),
+            coalesce=True,
+            concurrency=ConcurrencyLimits(max_in_flight_per_user=4, max_queue=16),
             aliases=["note", "create note", "take notes"],
             examples=[
                 {
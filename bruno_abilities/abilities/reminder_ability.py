@@ -14,17 +14,20 @@ from typing import Any
 
 import dateparser
 import pytz
-import structlog
 
 from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.deadline import create_detached_task
+from bruno_abilities.base.log_policy import get_policy_logger
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
     ParameterMetadata,
     ParameterType,
 )
+from bruno_abilities.base.metrics import get_metrics
+from bruno_abilities.base.tracing import start_span
 
-logger = structlog.get_logger(__name__)
+logger = get_policy_logger(__name__, ability="reminder")
 
 
 class ReminderState(str, Enum):
@@ -92,6 +95,16 @@ class ReminderAbility(BaseAbility):
         self._user_reminders: dict[str, list[str]] = {}  # user_id -> [reminder_ids]
         self._reminder_counter = 0
         self._monitor_task: asyncio.Task | None = None
+        get_metrics().register_gauge(
+            "active_reminders", self._count_active_reminders, "Reminders pending delivery"
+        )
+
+    def _count_active_reminders(self) -> int:
+        """Count reminders that are still pending (including snoozed ones)."""
+        return sum(
+            reminder.state in (ReminderState.ACTIVE, ReminderState.SNOOZED)
+            for reminder in list(self._reminders.values())
+        )
 
     @property
     def metadata(self) -> AbilityMetadata:
@@ -222,7 +235,7 @@ class ReminderAbility(BaseAbility):
     async def initialize(self) -> None:
         """Initialize and start reminder monitoring."""
         await super().initialize()
-        self._monitor_task = asyncio.create_task(self._monitor_reminders())
+        self._monitor_task = create_detached_task(self._monitor_reminders())
         logger.info("Reminder monitoring started")
 
     async def _execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
@@ -362,23 +375,7 @@ class ReminderAbility(BaseAbility):
         """Monitor reminders and trigger them at the right time."""
         try:
             while not self.is_cancelled():
-                now = datetime.now(pytz.UTC)
-
-                for reminder in list(self._reminders.values()):
-                    if reminder.state != ReminderState.ACTIVE:
-                        continue
-
-                    # Check if snoozed
-                    trigger_time = (
-                        reminder.snoozed_until if reminder.snoozed_until else reminder.remind_at
-                    )
-
-                    # Make timezone-aware if needed
-                    if trigger_time.tzinfo is None:
-                        trigger_time = pytz.UTC.localize(trigger_time)
-
-                    if now >= trigger_time:
-                        await self._trigger_reminder(reminder)
+                await self._check_reminders(datetime.now(pytz.UTC))
 
                 # Check every second
                 await asyncio.sleep(1)
@@ -390,6 +387,25 @@ class ReminderAbility(BaseAbility):
         except Exception as e:
             logger.error("Reminder monitoring error", error=str(e))
 
+    async def _check_reminders(self, now: datetime) -> None:
+        """Trigger every active reminder that is due at the given UTC time."""
+        for reminder in list(self._reminders.values()):
+            if reminder.state != ReminderState.ACTIVE:
+                continue
+
+            # Check if snoozed
+            trigger_time = reminder.snoozed_until if reminder.snoozed_until else reminder.remind_at
+
+            # Make timezone-aware if needed
+            if trigger_time.tzinfo is None:
+                trigger_time = pytz.UTC.localize(trigger_time)
+
+            if now >= trigger_time:
+                with start_span(
+                    "reminder.trigger", {"reminder.id": reminder.reminder_id}, root=True
+                ):
+                    await self._trigger_reminder(reminder)
+
     async def _trigger_reminder(self, reminder: Reminder) -> None:
         """Trigger a reminder."""
         logger.info(
@@ -401,7 +417,8 @@ class ReminderAbility(BaseAbility):
         # Call notification callback if set
         if reminder.callback:
             try:
-                await reminder.callback(reminder)
+                with start_span("reminder.callback"):
+                    await reminder.callback(reminder)
             except Exception as e:
                 logger.error(
                     "Reminder callback failed",
@@ -12,17 +12,19 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any
 
-import structlog
-
 from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.deadline import create_detached_task
+from bruno_abilities.base.log_policy import get_policy_logger
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
     ParameterMetadata,
     ParameterType,
 )
+from bruno_abilities.base.metrics import get_metrics
+from bruno_abilities.base.tracing import start_span
 
-logger = structlog.get_logger(__name__)
+logger = get_policy_logger(__name__, ability="timer")
 
 
 class TimerState(str, Enum):
@@ -75,6 +77,16 @@ class TimerAbility(BaseAbility):
         self._timers: dict[str, Timer] = {}  # timer_id -> Timer
         self._user_timers: dict[str, list[str]] = {}  # user_id -> [timer_ids]
         self._timer_counter = 0
+        get_metrics().register_gauge(
+            "active_timers", self._count_active_timers, "Timers running or paused"
+        )
+
+    def _count_active_timers(self) -> int:
+        """Count timers that are running or paused."""
+        return sum(
+            timer.state in (TimerState.RUNNING, TimerState.PAUSED)
+            for timer in list(self._timers.values())
+        )
 
     @property
     def metadata(self) -> AbilityMetadata:
@@ -209,7 +221,7 @@ class TimerAbility(BaseAbility):
         self._user_timers[context.user_id].append(timer_id)
 
         # Start timer task
-        timer.task = asyncio.create_task(self._run_timer(timer))
+        timer.task = create_detached_task(self._run_timer(timer))
 
         logger.info(
             "Timer created",
@@ -266,7 +278,8 @@ class TimerAbility(BaseAbility):
             # Call notification callback if set
             if timer.callback:
                 try:
-                    await timer.callback(timer)
+                    with start_span("timer.callback", {"timer.id": timer.timer_id}, root=True):
+                        await timer.callback(timer)
                 except Exception as e:
                     logger.error(
                         "Timer callback failed",
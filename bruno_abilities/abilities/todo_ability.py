@@ -17,6 +17,7 @@ from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, Bas
 from bruno_abilities.base.metadata import (
     AbilityCapability,
     AbilityMetadata,
+    CachePolicy,
     ParameterMetadata,
     ParameterType,
 )
@@ -190,7 +191,11 @@ class TodoAbility(BaseAbility):
             ],
             capabilities=[
                 AbilityCapability.CANCELLABLE,
+                AbilityCapability.CPU_BOUND,
             ],
+            # Stats count tasks due today, so cached results expire
+            cache=CachePolicy(read_actions=["list", "search", "stats"], ttl=60),
+            coalesce=True,
             aliases=["task", "todo list", "tasks"],
             examples=[
                 {
@@ -1,16 +1,84 @@
 """Base classes and utilities for Bruno abilities."""
 
 from bruno_abilities.base.ability_base import BaseAbility
-from bruno_abilities.base.decorators import rate_limit, retry, timeout
-from bruno_abilities.base.metadata import AbilityMetadata, ParameterMetadata
+from bruno_abilities.base.bulkhead import Bulkhead, BulkheadStats
+from bruno_abilities.base.deadline import (
+    DeadlineExceededError,
+    create_detached_task,
+    deadline_scope,
+    remaining,
+)
+from bruno_abilities.base.decorators import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    circuit_breaker,
+    rate_limit,
+    retry,
+    timeout,
+)
+from bruno_abilities.base.idempotency import (
+    IdempotencyStore,
+    get_idempotency_store,
+    set_idempotency_store,
+)
+from bruno_abilities.base.log_policy import PolicyLogger, get_policy_logger, lazy
+from bruno_abilities.base.metadata import (
+    AbilityMetadata,
+    CachePolicy,
+    ConcurrencyLimits,
+    LogPolicy,
+    ParameterMetadata,
+)
+from bruno_abilities.base.metrics import MetricsRegistry, get_metrics
 from bruno_abilities.base.parameter_extractor import ParameterExtractor
+from bruno_abilities.base.profiler import SamplingProfiler, get_profiler
+from bruno_abilities.base.result_cache import ResultCache
+from bruno_abilities.base.tracing import (
+    Span,
+    SpanCollector,
+    get_collector,
+    set_collector,
+    start_span,
+    traced,
+)
 
 __all__ = [
     "BaseAbility",
     "AbilityMetadata",
     "ParameterMetadata",
+    "ConcurrencyLimits",
+    "CachePolicy",
+    "ResultCache",
+    "LogPolicy",
+    "PolicyLogger",
+    "get_policy_logger",
+    "lazy",
+    "Bulkhead",
+    "BulkheadStats",
+    "DeadlineExceededError",
+    "create_detached_task",
+    "deadline_scope",
+    "remaining",
+    "IdempotencyStore",
+    "get_idempotency_store",
+    "set_idempotency_store",
+    "MetricsRegistry",
+    "get_metrics",
     "ParameterExtractor",
+    "SamplingProfiler",
+    "get_profiler",
+    "Span",
+    "SpanCollector",
+    "start_span",
+    "traced",
+    "set_collector",
+    "get_collector",
     "retry",
+    "RetryBudget",
+    "circuit_breaker",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "timeout",
     "rate_limit",
 ]
@@ -6,6 +6,7 @@ implementing bruno-core's AbilityInterface with common functionality.
 """
 
 import asyncio
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from typing import Any
@@ -14,10 +15,40 @@ import structlog
 from pydantic import BaseModel, ConfigDict
 from pydantic import ValidationError as PydanticValidationError
 
+from bruno_abilities.base.bulkhead import Bulkhead, BulkheadFullError, BulkheadStats
+from bruno_abilities.base.deadline import (
+    DeadlineExceededError,
+    current_deadline,
+    effective_deadline,
+)
+from bruno_abilities.base.idempotency import get_idempotency_store
+from bruno_abilities.base.log_policy import PolicyLogger, set_ability_policy
 from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.base.metrics import action_label, get_metrics
+from bruno_abilities.base.profiler import current_execution
+from bruno_abilities.base.result_cache import ResultCache, cache_key
+from bruno_abilities.base.tracing import start_span
 
 logger = structlog.get_logger(__name__)
 
+# Counters incremented for execution outcomes, in addition to the latency histogram
+_OUTCOME_COUNTERS = {
+    "invalid": "validation_failures",
+    "cancelled": "cancellations",
+    "rejected": "rejections",
+    "error": "errors",
+    "coalesced": "coalesced",
+    "replayed": "idempotent_replays",
+    "deadline_exceeded": "deadline_exceeded",
+}
+
+# AbilityContext.metadata key of a client-supplied idempotency key
+IDEMPOTENCY_KEY = "idempotency_key"
+
+# Single-flight key: user ID with the canonical parameters of a read, or
+# with the idempotency key of a keyed call
+_FlightKey = tuple[str, str | None, str | None]
+
 
 class AbilityResult(BaseModel):
     """Result returned from ability execution."""
@@ -40,6 +71,18 @@ class AbilityContext(BaseModel):
     session_id: str | None = None
     conversation_id: str | None = None
     metadata: dict[str, Any] = {}
+    deadline: float | None = None  # Unix time by which the request must complete
+
+    def remaining(self) -> float | None:
+        """
+        Get the time left before the deadline.
+
+        Returns:
+            Seconds left (zero or negative once passed), or None without a deadline
+        """
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
 
 
 class BaseAbility(ABC):
@@ -62,7 +105,20 @@ class BaseAbility(ABC):
         self._is_initialized = False
         self._state: dict[str, Any] = {}
         self._cancellation_token = asyncio.Event()
-        self._logger = structlog.get_logger(self.__class__.__name__)
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._bulkhead: Bulkhead | None = None
+        self._result_cache: ResultCache | None = None
+        # Single-flight: executions in progress by key
+        self._flights: dict[_FlightKey, asyncio.Future[AbilityResult]] = {}
+        # Keyed executions in progress: flight key -> [fingerprint, calls]
+        self._keyed_calls: dict[_FlightKey, list[Any]] = {}
+        self._coalesce_reads = False
+        self._read_actions: frozenset[str] = frozenset()
+        self._name: str | None = None  # Cached metadata.name, set on first execute
+        # Applies the ability's logging policy once the name is known (first execute)
+        self._logger = PolicyLogger(self.__class__.__name__)
 
     @property
     @abstractmethod
@@ -86,10 +142,11 @@ class BaseAbility(ABC):
             self._logger.warning("Ability already initialized")
             return
 
-        self._logger.info("Initializing ability", ability=self.metadata.name)
+        name = self._name or self._prepare_execution()
+        self._logger.info("Initializing ability", ability=name)
         await self._initialize()
         self._is_initialized = True
-        self._logger.info("Ability initialized successfully", ability=self.metadata.name)
+        self._logger.info("Ability initialized successfully", ability=name)
 
     async def _initialize(self) -> None:
         """
@@ -114,6 +171,7 @@ class BaseAbility(ABC):
         await self._cleanup()
         self._is_initialized = False
         self._state.clear()
+        self.invalidate_cache()
         self._logger.info("Ability cleaned up successfully", ability=self.metadata.name)
 
     async def _cleanup(self) -> None:
@@ -141,55 +199,300 @@ class BaseAbility(ABC):
         if not self._is_initialized:
             await self.initialize()
 
+        name = self._name or self._prepare_execution()
+        action = action_label(parameters)
+        start_ns = time.perf_counter_ns()
+        outcome = "cancelled"  # Unless _run or the bulkhead reports otherwise
+
+        with start_span("ability.execute", metadata=context.metadata) as span:
+            span.set_attribute("ability.name", name)
+            span.set_attribute("ability.action", action)
+
+            execution_token = current_execution.set((name, action))
+            deadline = effective_deadline(context.deadline)
+            deadline_token = current_deadline.set(deadline)
+            self._enter_call()
+            try:
+                if deadline is None:
+                    result, outcome = await self._dispatch(name, action, parameters, context)
+                    return result
+
+                left = deadline - time.time()
+                try:
+                    if left <= 0:
+                        raise DeadlineExceededError("Deadline exceeded before execution")
+                    result, outcome = await asyncio.wait_for(
+                        self._dispatch(name, action, parameters, context), left
+                    )
+                    return result
+                except asyncio.TimeoutError:
+                    outcome = "deadline_exceeded"
+                    self._logger.warning(
+                        "Ability deadline exceeded", ability=name, user_id=context.user_id
+                    )
+                    return AbilityResult(
+                        success=False,
+                        error="Deadline exceeded",
+                        metadata={"deadline_exceeded": True},
+                    )
+            finally:
+                self._exit_call()
+                current_deadline.reset(deadline_token)
+                current_execution.reset(execution_token)
+                span.set_attribute("ability.outcome", outcome)
+                metrics = get_metrics()
+                metrics.observe(name, action, outcome, time.perf_counter_ns() - start_ns)
+                counter = _OUTCOME_COUNTERS.get(outcome)
+                if counter:
+                    metrics.increment(counter, name)
+
+    async def _dispatch(
+        self, name: str, action: str, parameters: dict[str, Any], context: AbilityContext
+    ) -> tuple[AbilityResult, str]:
+        """
+        Route an execution through idempotency, coalescing and the bulkhead.
+
+        ``name`` is unused here but kept as a local, with ``action``, for the
+        profiler, which reads them from this frame when execute runs it in a
+        separate task to enforce a deadline.
+
+        Returns:
+            The result and the outcome label used for metrics
+        """
+        idempotency_key = context.metadata.get(IDEMPOTENCY_KEY)
+        if idempotency_key is not None and action not in self._read_actions:
+            return await self._execute_idempotent(str(idempotency_key), parameters, context)
+        if self._coalesce_reads and action in self._read_actions:
+            flight_key = (context.user_id, cache_key(parameters), None)
+            return await self._single_flight(flight_key, parameters, context)
+        return await self._admit(parameters, context)
+
+    async def _admit(
+        self, parameters: dict[str, Any], context: AbilityContext
+    ) -> tuple[AbilityResult, str]:
+        """
+        Run the execution within the bulkhead, if any.
+
+        Returns:
+            The result and the outcome label used for metrics
+        """
+        bulkhead = self._bulkhead
+        if bulkhead is None:
+            return await self._run(parameters, context)
+
+        try:
+            async with bulkhead.slot(context.user_id):
+                return await self._run(parameters, context)
+        except BulkheadFullError as e:
+            self._logger.warning(
+                "Ability execution rejected",
+                ability=self._name,
+                user_id=context.user_id,
+                reason=str(e),
+            )
+            result = AbilityResult(
+                success=False,
+                error=f"Ability is busy: {str(e)}",
+                metadata={"rejected": True},
+            )
+            return result, "rejected"
+
+    async def _execute_idempotent(
+        self, idempotency_key: str, parameters: dict[str, Any], context: AbilityContext
+    ) -> tuple[AbilityResult, str]:
+        """
+        Run a keyed execution at most once.
+
+        A retry with the same key gets the stored result of the first
+        execution, or shares it while it is still running. Only executions
+        that completed (successfully or not) are stored; validation errors,
+        rejections, cancellations and unexpected errors may be retried.
+
+        Returns:
+            The result and the outcome label used for metrics
+        """
+        store = get_idempotency_store()
+        name = self._name
+        fingerprint = cache_key(parameters)
+
+        record = await store.get(name, context.user_id, idempotency_key)
+        if record is not None:
+            if record.fingerprint != fingerprint:
+                error = "Idempotency key was already used with different parameters"
+                return AbilityResult(success=False, error=error), "invalid"
+            metadata = {**record.result.metadata, "idempotent_replay": True}
+            return record.result.model_copy(update={"metadata": metadata}), "replayed"
+
+        # Calls sharing a key share one execution, whatever their parameters,
+        # so a concurrent call with other parameters is rejected, not run
+        flight_key = (context.user_id, None, idempotency_key)
+        keyed = self._keyed_calls.get(flight_key)
+        if keyed is None:
+            keyed = self._keyed_calls[flight_key] = [fingerprint, 0]
+        elif keyed[0] != fingerprint:
+            error = "Idempotency key is in use with different parameters"
+            return AbilityResult(success=False, error=error), "invalid"
+
+        keyed[1] += 1
+        try:
+            result, outcome = await self._single_flight(flight_key, parameters, context)
+        finally:
+            keyed[1] -= 1
+            if not keyed[1]:
+                del self._keyed_calls[flight_key]
+        if outcome in ("success", "failure"):
+            await store.put(name, context.user_id, idempotency_key, fingerprint, result)
+        return result, outcome
+
+    async def _single_flight(
+        self, key: _FlightKey, parameters: dict[str, Any], context: AbilityContext
+    ) -> tuple[AbilityResult, str]:
+        """
+        Share one execution between concurrent calls with the same key.
+
+        If the shared execution is cancelled, waiting calls run on their own.
+
+        Returns:
+            The result and the outcome label used for metrics
+        """
+        flights = self._flights
+        while (flight := flights.get(key)) is not None:
+            try:
+                # Shielded so that a waiter being cancelled does not cancel the execution
+                return await asyncio.shield(flight), "coalesced"
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise  # This call was cancelled, not the shared execution
+
+        flight = asyncio.get_running_loop().create_future()
+        flights[key] = flight
+        try:
+            result, outcome = await self._admit(parameters, context)
+            flight.set_result(result)
+            return result, outcome
+        finally:
+            if flights.get(key) is flight:
+                del flights[key]
+            if not flight.done():
+                flight.cancel()
+
+    async def _run(
+        self, parameters: dict[str, Any], context: AbilityContext
+    ) -> tuple[AbilityResult, str]:
+        """
+        Validate parameters and run _execute, converting errors into results.
+
+        Returns:
+            The result and the outcome label used for metrics
+        """
+        name = self._name
         self._logger.info(
             "Executing ability",
-            ability=self.metadata.name,
+            ability=name,
             user_id=context.user_id,
             parameters=parameters,
         )
 
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
 
         try:
             # Validate parameters
-            validated_params = await self._validate_parameters(parameters)
+            with start_span("ability.validate"):
+                validated_params = await self._validate_parameters(parameters)
 
             # Check if operation should be cancelled
             if self._cancellation_token.is_set():
-                return AbilityResult(success=False, error="Operation was cancelled")
+                return AbilityResult(success=False, error="Operation was cancelled"), "cancelled"
 
             # Execute the ability
-            result = await self._execute(validated_params, context)
+            with start_span("ability.run") as span:
+                if self._result_cache is None:
+                    result = await self._execute(validated_params, context)
+                else:
+                    result = await self._execute_cached(validated_params, context, span)
 
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = (time.perf_counter_ns() - start_ns) / 1e9
             self._logger.info(
                 "Ability executed successfully",
-                ability=self.metadata.name,
+                ability=name,
                 execution_time=execution_time,
             )
 
-            return result
+            return result, "success" if result.success else "failure"
 
-        except (ValueError, TypeError) as e:
-            error_msg = f"Parameter validation failed: {str(e)}"
-            self._logger.error(
-                "Ability validation error", ability=self.metadata.name, error=error_msg
+        except DeadlineExceededError as e:
+            self._logger.warning("Ability deadline exceeded", ability=name, error=str(e))
+            result = AbilityResult(
+                success=False,
+                error=f"Deadline exceeded: {str(e)}",
+                metadata={"deadline_exceeded": True},
             )
-            return AbilityResult(success=False, error=error_msg)
+            return result, "deadline_exceeded"
 
-        except PydanticValidationError as e:
+        except (ValueError, TypeError, PydanticValidationError) as e:
             error_msg = f"Parameter validation failed: {str(e)}"
-            self._logger.error(
-                "Ability validation error", ability=self.metadata.name, error=error_msg
-            )
-            return AbilityResult(success=False, error=error_msg)
+            self._logger.error("Ability validation error", ability=name, error=error_msg)
+            return AbilityResult(success=False, error=error_msg), "invalid"
 
         except Exception as e:
             error_msg = f"Ability execution failed: {str(e)}"
-            self._logger.exception(
-                "Ability execution error", ability=self.metadata.name, error=error_msg
-            )
-            return AbilityResult(success=False, error=error_msg)
+            self._logger.exception("Ability execution error", ability=name, error=error_msg)
+            return AbilityResult(success=False, error=error_msg), "error"
+
+    async def _execute_cached(
+        self, parameters: dict[str, Any], context: AbilityContext, span: Any
+    ) -> AbilityResult:
+        """
+        Run _execute through the result cache.
+
+        Read-only actions are served from the cache when possible; any other
+        action invalidates the user's cached results before and after it runs.
+
+        Args:
+            parameters: Validated parameters
+            context: Execution context
+            span: Active span, annotated with the cache outcome
+
+        Returns:
+            AbilityResult with execution outcome
+        """
+        cache = self._result_cache
+        user_id = context.user_id
+        if action_label(parameters) not in cache.read_actions:
+            cache.invalidate(user_id)
+            try:
+                return await self._execute(parameters, context)
+            finally:
+                cache.invalidate(user_id)
+
+        key = cache_key(parameters)
+        cached = cache.get(user_id, key)
+        if cached is not None:
+            span.set_attribute("ability.cache", "hit")
+            get_metrics().increment("cache_hits", self._name)
+            return cached
+
+        span.set_attribute("ability.cache", "miss")
+        get_metrics().increment("cache_misses", self._name)
+        generation = cache.generation(user_id)
+        result = await self._execute(parameters, context)
+        if result.success:
+            cache.put(user_id, key, generation, result)
+        return result
+
+    def invalidate_cache(self, user_id: str | None = None) -> None:
+        """
+        Invalidate cached read results.
+
+        Write actions run through execute invalidate the cache themselves;
+        call this when state changes by other means (background tasks,
+        state reloads).
+
+        Args:
+            user_id: User whose results are invalidated, or None for all users
+        """
+        if self._result_cache is not None:
+            self._result_cache.invalidate(user_id)
 
     @abstractmethod
     async def _execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
@@ -246,6 +549,109 @@ class BaseAbility(ABC):
 
         return validated
 
+    def _prepare_execution(self) -> str:
+        """
+        Read what execute needs from the metadata, once.
+
+        Sets up the bulkhead, result cache, read coalescing and logging
+        policy declared in the metadata, and caches the ability name, since
+        many abilities build their metadata on every access.
+
+        Returns:
+            Ability name
+        """
+        metadata = self.metadata
+        limits = metadata.concurrency
+        if limits is not None and (limits.max_in_flight or limits.max_in_flight_per_user):
+            self._bulkhead = Bulkhead(
+                max_in_flight=limits.max_in_flight,
+                max_in_flight_per_user=limits.max_in_flight_per_user,
+                max_queue=limits.max_queue,
+            )
+        if metadata.cache is not None:
+            self._result_cache = ResultCache(
+                metadata.cache.read_actions,
+                max_entries=metadata.cache.max_entries,
+                ttl=metadata.cache.ttl,
+            )
+            get_metrics().register_gauge(
+                "result_cache_entries", self._count_cached_results, "Results held in caches"
+            )
+            self._read_actions = frozenset(action.lower() for action in metadata.cache.read_actions)
+        self._coalesce_reads = metadata.coalesce
+        set_ability_policy(metadata.name, metadata.logging)
+        self._logger.ability = metadata.name
+        self._name = metadata.name
+        return self._name
+
+    def _count_cached_results(self) -> int:
+        """Count results held in the result cache."""
+        return len(self._result_cache) if self._result_cache is not None else 0
+
+    @property
+    def bulkhead_stats(self) -> BulkheadStats | None:
+        """Queue depth and rejection counters, or None without concurrency limits."""
+        return self._bulkhead.stats if self._bulkhead is not None else None
+
+    @property
+    def is_initialized(self) -> bool:
+        """Whether the ability has been initialized."""
+        return self._is_initialized
+
+    @property
+    def in_flight(self) -> int:
+        """Number of executions currently running."""
+        return self._in_flight
+
+    async def wait_idle(self, timeout: float | None = None) -> bool:
+        """
+        Wait until no executions are running.
+
+        Args:
+            timeout: Maximum time to wait in seconds
+
+        Returns:
+            True if idle, False if the timeout expired first
+        """
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def _enter_call(self) -> None:
+        """Record the start of an execution."""
+        self._in_flight += 1
+        self._idle.clear()
+
+    def _exit_call(self) -> None:
+        """Record the end of an execution."""
+        self._in_flight -= 1
+        if not self._in_flight:
+            self._idle.set()
+
+    async def export_state(self) -> Any:
+        """
+        Export state to hand over to a replacement instance.
+
+        Called by :meth:`AbilityRegistry.replace` before the swap. Override
+        together with :meth:`import_state` to carry in-memory state across
+        hot reloads.
+
+        Returns:
+            State for the replacement, or None if there is nothing to hand over
+        """
+        return None
+
+    async def import_state(self, state: Any) -> None:
+        """
+        Import state exported by the instance being replaced.
+
+        Args:
+            state: Value returned by the previous instance's export_state
+        """
+        pass
+
     async def cancel(self) -> None:
         """
         Cancel any ongoing operations.
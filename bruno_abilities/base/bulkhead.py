@@ -0,0 +1,178 @@
+"""
+Bulkhead concurrency limits for ability execution.
+
+This module bounds how many executions of an ability run at once, in total
+and per user, with a bounded wait queue so bursts on one ability or from one
+user are rejected quickly instead of starving everything else on the loop.
+"""
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+# Key of the ability-wide limiter
+_ABILITY_KEY = ""
+
+
+class BulkheadFullError(Exception):
+    """Raised when an execution is rejected because the wait queue is full."""
+
+
+class _Limiter:
+    """Counting semaphore with an inspectable, bounded FIFO wait queue."""
+
+    __slots__ = ("limit", "active", "waiters")
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.active = 0
+        self.waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def idle(self) -> bool:
+        return not self.active and not self.waiters
+
+    def try_acquire(self) -> bool:
+        if self.active < self.limit and not self.waiters:
+            self.active += 1
+            return True
+        return False
+
+    async def wait(self) -> None:
+        future = asyncio.get_running_loop().create_future()
+        self.waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before the cancellation
+                self.release()
+            else:
+                self.waiters.remove(future)
+            raise
+
+    def release(self) -> None:
+        # Hand the slot straight to the next waiter, keeping FIFO order
+        while self.waiters:
+            future = self.waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+@dataclass(frozen=True)
+class BulkheadStats:
+    """
+    Point-in-time bulkhead counters.
+
+    Attributes:
+        in_flight: Executions holding an ability-wide slot
+        queued: Executions waiting for a slot
+        rejected: Executions rejected since creation
+        tracked_users: Users with active or queued executions
+    """
+
+    in_flight: int
+    queued: int
+    rejected: int
+    tracked_users: int
+
+
+class Bulkhead:
+    """
+    Per-ability and per-user concurrency limits.
+
+    Limiters are created lazily for each user and dropped as soon as that
+    user has nothing running or queued, so memory is bounded by the number
+    of concurrently active users.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int | None = None,
+        max_in_flight_per_user: int | None = None,
+        max_queue: int = 0,
+    ) -> None:
+        """
+        Initialize the bulkhead.
+
+        Args:
+            max_in_flight: Maximum concurrent executions of the ability
+            max_in_flight_per_user: Maximum concurrent executions per user
+            max_queue: Maximum executions waiting for each limit before
+                       new ones are rejected
+        """
+        self._max_in_flight = max_in_flight
+        self._max_per_user = max_in_flight_per_user
+        self._max_queue = max_queue
+        self._limiters: dict[str, _Limiter] = {}
+        self._rejected = 0
+
+    @property
+    def stats(self) -> BulkheadStats:
+        """Current counters."""
+        ability = self._limiters.get(_ABILITY_KEY)
+        return BulkheadStats(
+            in_flight=ability.active if ability else 0,
+            queued=sum(len(limiter.waiters) for limiter in self._limiters.values()),
+            rejected=self._rejected,
+            tracked_users=len(self._limiters) - (ability is not None),
+        )
+
+    @asynccontextmanager
+    async def slot(self, user_id: str) -> AsyncIterator[None]:
+        """
+        Hold a slot for one execution.
+
+        The per-user slot is taken first, so a user waiting on their own
+        limit does not occupy the ability-wide queue.
+
+        Args:
+            user_id: User the execution belongs to
+
+        Raises:
+            BulkheadFullError: If a wait queue is full
+        """
+        keys = []
+        try:
+            if self._max_per_user is not None:
+                await self._acquire(f"user:{user_id}", self._max_per_user)
+                keys.append(f"user:{user_id}")
+            if self._max_in_flight is not None:
+                await self._acquire(_ABILITY_KEY, self._max_in_flight)
+                keys.append(_ABILITY_KEY)
+
+            yield
+        finally:
+            for key in reversed(keys):
+                self._release(key)
+
+    async def _acquire(self, key: str, limit: int) -> None:
+        """Take a slot from a limiter, waiting in its queue if there is room."""
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = _Limiter(limit)
+
+        if limiter.try_acquire():
+            return
+
+        if len(limiter.waiters) >= self._max_queue:
+            self._rejected += 1
+            raise BulkheadFullError(f"Too many concurrent executions ({limit} running)")
+
+        try:
+            await limiter.wait()
+        except asyncio.CancelledError:
+            if limiter.idle:
+                self._limiters.pop(key, None)
+            raise
+
+    def _release(self, key: str) -> None:
+        """Return a slot and drop the limiter once it is idle."""
+        limiter = self._limiters[key]
+        limiter.release()
+        if limiter.idle:
+            del self._limiters[key]
@@ -0,0 +1,120 @@
+"""
+Request deadlines.
+
+A request's overall time budget is carried as ``AbilityContext.deadline``.
+While an ability executes, ``BaseAbility.execute`` also binds it to the
+:data:`current_deadline` context variable, so nested code that has no
+context at hand (retries, timeouts, rate limiters, state access) can clamp
+its waits to the time left and fail fast once it is spent.
+
+Deadlines are absolute Unix times, so they survive being sent to worker
+processes. Background tasks that outlive the request starting them are
+spawned with :func:`create_detached_task`, so they do not inherit its
+deadline.
+"""
+
+import asyncio
+import contextvars
+import time
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from bruno_abilities.base.profiler import current_execution
+
+T = TypeVar("T")
+
+# Deadline (Unix time) of the request being executed, if any
+current_deadline: ContextVar[float | None] = ContextVar("bruno_current_deadline", default=None)
+
+
+class DeadlineExceededError(asyncio.TimeoutError):
+    """Raised when a request's deadline has passed or would be passed."""
+
+
+def remaining() -> float | None:
+    """
+    Get the time left before the current deadline.
+
+    Returns:
+        Seconds left (zero or negative once passed), or None without a deadline
+    """
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.time()
+
+
+def check_deadline(operation: str = "operation") -> None:
+    """
+    Fail fast if the current deadline has passed.
+
+    Args:
+        operation: Name of the operation, for the error message
+
+    Raises:
+        DeadlineExceededError: If the deadline has passed
+    """
+    deadline = current_deadline.get()
+    if deadline is not None and deadline <= time.time():
+        raise DeadlineExceededError(f"Deadline exceeded before {operation}")
+
+
+def effective_deadline(deadline: float | None) -> float | None:
+    """
+    Combine a deadline with the current one.
+
+    Args:
+        deadline: Deadline (Unix time), or None
+
+    Returns:
+        The earlier of the two, or None if neither is set
+    """
+    current = current_deadline.get()
+    if current is None:
+        return deadline
+    if deadline is None:
+        return current
+    return min(current, deadline)
+
+
+@contextmanager
+def deadline_scope(deadline: float | None) -> Iterator[float | None]:
+    """
+    Bind a deadline for the enclosed code; an earlier current deadline wins.
+
+    Args:
+        deadline: Deadline (Unix time), or None
+
+    Yields:
+        The deadline in effect
+    """
+    effective = effective_deadline(deadline)
+    token = current_deadline.set(effective)
+    try:
+        yield effective
+    finally:
+        current_deadline.reset(token)
+
+
+def create_detached_task(coro: Coroutine[Any, Any, T]) -> "asyncio.Task[T]":
+    """
+    Start a background task that is not bound to the current request.
+
+    ``asyncio.create_task`` copies the current context, so a task started
+    while an ability executes would inherit the request's deadline and
+    profiler attribution. The task is started in a copy of the context
+    with both cleared instead.
+
+    Args:
+        coro: Coroutine to run
+
+    Returns:
+        Started task
+    """
+    context = contextvars.copy_context()
+    context.run(current_deadline.set, None)
+    context.run(current_execution.set, None)
+    # The task copies the context it is created in
+    return context.run(asyncio.create_task, coro)
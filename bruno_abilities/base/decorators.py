@@ -1,38 +1,118 @@
 """
 Decorators for common ability patterns.
 
-This module provides decorators for retry logic, timeout handling,
-and rate limiting that can be applied to ability methods.
+This module provides decorators for retry logic, circuit breaking,
+timeout handling, and rate limiting that can be applied to ability methods.
 """
 
 import asyncio
 import functools
+import random
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 from collections.abc import Callable
+from enum import Enum
 from typing import Any, TypeVar, cast
 
 import structlog
 
+from bruno_abilities.base.deadline import DeadlineExceededError, check_deadline, remaining
+
 logger = structlog.get_logger(__name__)
 
 T = TypeVar("T")
 
 
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of calls.
+
+    Shared between callers of a backend, it keeps retries from multiplying
+    the load on the backend when it fails: each call deposits ``ratio``
+    tokens, each retry spends one, and retries are refused when the bucket
+    is empty. A small refill per second lets low-traffic callers retry.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0
+    ) -> None:
+        """
+        Initialize the budget.
+
+        Args:
+            ratio: Tokens deposited per call (retries allowed per call)
+            min_per_second: Tokens added per second regardless of traffic
+            max_tokens: Bucket capacity, the largest burst of retries
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def record_call(self) -> None:
+        """Deposit the tokens earned by a call."""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """
+        Take a token for a retry.
+
+        Returns:
+            True if the retry is allowed
+        """
+        self._refill()
+        if self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        return True
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update."""
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if elapsed > 0 and self.min_per_second:
+            self._tokens = min(self.max_tokens, self._tokens + elapsed * self.min_per_second)
+
+
 def retry(
     max_attempts: int = 3,
     delay: float = 1.0,
     backoff: float = 2.0,
     exceptions: tuple = (Exception,),
+    jitter: bool = True,
+    max_delay: float | None = None,
+    time_budget: float | None = None,
+    budget: RetryBudget | None = None,
 ) -> Callable:
     """
     Decorator to retry a function on failure.
 
+    Delays grow exponentially; with jitter, each sleep is drawn uniformly
+    between zero and the current delay ("full jitter"), so callers failing
+    together do not retry together. Open circuits (CircuitOpenError) and
+    exceeded deadlines are never retried.
+
     Args:
         max_attempts: Maximum number of retry attempts
         delay: Initial delay between retries in seconds
         backoff: Multiplier for delay after each attempt
         exceptions: Tuple of exceptions to catch and retry
+        jitter: Randomize each sleep between zero and the current delay
+        max_delay: Cap on the delay between retries
+        time_budget: Seconds allowed for all attempts; the last error is
+                     raised instead of sleeping past it (or past the
+                     request deadline, which is always honored)
+        budget: Retry budget shared with other callers; the last error is
+                raised when it is exhausted
 
     Returns:
         Decorated function
@@ -49,12 +129,44 @@ def retry(
         async def wrapper(*args: Any, **kwargs: Any) -> T:
             current_delay = delay
             last_exception: Exception | None = None
+            started = time.monotonic()
+            if budget is not None:
+                budget.record_call()
 
             for attempt in range(max_attempts):
+                check_deadline(func.__name__)
                 try:
                     return await func(*args, **kwargs)
+                except (CircuitOpenError, DeadlineExceededError):
+                    raise
                 except exceptions as e:
                     last_exception = e
+                    if attempt == max_attempts - 1:
+                        break
+
+                    sleep = random.uniform(0, current_delay) if jitter else current_delay
+                    left = remaining()
+                    if time_budget is not None:
+                        budget_left = time_budget - (time.monotonic() - started)
+                        left = budget_left if left is None else min(left, budget_left)
+                    if left is not None and sleep >= left:
+                        logger.warning(
+                            "Retry would exceed time budget, giving up",
+                            function=func.__name__,
+                            attempt=attempt + 1,
+                            remaining=left,
+                            error=str(e),
+                        )
+                        raise
+                    if budget is not None and not budget.try_spend():
+                        logger.warning(
+                            "Retry budget exhausted, giving up",
+                            function=func.__name__,
+                            attempt=attempt + 1,
+                            error=str(e),
+                        )
+                        raise
+
                     logger.warning(
                         "Attempt failed, retrying",
                         function=func.__name__,
@@ -62,10 +174,10 @@ def retry(
                         max_attempts=max_attempts,
                         error=str(e),
                     )
-
-                    if attempt < max_attempts - 1:
-                        await asyncio.sleep(current_delay)
-                        current_delay *= backoff
+                    await asyncio.sleep(sleep)
+                    current_delay *= backoff
+                    if max_delay is not None:
+                        current_delay = min(current_delay, max_delay)
 
             # All attempts failed
             logger.error(
@@ -78,6 +190,239 @@ def retry(
     return decorator
 
 
+class CircuitState(str, Enum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"  # Calls pass; failures are counted
+    OPEN = "open"  # Calls are rejected until the reset timeout
+    HALF_OPEN = "half_open"  # A few probe calls decide whether to close again
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a call is rejected by an open circuit breaker."""
+
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f"Circuit '{name}' is open, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with a rolling failure-rate window.
+
+    While closed, outcomes are counted in time buckets covering the last
+    ``window`` seconds; once at least ``min_calls`` calls were made and the
+    failure rate reaches ``failure_rate``, the circuit opens and calls fail
+    immediately. After ``reset_timeout`` seconds it lets up to
+    ``half_open_max_calls`` probe calls through: a success closes it, a
+    failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str = "circuit",
+        failure_rate: float = 0.5,
+        window: float = 60.0,
+        min_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        exceptions: tuple = (Exception,),
+        buckets: int = 10,
+    ) -> None:
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            name: Name used in logs and errors
+            failure_rate: Failure fraction (0-1] that opens the circuit
+            window: Seconds of history the failure rate is computed over
+            min_calls: Calls needed in the window before the circuit may open
+            reset_timeout: Seconds the circuit stays open before probing
+            half_open_max_calls: Concurrent probe calls while half-open
+            exceptions: Exceptions counted as failures; others pass through
+                        without being counted
+            buckets: Number of time buckets the window is split into
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.exceptions = exceptions
+        self._bucket_width = window / buckets
+        # [bucket start, successes, failures], oldest first
+        self._buckets: deque[list[float]] = deque()
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state (an open circuit turns half-open after the reset timeout)."""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    @property
+    def counts(self) -> tuple[int, int]:
+        """Successes and failures in the rolling window."""
+        self._expire(time.monotonic())
+        successes = sum(int(bucket[1]) for bucket in self._buckets)
+        failures = sum(int(bucket[2]) for bucket in self._buckets)
+        return successes, failures
+
+    async def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Call an async function through the breaker.
+
+        Args:
+            func: Async function
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Result of func
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+        """
+        admitted = self._admit()
+        try:
+            result = await func(*args, **kwargs)
+        except self.exceptions:
+            self._record(admitted, failed=True)
+            raise
+        except BaseException:
+            if admitted == CircuitState.HALF_OPEN:
+                self._probes -= 1
+            raise
+        self._record(admitted, failed=False)
+        return result
+
+    def reset(self) -> None:
+        """Close the circuit and forget its history."""
+        self._buckets.clear()
+        self._probes = 0
+        self._transition(CircuitState.CLOSED)
+
+    def _admit(self) -> CircuitState:
+        """Let a call through or raise CircuitOpenError; returns the state it was admitted in."""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return state
+        if state == CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+            self._probes += 1
+            return state
+
+        retry_after = max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+        raise CircuitOpenError(self.name, retry_after)
+
+    def _record(self, admitted: CircuitState, failed: bool) -> None:
+        """Count the outcome of a call and update the state."""
+        if admitted == CircuitState.HALF_OPEN:
+            self._probes -= 1
+            if self._state == CircuitState.HALF_OPEN:
+                if failed:
+                    self._open()
+                else:
+                    self._buckets.clear()
+                    self._transition(CircuitState.CLOSED)
+            return
+        if self._state != CircuitState.CLOSED:
+            return  # Outcome of a call admitted before the circuit opened
+
+        now = time.monotonic()
+        self._expire(now)
+        if not self._buckets or now - self._buckets[-1][0] >= self._bucket_width:
+            self._buckets.append([now, 0, 0])
+        self._buckets[-1][2 if failed else 1] += 1
+
+        if failed:
+            successes, failures = self.counts
+            total = successes + failures
+            if total >= self.min_calls and failures / total >= self.failure_rate:
+                self._open()
+
+    def _expire(self, now: float) -> None:
+        """Drop buckets that left the window."""
+        buckets = self._buckets
+        while buckets and now - buckets[0][0] >= self.window:
+            buckets.popleft()
+
+    def _open(self) -> None:
+        """Open the circuit."""
+        self._opened_at = time.monotonic()
+        self._transition(CircuitState.OPEN)
+
+    def _transition(self, state: CircuitState) -> None:
+        """Change state, logging the transition."""
+        if state != self._state:
+            logger.warning(
+                "Circuit state changed", circuit=self.name, old=self._state.value, new=state.value
+            )
+            self._state = state
+
+
+def circuit_breaker(
+    failure_rate: float = 0.5,
+    window: float = 60.0,
+    min_calls: int = 10,
+    reset_timeout: float = 30.0,
+    half_open_max_calls: int = 1,
+    exceptions: tuple = (Exception,),
+    breaker: CircuitBreaker | None = None,
+) -> Callable:
+    """
+    Decorator to stop calling a failing dependency for a while.
+
+    Args:
+        failure_rate: Failure fraction (0-1] that opens the circuit
+        window: Seconds of history the failure rate is computed over
+        min_calls: Calls needed in the window before the circuit may open
+        reset_timeout: Seconds the circuit stays open before probing
+        half_open_max_calls: Concurrent probe calls while half-open
+        exceptions: Exceptions counted as failures
+        breaker: Breaker shared with other functions (the other arguments
+                 are then ignored)
+
+    Returns:
+        Decorated function, with its breaker as the ``breaker`` attribute
+
+    Raises:
+        CircuitOpenError: From the decorated function while the circuit is open
+
+    Example:
+        @circuit_breaker(failure_rate=0.5, window=30.0, reset_timeout=10.0)
+        async def query_memory_store(query: str):
+            # Fails fast while the store keeps failing
+            pass
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        circuit = breaker or CircuitBreaker(
+            name=func.__qualname__,
+            failure_rate=failure_rate,
+            window=window,
+            min_calls=min_calls,
+            reset_timeout=reset_timeout,
+            half_open_max_calls=half_open_max_calls,
+            exceptions=exceptions,
+        )
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            return cast(T, await circuit.call(func, *args, **kwargs))
+
+        wrapper.breaker = circuit  # type: ignore[attr-defined]
+        return cast(Callable[..., T], wrapper)
+
+    return decorator
+
+
 def timeout(seconds: float) -> Callable:
     """
     Decorator to enforce a timeout on async functions.
@@ -88,8 +433,12 @@ def timeout(seconds: float) -> Callable:
     Returns:
         Decorated function
 
+    The timeout is shortened to the time left before the request deadline,
+    if that is sooner.
+
     Raises:
         asyncio.TimeoutError: If function exceeds timeout
+        DeadlineExceededError: If the request deadline passes first
 
     Example:
         @timeout(30.0)
@@ -101,6 +450,18 @@ def timeout(seconds: float) -> Callable:
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @functools.wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> T:
+            left = remaining()
+            if left is not None and left < seconds:
+                if left <= 0:
+                    raise DeadlineExceededError(f"Deadline exceeded before {func.__name__}")
+                try:
+                    return await asyncio.wait_for(func(*args, **kwargs), timeout=left)
+                except DeadlineExceededError:
+                    raise
+                except asyncio.TimeoutError:
+                    logger.error("Function exceeded deadline", function=func.__name__, timeout=left)
+                    raise DeadlineExceededError(f"Deadline exceeded in {func.__name__}") from None
+
             try:
                 return await asyncio.wait_for(func(*args, **kwargs), timeout=seconds)
             except asyncio.TimeoutError:
@@ -140,7 +501,10 @@ class RateLimiter:
 
         Raises:
             RuntimeError: If rate limit is exceeded
+            DeadlineExceededError: If the request deadline has passed, or
+                                   waiting for the rate limit would pass it
         """
+        check_deadline("rate limiter")
         now = time.time()
 
         # Remove old calls outside the time window
@@ -161,6 +525,13 @@ class RateLimiter:
                 wait_time=wait_time,
             )
 
+            # Fail now rather than after sleeping past the request deadline
+            left = remaining()
+            if left is not None and wait_time >= left:
+                raise DeadlineExceededError(
+                    f"Rate limit wait of {wait_time:.2f}s exceeds the request deadline"
+                )
+
             # Wait until we can make another call
             await asyncio.sleep(wait_time)
 
@@ -0,0 +1,306 @@
+"""
+Idempotency-key store for ability executions.
+
+Clients retrying a write after a timeout pass the same idempotency key in
+``AbilityContext.metadata``; ``BaseAbility.execute`` then returns the
+stored result of the first execution instead of running it again. Records
+are kept in a bounded in-memory map and expire after a TTL. Given a
+``StateManager``, they are also persisted in user scope so that retries
+are recognized across restarts; persisted records are deleted when they
+are evicted from memory, and expired ones by a periodic sweep.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from bruno_abilities.base.deadline import create_detached_task
+
+if TYPE_CHECKING:
+    from bruno_abilities.base.ability_base import AbilityResult
+    from bruno_abilities.infrastructure.state_manager import StateManager
+
+logger = structlog.get_logger(__name__)
+
+# Prefix of the state keys of persisted records
+STATE_KEY_PREFIX = "idempotency:"
+
+
+def _state_key(key: str) -> str:
+    """
+    Build the state key of a persisted record.
+
+    Idempotency keys come from clients and storage backends may use state
+    keys as file names, so the key is hashed rather than used as is.
+
+    Args:
+        key: Idempotency key
+
+    Returns:
+        State key
+    """
+    return STATE_KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+
+@dataclass
+class IdempotencyRecord:
+    """Result of an execution, stored under its idempotency key."""
+
+    fingerprint: str  # Canonical parameters of the execution
+    result: "AbilityResult"
+    expires_at: float  # Wall-clock time, since records may be persisted
+
+
+class IdempotencyStore:
+    """Bounded, TTL-evicted map of (ability, user, key) to execution results."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl: float = 24 * 3600,
+        state_manager: "StateManager | None" = None,
+        sweep_interval: float = 3600,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_entries: Maximum records kept; the oldest are evicted
+            ttl: Seconds a record is kept
+            state_manager: Optional state manager to persist records with
+            sweep_interval: Seconds between sweeps of expired persisted records
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._state_manager = state_manager
+        self._sweep_interval = sweep_interval
+        self._records: OrderedDict[tuple[str, str, str], IdempotencyRecord] = OrderedDict()
+        # Monotonic time of the next sweep; the first put sweeps what
+        # earlier runs left behind
+        self._next_sweep = 0.0
+        self._sweep_task: asyncio.Task[int] | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    async def get(self, ability: str, user_id: str, key: str) -> IdempotencyRecord | None:
+        """
+        Look up the record of an idempotency key.
+
+        Args:
+            ability: Ability name
+            user_id: User ID
+            key: Idempotency key
+
+        Returns:
+            Record, or None if absent or expired
+        """
+        record = self._records.get((ability, user_id, key))
+        if record is None and self._state_manager is not None:
+            record = await self._load(ability, user_id, key)
+
+        if record is None:
+            return None
+        if record.expires_at <= time.time():
+            await self.discard(ability, user_id, key)
+            return None
+        return record
+
+    async def put(
+        self, ability: str, user_id: str, key: str, fingerprint: str, result: "AbilityResult"
+    ) -> None:
+        """
+        Store the result of an execution.
+
+        The in-memory record is added before any persistence I/O, so a
+        retry arriving meanwhile already finds it.
+
+        Args:
+            ability: Ability name
+            user_id: User ID
+            key: Idempotency key
+            fingerprint: Canonical parameters of the execution
+            result: Result to return to retries
+        """
+        record = IdempotencyRecord(fingerprint, result, time.time() + self._ttl)
+        evicted = self._remember((ability, user_id, key), record)
+
+        if self._state_manager is not None:
+            from bruno_abilities.infrastructure.state_manager import StateScope
+
+            value = {
+                "fingerprint": fingerprint,
+                "result": result.model_dump(mode="json"),
+                "expires_at": record.expires_at,
+                # Identify the record to sweep(), which only sees the value
+                "ability": ability,
+                "user_id": user_id,
+            }
+            await self._state_manager.set(
+                _state_key(key),
+                value,
+                scope=StateScope.USER,
+                ability_name=ability,
+                user_id=user_id,
+            )
+            await self._forget_persisted(evicted)
+            self._schedule_sweep()
+
+    async def discard(self, ability: str, user_id: str, key: str) -> None:
+        """
+        Forget an idempotency key.
+
+        Args:
+            ability: Ability name
+            user_id: User ID
+            key: Idempotency key
+        """
+        self._records.pop((ability, user_id, key), None)
+        if self._state_manager is not None:
+            from bruno_abilities.infrastructure.state_manager import StateScope
+
+            await self._state_manager.delete(
+                _state_key(key), scope=StateScope.USER, ability_name=ability, user_id=user_id
+            )
+
+    def clear(self) -> None:
+        """Forget all records held in memory."""
+        self._records.clear()
+
+    async def sweep(self) -> int:
+        """
+        Delete expired persisted records.
+
+        Returns:
+            Number of records deleted
+        """
+        if self._state_manager is None:
+            return 0
+        from bruno_abilities.infrastructure.state_manager import StateScope
+
+        now = time.time()
+        expired: defaultdict[tuple[str, str], list[str]] = defaultdict(list)
+        async for state_key, value in self._state_manager.scan(
+            STATE_KEY_PREFIX, scope=StateScope.USER
+        ):
+            if not isinstance(value, dict) or value.get("expires_at", 0) > now:
+                continue
+            ability, user_id = value.get("ability"), value.get("user_id")
+            if ability and user_id:
+                expired[(ability, user_id)].append(state_key)
+
+        deleted = 0
+        for (ability, user_id), keys in expired.items():
+            deleted += await self._state_manager.delete_many(
+                keys, scope=StateScope.USER, ability_name=ability, user_id=user_id
+            )
+        if deleted:
+            logger.info("Swept expired idempotency records", deleted=deleted)
+        return deleted
+
+    def _schedule_sweep(self) -> None:
+        """Start a sweep in the background if one is due."""
+        now = time.monotonic()
+        if now < self._next_sweep or (self._sweep_task and not self._sweep_task.done()):
+            return
+        self._next_sweep = now + self._sweep_interval
+        self._sweep_task = create_detached_task(self.sweep())
+        self._sweep_task.add_done_callback(_log_sweep_failure)
+
+    def _remember(
+        self, record_key: tuple[str, str, str], record: IdempotencyRecord
+    ) -> list[tuple[str, str, str]]:
+        """
+        Add a record to memory, evicting the oldest beyond max_entries.
+
+        Returns:
+            Keys of records evicted for capacity, whose persisted copies
+            must be deleted too
+        """
+        records = self._records
+        records[record_key] = record
+        records.move_to_end(record_key)
+        evicted = []
+        # Records share the TTL, so the oldest are at the front
+        now = time.time()
+        while records:
+            oldest_key, oldest = next(iter(records.items()))
+            if oldest.expires_at <= now:
+                records.popitem(last=False)  # Left to sweep() if persisted
+            elif len(records) > self._max_entries:
+                records.popitem(last=False)
+                evicted.append(oldest_key)
+            else:
+                break
+        return evicted
+
+    async def _forget_persisted(self, record_keys: list[tuple[str, str, str]]) -> None:
+        """Delete the persisted copies of records."""
+        from bruno_abilities.infrastructure.state_manager import StateScope
+
+        for ability, user_id, key in record_keys:
+            await self._state_manager.delete(
+                _state_key(key), scope=StateScope.USER, ability_name=ability, user_id=user_id
+            )
+
+    async def _load(self, ability: str, user_id: str, key: str) -> IdempotencyRecord | None:
+        """Load a persisted record into memory."""
+        from bruno_abilities.base.ability_base import AbilityResult
+        from bruno_abilities.infrastructure.state_manager import StateScope
+
+        value: dict[str, Any] | None = await self._state_manager.get(
+            _state_key(key), scope=StateScope.USER, ability_name=ability, user_id=user_id
+        )
+        if value is None:
+            return None
+        try:
+            record = IdempotencyRecord(
+                fingerprint=value["fingerprint"],
+                result=AbilityResult.model_validate(value["result"]),
+                expires_at=value["expires_at"],
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning("Ignoring invalid idempotency record", key=key, error=str(e))
+            return None
+
+        await self._forget_persisted(self._remember((ability, user_id, key), record))
+        return record
+
+
+def _log_sweep_failure(task: "asyncio.Task[int]") -> None:
+    """Log the error of a background sweep."""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Idempotency record sweep failed", error=str(task.exception()))
+
+
+# Global store instance
+_global_store: IdempotencyStore | None = None
+
+
+def get_idempotency_store() -> IdempotencyStore:
+    """
+    Get the global idempotency store (in memory only unless replaced).
+
+    Returns:
+        Global idempotency store
+    """
+    global _global_store
+    if _global_store is None:
+        _global_store = IdempotencyStore()
+    return _global_store
+
+
+def set_idempotency_store(store: IdempotencyStore | None) -> None:
+    """
+    Replace the global idempotency store, e.g. with one persisting records.
+
+    Args:
+        store: New store, or None to restore the default on next use
+    """
+    global _global_store
+    _global_store = store
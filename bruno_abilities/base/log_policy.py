@@ -0,0 +1,338 @@
+"""
+Logging policy for abilities.
+
+Abilities log on hot paths, and structlog renders every event it receives.
+This module puts a policy in front of the structlog logger:
+
+- events below the policy level are dropped before anything is built;
+- debug and info events can be sampled (warnings and errors never are);
+- field values are only processed for events that are emitted, and callable
+  values wrapped with :func:`lazy` are only evaluated then;
+- emitted values are redacted by key and truncated by size.
+
+Policies are set per ability, through ``AbilityMetadata.logging`` or
+environment variables, which take precedence:
+
+- ``BRUNO_LOG_LEVEL``, ``BRUNO_LOG_SAMPLE_RATE`` and
+  ``BRUNO_LOG_MAX_FIELD_LENGTH`` for all abilities;
+- ``BRUNO_LOG_LEVEL_<ABILITY>`` and ``BRUNO_LOG_SAMPLE_RATE_<ABILITY>`` for
+  one ability (e.g. ``BRUNO_LOG_SAMPLE_RATE_TIMER=0.1``).
+"""
+
+import math
+import os
+import random
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import structlog
+
+from bruno_abilities.base.metadata import LogPolicy
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+_WARNING = LEVELS["warning"]
+
+DEFAULT_REDACT_KEYS = frozenset({"password", "token", "secret", "api_key", "authorization"})
+_REDACTED = "[redacted]"
+_MAX_DEPTH = 4
+# Fields structlog interprets itself
+_PASSTHROUGH_KEYS = frozenset({"exc_info", "stack_info"})
+
+ENV_PREFIX = "BRUNO_LOG_"
+
+
+class lazy:  # noqa: N801 - used like a function at call sites
+    """
+    Field value computed only if the event is emitted.
+
+    Example:
+        logger.debug("Queue state", queue=lazy(lambda: [t.title for t in queue]))
+    """
+
+    __slots__ = ("func",)
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        self.func = func
+
+
+@dataclass(frozen=True)
+class _ResolvedPolicy:
+    """Policy with every field filled in."""
+
+    level: int = LEVELS["info"]
+    sample_rate: float = 1.0
+    max_field_length: int = 512
+    max_items: int = 50
+    redact_keys: frozenset[str] = DEFAULT_REDACT_KEYS
+
+
+# Policies declared in ability metadata, by ability name
+_declared: dict[str, LogPolicy] = {}
+# Bumped whenever declared policies or the environment may have changed
+_generation = 0
+
+
+def set_ability_policy(ability: str, policy: LogPolicy | None) -> None:
+    """
+    Set the policy declared by an ability.
+
+    Args:
+        ability: Ability name
+        policy: Declared policy, or None to use the defaults
+    """
+    global _generation
+    if policy is None:
+        _declared.pop(ability, None)
+    else:
+        _declared[ability] = policy
+    _generation += 1
+
+
+def reload_policies() -> None:
+    """Re-read the environment on the next event of every logger."""
+    global _generation
+    _generation += 1
+
+
+def resolve_policy(ability: str | None) -> _ResolvedPolicy:
+    """
+    Combine defaults, the declared policy and the environment.
+
+    Invalid environment values are ignored with a warning, so a typo in a
+    variable cannot break logging (and the abilities logging through it).
+
+    Args:
+        ability: Ability name, or None for the defaults and global overrides
+
+    Returns:
+        Effective policy
+    """
+    declared = _declared.get(ability) if ability else None
+    values: dict[str, Any] = {}
+    if declared is not None:
+        values = declared.model_dump(exclude_none=True)
+        if "level" in values:
+            raw = values.pop("level")
+            try:
+                values["level"] = _parse_level(raw)
+            except ValueError as e:
+                _warn_invalid(f"logging.level of {ability}", raw, str(e))
+
+    suffixes = [""]
+    if ability:
+        suffixes.append("_" + ability.upper())
+    for suffix in suffixes:
+        for field, convert in _ENV_FIELDS:
+            variable = f"{ENV_PREFIX}{field.upper()}{suffix}"
+            raw = os.environ.get(variable)
+            if not raw:
+                continue
+            try:
+                values[field] = convert(raw)
+            except ValueError as e:
+                _warn_invalid(variable, raw, str(e))
+
+    if "sample_rate" in values:
+        values["sample_rate"] = min(max(values["sample_rate"], 0.0), 1.0)
+    if "redact_keys" in values:
+        values["redact_keys"] = frozenset(key.lower() for key in values["redact_keys"])
+    return _ResolvedPolicy(**values)
+
+
+def _parse_level(raw: str) -> int:
+    """Convert a level name to its number."""
+    level = LEVELS.get(raw.lower())
+    if level is None:
+        raise ValueError(f"Unknown log level: {raw}")
+    return level
+
+
+def _parse_rate(raw: str) -> float:
+    """Convert a sample rate, clamped to [0, 1] later."""
+    rate = float(raw)
+    if math.isnan(rate):
+        raise ValueError(f"Invalid sample rate: {raw}")
+    return rate
+
+
+# Environment-configurable fields and their converters
+_ENV_FIELDS: tuple[tuple[str, Callable[[str], Any]], ...] = (
+    ("level", _parse_level),
+    ("sample_rate", _parse_rate),
+    ("max_field_length", int),
+)
+# Invalid setting values already warned about
+_warned: set[tuple[str, str]] = set()
+
+
+def _warn_invalid(setting: str, raw: str, error: str) -> None:
+    """Warn once about an invalid setting value."""
+    if (setting, raw) in _warned:
+        return
+    _warned.add((setting, raw))
+    structlog.get_logger(__name__).warning(
+        "Ignoring invalid logging setting", setting=setting, value=raw, error=error
+    )
+
+
+def sanitize(value: Any, policy: _ResolvedPolicy, depth: int = 0) -> Any:
+    """
+    Prepare a field value for logging.
+
+    Evaluates lazy values, redacts sensitive keys and truncates long
+    strings and collections.
+
+    Args:
+        value: Field value
+        policy: Effective policy
+        depth: Nesting depth (collections deeper than a few levels are summarized)
+
+    Returns:
+        Value safe to hand to structlog
+    """
+    if isinstance(value, lazy):
+        value = value.func()
+
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+
+    if isinstance(value, str):
+        limit = policy.max_field_length
+        if len(value) > limit:
+            return f"{value[:limit]}...(+{len(value) - limit} chars)"
+        return value
+
+    if isinstance(value, Mapping):
+        if depth >= _MAX_DEPTH:
+            return f"<{type(value).__name__} with {len(value)} items>"
+        result = {}
+        for index, (key, item) in enumerate(value.items()):
+            if index >= policy.max_items:
+                result["..."] = f"+{len(value) - index} items"
+                break
+            if isinstance(key, str) and key.lower() in policy.redact_keys:
+                result[key] = _REDACTED
+            else:
+                result[key] = sanitize(item, policy, depth + 1)
+        return result
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        if depth >= _MAX_DEPTH:
+            return f"<{type(value).__name__} with {len(value)} items>"
+        items = [sanitize(item, policy, depth + 1) for item in list(value)[: policy.max_items]]
+        if len(value) > policy.max_items:
+            items.append(f"...(+{len(value) - policy.max_items} items)")
+        return items
+
+    return sanitize(str(value), policy, depth)
+
+
+class PolicyLogger:
+    """
+    structlog logger wrapper applying the policy of an ability.
+
+    The policy is resolved on first use and again only after it changes, so
+    the per-event overhead of a dropped event is a couple of comparisons.
+    """
+
+    __slots__ = ("_logger", "_ability", "_policy", "_generation")
+
+    def __init__(self, name: str, ability: str | None = None) -> None:
+        """
+        Initialize the logger.
+
+        Args:
+            name: Logger name
+            ability: Ability whose policy applies
+        """
+        self._logger = structlog.get_logger(name)
+        self._ability = ability
+        self._policy: _ResolvedPolicy | None = None
+        self._generation = -1
+
+    @property
+    def ability(self) -> str | None:
+        """Ability whose policy applies."""
+        return self._ability
+
+    @ability.setter
+    def ability(self, ability: str | None) -> None:
+        self._ability = ability
+        self._generation = -1
+
+    @property
+    def policy(self) -> _ResolvedPolicy:
+        """Effective policy."""
+        if self._generation != _generation or self._policy is None:
+            self._policy = resolve_policy(self._ability)
+            self._generation = _generation
+        return self._policy
+
+    def is_enabled(self, level: str) -> bool:
+        """
+        Check whether events at a level would be considered for output.
+
+        Args:
+            level: Level name
+
+        Returns:
+            True if the level is at or above the policy level
+        """
+        return LEVELS[level] >= self.policy.level
+
+    def debug(self, event: str, **fields: Any) -> None:
+        """Log a debug event."""
+        self._log(10, "debug", event, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        """Log an info event."""
+        self._log(20, "info", event, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        """Log a warning event."""
+        self._log(30, "warning", event, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        """Log an error event."""
+        self._log(40, "error", event, fields)
+
+    def exception(self, event: str, **fields: Any) -> None:
+        """Log an error event with the current exception."""
+        self._log(40, "exception", event, fields)
+
+    def _log(self, level: int, method: str, event: str, fields: dict[str, Any]) -> None:
+        """Apply the policy and hand the event to structlog."""
+        policy = self.policy
+        if level < policy.level:
+            return
+
+        rate = policy.sample_rate
+        if level < _WARNING and rate < 1.0:
+            if random.random() >= rate:
+                return
+            fields["sample_rate"] = rate
+
+        for key, value in fields.items():
+            if key in _PASSTHROUGH_KEYS:
+                continue
+            if key.lower() in policy.redact_keys:
+                fields[key] = _REDACTED
+            elif not (value is None or isinstance(value, (bool, int, float))):
+                fields[key] = sanitize(value, policy)
+
+        getattr(self._logger, method)(event, **fields)
+
+
+def get_policy_logger(name: str, ability: str | None = None) -> PolicyLogger:
+    """
+    Get a logger applying an ability's logging policy.
+
+    Args:
+        name: Logger name (usually ``__name__``)
+        ability: Ability whose policy applies
+
+    Returns:
+        Policy logger
+    """
+    return PolicyLogger(name, ability)
@@ -51,6 +51,7 @@ class AbilityCapability(str, Enum):
     PROGRESS_REPORTING = "progress_reporting"
     BACKGROUND = "background"
     PERSISTENT = "persistent"
+    CPU_BOUND = "cpu_bound"
 
 
 class PermissionLevel(str, Enum):
@@ -62,6 +63,52 @@ class PermissionLevel(str, Enum):
     ADMIN = "admin"
 
 
+class ConcurrencyLimits(BaseModel):
+    """Bulkhead limits on concurrent executions of an ability."""
+
+    max_in_flight: Optional[int] = Field(
+        default=None, ge=1, description="Maximum concurrent executions of the ability"
+    )
+    max_in_flight_per_user: Optional[int] = Field(
+        default=None, ge=1, description="Maximum concurrent executions per user"
+    )
+    max_queue: int = Field(
+        default=0, ge=0, description="Executions allowed to wait for a slot before rejection"
+    )
+
+
+class CachePolicy(BaseModel):
+    """Result caching of read-only actions."""
+
+    read_actions: list[str] = Field(
+        ..., min_length=1, description="Actions that do not change state and may be cached"
+    )
+    max_entries: int = Field(default=256, ge=1, description="Maximum cached results")
+    ttl: Optional[float] = Field(
+        default=None, gt=0, description="Seconds a result stays valid (for time-dependent data)"
+    )
+
+
+class LogPolicy(BaseModel):
+    """Logging policy of an ability; unset fields use the defaults."""
+
+    level: Optional[str] = Field(
+        default=None, description="Minimum level logged (debug, info, warning, error)"
+    )
+    sample_rate: Optional[float] = Field(
+        default=None, ge=0.0, le=1.0, description="Fraction of debug/info events kept"
+    )
+    max_field_length: Optional[int] = Field(
+        default=None, ge=16, description="Longest string logged before truncation"
+    )
+    max_items: Optional[int] = Field(
+        default=None, ge=1, description="Most list or dict items logged per field"
+    )
+    redact_keys: Optional[list[str]] = Field(
+        default=None, description="Field names whose values are redacted"
+    )
+
+
 class AbilityMetadata(BaseModel):
     """
     Rich metadata describing an ability's capabilities.
@@ -110,6 +157,26 @@ class AbilityMetadata(BaseModel):
         default_factory=dict, description="Possible error codes and their meanings"
     )
 
+    concurrency: Optional[ConcurrencyLimits] = Field(
+        default=None, description="Concurrency limits enforced on execution"
+    )
+
+    cache: Optional[CachePolicy] = Field(
+        default=None, description="Result caching of read-only actions"
+    )
+
+    coalesce: bool = Field(
+        default=False,
+        description=(
+            "Share one execution between identical concurrent calls of read-only actions "
+            "(calls with an idempotency key are always shared)"
+        ),
+    )
+
+    logging: Optional[LogPolicy] = Field(
+        default=None, description="Logging policy (level, sampling, truncation)"
+    )
+
     model_config = ConfigDict(use_enum_values=True)
 
     def to_function_schema(self) -> dict[str, Any]:
@@ -0,0 +1,378 @@
+"""
+Execution metrics for abilities.
+
+This module aggregates ability latencies into log-bucketed histograms keyed
+by (ability, action, outcome), together with counters and pull-based
+gauges. Metrics can be read programmatically or rendered in the Prometheus
+text exposition format without any external dependency.
+"""
+
+import math
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+# Sub-buckets per power of two; 8 bounds the bucket width to 12.5%
+SUB_BUCKET_BITS = 3
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_EXACT_LIMIT = _SUB_BUCKETS << 1  # Values below this get a bucket each
+
+# Label values used once a registry holds max_series histograms
+OVERFLOW_LABEL = "other"
+
+HISTOGRAM_NAME = "bruno_ability_duration_seconds"
+
+# Longest action name used as a label as-is
+MAX_ACTION_LENGTH = 32
+
+COUNTER_HELP = {
+    "validation_failures": "Executions rejected by parameter validation",
+    "cancellations": "Executions skipped because the ability was cancelled",
+    "rejections": "Executions rejected by concurrency limits",
+    "errors": "Executions that raised an unexpected error",
+    "coalesced": "Executions that shared the result of an identical concurrent call",
+    "idempotent_replays": "Executions answered with the stored result of an idempotency key",
+    "deadline_exceeded": "Executions that ran out of their request deadline",
+    "cache_hits": "Read-only executions served from the result cache",
+    "cache_misses": "Read-only executions not found in the result cache",
+}
+
+
+# Resolves to a gauge callback, or None once its owner is garbage collected
+_GaugeRef = Callable[[], Callable[[], float] | None]
+
+
+def action_label(parameters: dict[str, Any]) -> str:
+    """
+    Get the action label for an execution.
+
+    Args:
+        parameters: Raw execution parameters
+
+    Returns:
+        Lowercased ``action`` parameter, empty if absent, or ``other`` if
+        it is not a short string
+    """
+    action = parameters.get("action")
+    if action is None:
+        return ""
+    if isinstance(action, str) and len(action) <= MAX_ACTION_LENGTH:
+        return action.lower()
+    return OVERFLOW_LABEL
+
+
+def bucket_index(value: int) -> int:
+    """
+    Get the histogram bucket for a non-negative integer value.
+
+    Args:
+        value: Value to bucket (e.g. nanoseconds)
+
+    Returns:
+        Bucket index
+    """
+    if value < _EXACT_LIMIT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """
+    Get the value range covered by a bucket.
+
+    Args:
+        index: Bucket index
+
+    Returns:
+        (lower, upper) bounds, lower inclusive and upper exclusive
+    """
+    if index < _EXACT_LIMIT:
+        return index, index + 1
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & (_SUB_BUCKETS - 1)) | _SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class Histogram:
+    """Sparse log-bucketed histogram of non-negative integers."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        """
+        Record a value.
+
+        Args:
+            value: Non-negative value to record
+        """
+        index = value if value < _EXACT_LIMIT else bucket_index(value)
+        buckets = self.buckets
+        buckets[index] = buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Midpoint of the bucket containing the quantile (0 if empty)
+        """
+        if not self.count:
+            return 0.0
+
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                lower, upper = bucket_bounds(index)
+                return min((lower + upper - 1) / 2, self.max)
+        return float(self.max)
+
+
+@dataclass(frozen=True)
+class HistogramSummary:
+    """
+    Summary of one latency histogram, in seconds.
+
+    Attributes:
+        count: Number of executions
+        total: Sum of durations
+        max: Longest duration
+        p50: Median duration
+        p90: 90th percentile duration
+        p99: 99th percentile duration
+    """
+
+    count: int
+    total: float
+    max: float
+    p50: float
+    p90: float
+    p99: float
+
+
+class MetricsRegistry:
+    """
+    In-process store of ability metrics.
+
+    Recording is a couple of dictionary operations so it can sit on the
+    execute path. Gauges are callbacks evaluated only when metrics are
+    collected; bound methods are held weakly, so abilities that go away
+    stop reporting without unregistering.
+    """
+
+    def __init__(self, max_series: int = 10_000) -> None:
+        """
+        Initialize the registry.
+
+        Args:
+            max_series: Maximum number of histograms; later label sets are
+                        folded into an ``other`` action
+        """
+        self._max_series = max_series
+        self._histograms: dict[tuple[str, str, str], Histogram] = {}
+        self._counters: dict[tuple[str, str], int] = {}
+        self._gauges: dict[str, tuple[str, list[_GaugeRef]]] = {}
+
+    def observe(self, ability: str, action: str, outcome: str, duration_ns: int) -> None:
+        """
+        Record an execution duration.
+
+        Args:
+            ability: Ability name
+            action: Action performed (empty if the ability has no actions)
+            outcome: Execution outcome (success, failure, invalid, ...)
+            duration_ns: Duration in nanoseconds
+        """
+        key = (ability, action, outcome)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            if len(self._histograms) >= self._max_series:
+                key = (ability, OVERFLOW_LABEL, outcome)
+                histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+        histogram.record(duration_ns)
+
+    def increment(self, name: str, ability: str, amount: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name: Counter name (see COUNTER_HELP)
+            ability: Ability name
+            amount: Amount to add
+        """
+        key = (name, ability)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def register_gauge(
+        self, name: str, callback: Callable[[], float], description: str = ""
+    ) -> None:
+        """
+        Register a gauge callback.
+
+        Several callbacks may share a name (e.g. one per ability instance);
+        their values are summed.
+
+        Args:
+            name: Gauge name
+            callback: Function returning the current value
+            description: Help text for the Prometheus output
+        """
+        if hasattr(callback, "__self__"):
+            ref: _GaugeRef = weakref.WeakMethod(callback)
+        else:
+
+            def ref() -> Callable[[], float]:
+                return callback
+
+        self._gauges.setdefault(name, (description, []))[1].append(ref)
+
+    def histogram(self, ability: str, action: str, outcome: str) -> Histogram | None:
+        """
+        Get the raw histogram for a label set.
+
+        Args:
+            ability: Ability name
+            action: Action performed
+            outcome: Execution outcome
+
+        Returns:
+            Histogram of durations in nanoseconds, or None if nothing was recorded
+        """
+        return self._histograms.get((ability, action, outcome))
+
+    def collect(self) -> dict[str, Any]:
+        """
+        Collect all metrics.
+
+        Returns:
+            Dictionary with ``histograms`` keyed by (ability, action,
+            outcome), ``counters`` keyed by (name, ability) and ``gauges``
+            keyed by name
+        """
+        histograms = {
+            key: HistogramSummary(
+                count=histogram.count,
+                total=histogram.total / 1e9,
+                max=histogram.max / 1e9,
+                p50=histogram.quantile(0.5) / 1e9,
+                p90=histogram.quantile(0.9) / 1e9,
+                p99=histogram.quantile(0.99) / 1e9,
+            )
+            for key, histogram in list(self._histograms.items())
+        }
+        return {
+            "histograms": histograms,
+            "counters": dict(self._counters),
+            "gauges": self._read_gauges(),
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Returns:
+            Exposition text
+        """
+        lines = [
+            f"# HELP {HISTOGRAM_NAME} Ability execution duration",
+            f"# TYPE {HISTOGRAM_NAME} histogram",
+        ]
+        for (ability, action, outcome), histogram in sorted(self._histograms.items()):
+            labels = _labels(ability=ability, action=action, outcome=outcome)
+            cumulative = 0
+            for index in sorted(histogram.buckets):
+                cumulative += histogram.buckets[index]
+                le = _format_float(bucket_bounds(index)[1] / 1e9)
+                lines.append(f'{HISTOGRAM_NAME}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f'{HISTOGRAM_NAME}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"{HISTOGRAM_NAME}_sum{{{labels}}} {_format_float(histogram.total / 1e9)}")
+            lines.append(f"{HISTOGRAM_NAME}_count{{{labels}}} {histogram.count}")
+
+        counters: dict[str, list[tuple[str, int]]] = {}
+        for (name, ability), value in sorted(self._counters.items()):
+            counters.setdefault(name, []).append((ability, value))
+        for name, values in counters.items():
+            metric = f"bruno_ability_{name}_total"
+            lines.append(f"# HELP {metric} {COUNTER_HELP.get(name, name)}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(
+                f"{metric}{{{_labels(ability=ability)}}} {value}" for ability, value in values
+            )
+
+        for name, value in sorted(self._read_gauges().items()):
+            metric = f"bruno_{name}"
+            lines.append(f"# HELP {metric} {self._gauges[name][0] or name}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {_format_float(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded histograms and counters (gauges stay registered)."""
+        self._histograms.clear()
+        self._counters.clear()
+
+    def _read_gauges(self) -> dict[str, float]:
+        """Evaluate gauge callbacks, dropping those whose owner is gone."""
+        values = {}
+        for name, (_, refs) in self._gauges.items():
+            total = 0.0
+            for ref in list(refs):
+                callback = ref()
+                if callback is None:
+                    refs.remove(ref)
+                    continue
+                total += callback()
+            values[name] = total
+        return values
+
+
+def _escape(value: str) -> str:
+    """Escape a Prometheus label value."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    """Format a Prometheus label set (without braces)."""
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+
+
+def _format_float(value: float) -> str:
+    """Format a sample value compactly."""
+    return repr(float(value))
+
+
+# Global metrics instance
+_global_metrics: MetricsRegistry | None = None
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Get the global metrics registry.
+
+    Returns:
+        Global metrics registry
+    """
+    global _global_metrics
+    if _global_metrics is None:
+        _global_metrics = MetricsRegistry()
+    return _global_metrics
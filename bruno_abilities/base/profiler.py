@@ -0,0 +1,302 @@
+"""
+In-process sampling profiler with per-ability attribution.
+
+This module periodically captures the Python stack of the thread running
+the event loop and aggregates the samples as folded stacks, the input
+format of flamegraph.pl, speedscope and inferno. Each stack is prefixed with
+the ability and action being executed when it was taken, so a flamegraph
+splits time by ability first.
+
+Two samplers are available:
+
+- ``signal``: a ``SIGPROF`` interval timer (POSIX only, profiler started
+  from the main thread). It samples CPU time only and reads the
+  attribution from the :data:`current_execution` context variable set by
+  ``BaseAbility.execute``, which reflects the task that was interrupted.
+- ``thread``: a background thread sampling wall time. Context variables of
+  another thread cannot be read, so the attribution is taken from the
+  innermost ``BaseAbility.execute`` or ``_dispatch`` frame on the sampled
+  stack instead.
+
+At the default 100 Hz, the cost of a sample is a stack walk and one
+dictionary update, cheap enough to leave running.
+"""
+
+import os
+import signal
+import sys
+import threading
+from collections.abc import Iterable
+from contextvars import ContextVar
+from pathlib import Path
+from types import CodeType, FrameType
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+# Ability name and action of the execution in progress, set by BaseAbility.execute
+current_execution: ContextVar[tuple[str, str] | None] = ContextVar(
+    "bruno_current_execution", default=None
+)
+
+# Stack prefix of samples taken outside any ability execution
+UNATTRIBUTED = "[unattributed]"
+
+# Key under which stacks are counted once max_stacks distinct stacks are held
+_TRUNCATED: tuple[str, tuple[CodeType, ...]] = ("[truncated]", ())
+
+
+def _attribution_label(execution: tuple[str, str] | None) -> str:
+    """Format an (ability, action) pair as the root frame of a stack."""
+    if execution is None:
+        return UNATTRIBUTED
+    ability, action = execution
+    return f"[{ability}:{action}]" if action else f"[{ability}]"
+
+
+def _frame_name(code: CodeType) -> str:
+    """Format a code object as a folded-stack frame."""
+    name = getattr(code, "co_qualname", code.co_name)
+    filename = os.path.basename(code.co_filename)
+    # ';' separates frames; spaces are fine, the count follows the last one
+    return f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """
+    Sampling profiler aggregating folded stacks in memory.
+
+    Only code objects are stored per sample; frames are formatted when the
+    profile is read, which keeps sampling cheap.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.01,
+        mode: str = "auto",
+        max_depth: int = 128,
+        max_stacks: int = 20_000,
+    ) -> None:
+        """
+        Initialize the profiler.
+
+        Args:
+            interval: Seconds between samples
+            mode: ``signal``, ``thread``, or ``auto`` to use the signal
+                  sampler when available
+            max_depth: Frames kept per sample (innermost first)
+            max_stacks: Distinct stacks kept; later ones are counted as
+                        ``[truncated]``
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in ("auto", "signal", "thread"):
+            raise ValueError(f"Unknown profiler mode: {mode}")
+
+        self._interval = interval
+        self._mode = mode
+        self._max_depth = max_depth
+        self._max_stacks = max_stacks
+        self._stacks: dict[tuple[str, tuple[CodeType, ...]], int] = {}
+        self._samples = 0
+        self._active_mode: str | None = None
+        self._previous_handler: signal.Handlers | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self._execute_codes: frozenset[CodeType] = frozenset()
+
+    @property
+    def running(self) -> bool:
+        """Whether the profiler is sampling."""
+        return self._active_mode is not None
+
+    @property
+    def mode(self) -> str | None:
+        """Sampler in use while running (``signal`` or ``thread``)."""
+        return self._active_mode
+
+    @property
+    def samples(self) -> int:
+        """Number of samples taken since the last reset."""
+        return self._samples
+
+    def start(self) -> None:
+        """
+        Start sampling the calling thread.
+
+        Raises:
+            RuntimeError: If already running, or if the signal sampler was
+                          requested but cannot be used
+        """
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+
+        in_main_thread = threading.current_thread() is threading.main_thread()
+        signal_available = hasattr(signal, "setitimer") and in_main_thread
+        mode = self._mode
+        if mode == "auto":
+            mode = "signal" if signal_available else "thread"
+        elif mode == "signal" and not signal_available:
+            raise RuntimeError("Signal sampling requires POSIX and the main thread")
+
+        if mode == "signal":
+            self._previous_handler = signal.signal(signal.SIGPROF, self._handle_signal)
+            signal.setitimer(signal.ITIMER_PROF, self._interval, self._interval)
+        else:
+            # Imported here since ability_base imports this module
+            from bruno_abilities.base.ability_base import BaseAbility
+
+            self._execute_codes = frozenset(
+                (BaseAbility.execute.__code__, BaseAbility._dispatch.__code__)
+            )
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._sample_thread,
+                args=(threading.get_ident(),),
+                name="bruno-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+
+        self._active_mode = mode
+        logger.info("Profiler started", mode=mode, interval=self._interval)
+
+    def stop(self) -> None:
+        """Stop sampling; collected stacks are kept."""
+        if self._active_mode == "signal":
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            self._previous_handler = None
+        elif self._active_mode == "thread" and self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+        if self._active_mode is not None:
+            logger.info("Profiler stopped", samples=self._samples)
+        self._active_mode = None
+
+    def reset(self) -> None:
+        """Drop all collected stacks."""
+        self._stacks = {}
+        self._samples = 0
+
+    def by_ability(self) -> dict[str, int]:
+        """
+        Count samples per ability and action.
+
+        Returns:
+            Sample counts keyed by the stack's root frame
+            (e.g. ``[timer:create]``)
+        """
+        counts: dict[str, int] = {}
+        for (label, _), count in list(self._stacks.items()):
+            counts[label] = counts.get(label, 0) + count
+        return counts
+
+    def folded(self, ability: str | None = None) -> str:
+        """
+        Render collected samples as folded stacks.
+
+        Args:
+            ability: Only include samples attributed to this ability
+
+        Returns:
+            One ``root;caller;...;leaf count`` line per distinct stack
+        """
+        names: dict[CodeType, str] = {}
+        lines: dict[str, int] = {}
+        prefix = f"[{ability}" if ability is not None else None
+
+        for (label, codes), count in list(self._stacks.items()):
+            if prefix is not None and not (label == f"{prefix}]" or label.startswith(prefix + ":")):
+                continue
+
+            frames = [label]
+            for code in reversed(codes):
+                name = names.get(code)
+                if name is None:
+                    name = names[code] = _frame_name(code)
+                frames.append(name)
+            line = ";".join(frames)
+            lines[line] = lines.get(line, 0) + count
+
+        return "".join(f"{line} {count}\n" for line, count in sorted(lines.items()))
+
+    def dump(self, path: Path | str, ability: str | None = None) -> int:
+        """
+        Write folded stacks to a file for flamegraph tools.
+
+        Args:
+            path: Output file
+            ability: Only include samples attributed to this ability
+
+        Returns:
+            Number of distinct stacks written
+        """
+        folded = self.folded(ability)
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(folded)
+        return folded.count("\n")
+
+    def _record(self, label: str, codes: tuple[CodeType, ...]) -> None:
+        """Count one sample."""
+        stacks = self._stacks
+        key = (label, codes)
+        if key not in stacks and len(stacks) >= self._max_stacks:
+            key = _TRUNCATED
+        stacks[key] = stacks.get(key, 0) + 1
+        self._samples += 1
+
+    def _walk(self, frame: FrameType | None) -> Iterable[FrameType]:
+        """Iterate over a stack from the innermost frame, up to max_depth frames."""
+        depth = 0
+        while frame is not None and depth < self._max_depth:
+            yield frame
+            frame = frame.f_back
+            depth += 1
+
+    def _handle_signal(self, signum: int, frame: FrameType | None) -> None:
+        """SIGPROF handler; runs in the context of the interrupted task."""
+        codes = tuple(f.f_code for f in self._walk(frame))
+        self._record(_attribution_label(current_execution.get()), codes)
+
+    def _sample_thread(self, thread_id: int) -> None:
+        """Sample another thread's stack until stopped."""
+        execute_codes = self._execute_codes
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+
+            codes = []
+            execution = None
+            for f in self._walk(frame):
+                code = f.f_code
+                codes.append(code)
+                if execution is None and code in execute_codes:
+                    # Innermost BaseAbility.execute (or _dispatch, run as its own
+                    # task under a deadline) on the stack
+                    local_vars = f.f_locals
+                    execution = (local_vars.get("name") or "?", local_vars.get("action") or "")
+            self._record(_attribution_label(execution), tuple(codes))
+
+
+# Global profiler instance
+_global_profiler: SamplingProfiler | None = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """
+    Get the global profiler (created stopped).
+
+    Returns:
+        Global sampling profiler
+    """
+    global _global_profiler
+    if _global_profiler is None:
+        _global_profiler = SamplingProfiler()
+    return _global_profiler
@@ -0,0 +1,140 @@
+"""
+Result cache for read-only ability actions.
+
+Abilities declare their read-only actions in ``AbilityMetadata.cache``;
+``BaseAbility`` then serves repeated calls with the same normalized
+parameters from this cache. Each user has a generation counter that every
+other action bumps, so a write invalidates all of the user's cached reads
+without tracking which reads it affects.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bruno_abilities.base.ability_base import AbilityResult
+
+
+@dataclass
+class _Entry:
+    """Cached result with the generation it was computed at."""
+
+    generation: int
+    result: "AbilityResult"
+    expires_at: float | None
+
+
+def cache_key(parameters: dict[str, Any]) -> str:
+    """
+    Normalize validated parameters into a cache key.
+
+    Args:
+        parameters: Validated parameters
+
+    Returns:
+        Canonical JSON of the parameters, with the action lowercased
+    """
+    action = parameters.get("action")
+    if isinstance(action, str):
+        parameters = {**parameters, "action": action.lower()}
+    return json.dumps(parameters, sort_keys=True, default=str, separators=(",", ":"))
+
+
+class ResultCache:
+    """
+    Bounded LRU of action results keyed by user and parameters.
+
+    Results are stored as returned and shared between hits, so cached
+    results must not be mutated by callers.
+    """
+
+    def __init__(
+        self, read_actions: list[str], max_entries: int = 256, ttl: float | None = None
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            read_actions: Actions whose results may be cached
+            max_entries: Maximum cached results across all users
+            ttl: Seconds a result stays valid, or None for no expiry
+        """
+        self.read_actions = frozenset(action.lower() for action in read_actions)
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, user_id: str) -> int:
+        """
+        Get a user's current generation.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            Generation to pass to put() for a result computed from now on
+        """
+        return self._generations.get(user_id, 0)
+
+    def get(self, user_id: str, key: str) -> "AbilityResult | None":
+        """
+        Look up a result.
+
+        Args:
+            user_id: User ID
+            key: Key from cache_key()
+
+        Returns:
+            Cached result, or None if absent, stale or expired
+        """
+        entry = self._entries.get((user_id, key))
+        if entry is None:
+            return None
+        if entry.generation != self._generations.get(user_id, 0) or (
+            entry.expires_at is not None and entry.expires_at <= time.monotonic()
+        ):
+            del self._entries[(user_id, key)]
+            return None
+        self._entries.move_to_end((user_id, key))
+        return entry.result
+
+    def put(self, user_id: str, key: str, generation: int, result: "AbilityResult") -> None:
+        """
+        Store a result.
+
+        Args:
+            user_id: User ID
+            key: Key from cache_key()
+            generation: User generation read before computing the result;
+                        results of a generation invalidated meanwhile are dropped
+            result: Result to cache
+        """
+        if generation != self._generations.get(user_id, 0):
+            return
+        expires_at = time.monotonic() + self._ttl if self._ttl is not None else None
+        self._entries[(user_id, key)] = _Entry(generation, result, expires_at)
+        self._entries.move_to_end((user_id, key))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str | None = None) -> None:
+        """
+        Invalidate cached results.
+
+        Args:
+            user_id: User whose results are invalidated, or None for all users
+        """
+        if user_id is None:
+            self._entries.clear()
+            for user in self._generations:
+                self._generations[user] += 1
+            return
+        # Entries of older generations are dropped when next looked up or evicted
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
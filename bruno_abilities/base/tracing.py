@@ -0,0 +1,471 @@
+"""
+Lightweight tracing for ability execution.
+
+This module provides spans that the execute pipeline, the state manager and
+the scheduler loops emit into. Tracing is off by default: until a
+:class:`SpanCollector` is installed, :func:`start_span` returns a shared
+no-op span, so instrumented code pays for little more than a global lookup.
+
+The collector keeps finished spans in a ring buffer and can append them to a
+file as OTLP/JSON, the format read by the OpenTelemetry collector's file
+receiver. Trace context crosses process boundaries through the
+``traceparent`` key of ``AbilityContext.metadata``, in W3C Trace Context
+format.
+"""
+
+import functools
+import json
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Mapping
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+T = TypeVar("T")
+
+# Metadata key carrying the parent span across processes
+TRACEPARENT_KEY = "traceparent"
+
+SERVICE_NAME = "bruno-abilities"
+
+# OTLP span kind and status codes
+_KIND_INTERNAL = 1
+_STATUS_ERROR = 2
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """
+    Identity of a span, as propagated to its children.
+
+    Attributes:
+        trace_id: 32-character hex trace ID
+        span_id: 16-character hex span ID
+    """
+
+    trace_id: str
+    span_id: str
+
+    def to_traceparent(self) -> str:
+        """Format as a W3C ``traceparent`` header value."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: str) -> "SpanContext | None":
+        """
+        Parse a W3C ``traceparent`` header value.
+
+        Args:
+            value: Header value
+
+        Returns:
+            Span context, or None if the value is malformed
+        """
+        parts = value.split("-")
+        if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+            return None
+        try:
+            int(parts[1], 16)
+            int(parts[2], 16)
+        except ValueError:
+            return None
+        return cls(trace_id=parts[1], span_id=parts[2])
+
+
+class Span:
+    """
+    A timed operation within a trace.
+
+    Spans are context managers: entering makes the span current, so spans
+    started inside it become its children, and exiting ends it. An
+    exception escaping the block marks the span as failed.
+    """
+
+    __slots__ = (
+        "name",
+        "context",
+        "parent_id",
+        "start_ns",
+        "end_ns",
+        "attributes",
+        "error",
+        "_collector",
+        "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: str | None,
+        collector: "SpanCollector",
+        attributes: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Initialize and start the span.
+
+        Args:
+            name: Operation name
+            context: Identity of the span
+            parent_id: Span ID of the parent, None for a root span
+            collector: Collector receiving the span when it ends
+            attributes: Initial attributes
+        """
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes or {}
+        self.error: str | None = None
+        self._collector = collector
+        self._token: Token | None = None
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether the span records data (False for the no-op span)."""
+        return True
+
+    @property
+    def duration(self) -> float | None:
+        """Duration in seconds, or None while the span is running."""
+        return None if self.end_ns is None else (self.end_ns - self.start_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Set an attribute.
+
+        Args:
+            key: Attribute name (dotted, e.g. ``ability.name``)
+            value: Attribute value
+        """
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """
+        Mark the span as failed.
+
+        Args:
+            message: Error description
+        """
+        self.error = message
+
+    def end(self) -> None:
+        """End the span and hand it to the collector (only the first call counts)."""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self._collector.record(self)
+
+    def __enter__(self) -> "Span":
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is not None and self.error is None:
+            self.error = f"{exc_type.__name__}: {exc}" if str(exc) else exc_type.__name__
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end()
+
+    def __repr__(self) -> str:
+        return f"Span({self.name!r}, span_id={self.context.span_id!r})"
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled."""
+
+    __slots__ = ()
+
+    context = None
+    is_recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Span | None] = ContextVar("bruno_current_span", default=None)
+
+
+class SpanCollector:
+    """
+    In-process span recorder.
+
+    Finished spans are kept in a ring buffer, so memory stays bounded and
+    the most recent traces are always available for inspection or export.
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        """
+        Initialize the collector.
+
+        Args:
+            capacity: Maximum number of finished spans kept
+        """
+        self._spans: deque[Span] = deque(maxlen=capacity)
+
+    def record(self, span: Span) -> None:
+        """
+        Store a finished span.
+
+        Args:
+            span: Span that has ended
+        """
+        self._spans.append(span)
+
+    def spans(self) -> list[Span]:
+        """
+        Get the buffered spans, oldest first.
+
+        Returns:
+            Finished spans in the order they ended
+        """
+        return list(self._spans)
+
+    def traces(self) -> dict[str, list[Span]]:
+        """
+        Group the buffered spans into traces.
+
+        Returns:
+            Spans by trace ID, each list ordered by start time
+        """
+        traces: dict[str, list[Span]] = {}
+        for span in self._spans:
+            traces.setdefault(span.context.trace_id, []).append(span)
+        for spans in traces.values():
+            spans.sort(key=lambda span: span.start_ns)
+        return traces
+
+    def clear(self) -> None:
+        """Drop all buffered spans."""
+        self._spans.clear()
+
+    def to_otlp(self) -> dict[str, Any]:
+        """
+        Convert the buffered spans to an OTLP/JSON trace export request.
+
+        Returns:
+            JSON-compatible ``ExportTraceServiceRequest``
+        """
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "bruno_abilities"},
+                            "spans": [_otlp_span(span) for span in self._spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def export(self, path: Path | str, clear: bool = True) -> int:
+        """
+        Append the buffered spans to a file as one OTLP/JSON line.
+
+        Args:
+            path: Output file
+            clear: Drop the exported spans from the buffer
+
+        Returns:
+            Number of spans exported
+        """
+        count = len(self._spans)
+        if not count:
+            return 0
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a") as f:
+            f.write(json.dumps(self.to_otlp(), separators=(",", ":")) + "\n")
+
+        if clear:
+            self.clear()
+        return count
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Convert an attribute value to an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Mapping[str, Any]) -> list[dict[str, Any]]:
+    """Convert attributes to OTLP key-value pairs."""
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    """Convert a finished span to OTLP/JSON."""
+    data = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": _KIND_INTERNAL,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": _otlp_attributes(span.attributes),
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    if span.error is not None:
+        data["status"] = {"code": _STATUS_ERROR, "message": span.error}
+    return data
+
+
+# Installed collector; None disables tracing
+_collector: SpanCollector | None = None
+
+
+def set_collector(collector: SpanCollector | None) -> None:
+    """
+    Install the span collector, or disable tracing with None.
+
+    Args:
+        collector: Collector receiving finished spans
+    """
+    global _collector
+    _collector = collector
+
+
+def get_collector() -> SpanCollector | None:
+    """
+    Get the installed span collector.
+
+    Returns:
+        Installed collector, or None if tracing is disabled
+    """
+    return _collector
+
+
+def current_span() -> Span | None:
+    """
+    Get the active span.
+
+    Returns:
+        Span of the innermost active ``with`` block, or None
+    """
+    return _current_span.get()
+
+
+def start_span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    metadata: Mapping[str, Any] | None = None,
+    root: bool = False,
+) -> Span | _NoopSpan:
+    """
+    Start a span, to be used as a context manager.
+
+    The parent is the active span, or the span named by ``traceparent`` in
+    ``metadata`` if none is active.
+
+    Args:
+        name: Operation name
+        attributes: Initial attributes
+        metadata: Context metadata to take the parent from
+        root: Start a new trace even if a span is active (for background
+              loops, which would otherwise inherit the span that started them)
+
+    Returns:
+        New span, or the no-op span if tracing is disabled
+    """
+    collector = _collector
+    if collector is None:
+        return NOOP_SPAN
+
+    parent = None
+    if not root:
+        active = _current_span.get()
+        if active is not None:
+            parent = active.context
+        elif metadata:
+            parent = extract_trace_context(metadata)
+
+    span_id = f"{random.getrandbits(64):016x}"
+    if parent is None:
+        context = SpanContext(trace_id=f"{random.getrandbits(128):032x}", span_id=span_id)
+        return Span(name, context, None, collector, attributes)
+
+    context = SpanContext(trace_id=parent.trace_id, span_id=span_id)
+    return Span(name, context, parent.span_id, collector, attributes)
+
+
+def inject_trace_context(metadata: dict[str, Any]) -> None:
+    """
+    Record the active span in context metadata.
+
+    Args:
+        metadata: Metadata to write ``traceparent`` into (unchanged if no
+                  span is active)
+    """
+    active = _current_span.get()
+    if active is not None:
+        metadata[TRACEPARENT_KEY] = active.context.to_traceparent()
+
+
+def extract_trace_context(metadata: Mapping[str, Any]) -> SpanContext | None:
+    """
+    Read a propagated span from context metadata.
+
+    Args:
+        metadata: Context metadata
+
+    Returns:
+        Span context named by ``traceparent``, or None
+    """
+    value = metadata.get(TRACEPARENT_KEY)
+    return SpanContext.from_traceparent(value) if isinstance(value, str) else None
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorator to run an async function inside a span.
+
+    Args:
+        name: Span name
+
+    Returns:
+        Decorated function
+
+    Example:
+        @traced("state.get")
+        async def get(self, key: str) -> Any:
+            ...
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            if _collector is None:
+                return await func(*args, **kwargs)
+            with start_span(name):
+                return await func(*args, **kwargs)
+
+        return cast(Callable[..., Awaitable[T]], wrapper)
+
+    return decorator
@@ -4,9 +4,21 @@ Infrastructure components for ability state management.
 This package provides state persistence for abilities across sessions.
 """
 
-from bruno_abilities.infrastructure.state_manager import StateManager, StateScope
+from bruno_abilities.infrastructure.backends import FileStateBackend
+from bruno_abilities.infrastructure.codecs import CodecRegistry, StateCodec
+from bruno_abilities.infrastructure.state_manager import (
+    StateConflictError,
+    StateManager,
+    StateScope,
+    StateTransaction,
+)
 
 __all__ = [
+    "CodecRegistry",
+    "FileStateBackend",
+    "StateCodec",
+    "StateConflictError",
     "StateManager",
     "StateScope",
+    "StateTransaction",
 ]
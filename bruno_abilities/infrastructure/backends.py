@@ -0,0 +1,628 @@
+"""
+Storage backends for persisted ability state.
+
+This module provides the file-based backend used by the state manager.
+Each entry is stored in its own record file, and multi-entry batches are
+committed atomically through a write-ahead journal.
+"""
+
+import glob
+import json
+import os
+import pickle
+import shutil
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote
+
+import structlog
+
+from bruno_abilities.infrastructure.codecs import StateCodec
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = structlog.get_logger(__name__)
+
+# (scope, state_key, record) for writes and (scope, state_key) for deletes
+BatchPut = tuple[str, str, dict[str, Any]]
+BatchDelete = tuple[str, str]
+
+# Record fields with a maintained secondary index
+INDEX_FIELDS = ("ability_name", "user_id", "session_id")
+
+# Change log entry meaning "every key in the scope may have changed"
+ALL_KEYS = "*"
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist the entries of a directory (a no-op where unsupported)."""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class FileStateBackend:
+    """
+    Stores state records as files grouped by scope.
+
+    Single records are written to a temporary file and renamed into place,
+    so readers never observe a partially written record. With ``durable``
+    (the default in multi-process mode) records and index markers are also
+    fsynced before the write returns. Batches are first
+    written as one journal record, then applied; an interrupted batch is
+    replayed from the journal the next time the backend is opened.
+
+    Each record is also listed in secondary indexes by ability, user and
+    session (``<scope>/_index/<field>/<value>/<record>`` marker files
+    holding the state key), so purges only touch matching records.
+
+    In multi-process mode every mutation holds an exclusive ``fcntl`` lock
+    on ``_lock`` and appends the changed keys to ``_changes.log``. Each
+    backend tails the log through :meth:`poll_changes`, so cached entries
+    can be invalidated key by key when another process writes them. The
+    log starts with a random epoch line that changes on every rotation.
+
+    Records written as pickle files by earlier versions are not loaded by
+    default, since unpickling can run arbitrary code; they are kept on
+    disk untouched. Opening the storage with ``migrate_pickle=True`` loads
+    each of them on first access and rewrites it in the current format.
+    """
+
+    # Current record extension followed by legacy ones, in lookup order
+    RECORD_SUFFIX = ".state"
+    LEGACY_SUFFIXES = (".json", ".pkl")
+    JOURNAL_NAME = "_journal.state"
+    INDEX_DIR = "_index"
+    LOCK_NAME = "_lock"
+    CHANGELOG_NAME = "_changes.log"
+
+    def __init__(
+        self,
+        storage_path: Path,
+        codec: StateCodec | None = None,
+        multiprocess: bool = False,
+        max_changelog_bytes: int = 1024 * 1024,
+        migrate_pickle: bool = False,
+        durable: bool | None = None,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            storage_path: Root directory for state records
+            codec: Codec used to encode records (defaults to StateCodec)
+            multiprocess: Coordinate with other processes sharing storage_path
+            max_changelog_bytes: Change log size that triggers a rotation
+            migrate_pickle: Load legacy pickle records and rewrite them in the
+                           current format (only for storage written by this
+                           application, as unpickling can run arbitrary code)
+            durable: fsync every record and index marker, so that a write
+                     survives a crash once it returns (defaults to
+                     multiprocess); batches are always made durable before
+                     their journal is removed
+
+        Raises:
+            RuntimeError: If multi-process mode is requested without fcntl support
+        """
+        if multiprocess and fcntl is None:
+            raise RuntimeError("Multi-process state storage requires fcntl (POSIX only)")
+
+        self.storage_path = storage_path
+        self.codec = codec or StateCodec()
+        self.multiprocess = multiprocess
+        self.max_changelog_bytes = max_changelog_bytes
+        self.migrate_pickle = migrate_pickle
+        self.durable = multiprocess if durable is None else durable
+
+        self._writer_id = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._lock_fd: int | None = None
+        self._lock_depth = 0
+        self._pending_changes: list[tuple[str, str]] = []
+        # (epoch, offset) of the change log position already seen
+        self._changelog_position: tuple[str | None, int] = (None, 0)
+
+        if multiprocess:
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._changelog_position = self._changelog_end()
+
+        with self.locked():
+            journal_path = self.storage_path / self.JOURNAL_NAME
+            if journal_path.exists():
+                self._replay_journal(journal_path)
+
+    def path(self, scope: str, state_key: str, suffix: str = RECORD_SUFFIX) -> Path:
+        """
+        Get the file path of a record.
+
+        Args:
+            scope: State scope value
+            state_key: Fully qualified state key
+            suffix: File suffix
+
+        Returns:
+            Record file path
+        """
+        return self.storage_path / scope / f"{state_key.replace(':', '_')}{suffix}"
+
+    def load(self, scope: str, state_key: str) -> dict[str, Any] | None:
+        """
+        Load a record.
+
+        Args:
+            scope: State scope value
+            state_key: Fully qualified state key
+
+        Returns:
+            Decoded record or None if not stored
+        """
+        # Binary records first, then legacy JSON records
+        for suffix in (self.RECORD_SUFFIX, ".json"):
+            file_path = self.path(scope, state_key, suffix)
+            if file_path.exists():
+                return self.codec.decode(file_path.read_bytes())
+
+        pickle_path = self.path(scope, state_key, ".pkl")
+        if pickle_path.exists():
+            if self.migrate_pickle:
+                return self._migrate_pickle(scope, state_key, pickle_path)
+            logger.warning(
+                "Ignoring legacy pickle state record, enable migrate_pickle to load it",
+                state_key=state_key,
+            )
+
+        return None
+
+    def _migrate_pickle(self, scope: str, state_key: str, file_path: Path) -> dict[str, Any] | None:
+        """Load a legacy pickle record and rewrite it in the current format."""
+        with self.locked():
+            try:
+                with open(file_path, "rb") as f:
+                    record = pickle.load(f)
+            except Exception as e:
+                logger.error(
+                    "Failed to load legacy pickle state record", state_key=state_key, error=str(e)
+                )
+                return None
+            if not isinstance(record, dict):
+                logger.error("Legacy pickle state record is not a mapping", state_key=state_key)
+                return None
+
+            try:
+                self._write(scope, state_key, record)
+            except (TypeError, ValueError) as e:
+                # Keep the pickle file, the record cannot be stored in the new format
+                logger.warning(
+                    "Legacy pickle state record loaded but not migrated",
+                    state_key=state_key,
+                    error=str(e),
+                )
+                return record
+
+        logger.info("Migrated legacy pickle state record", state_key=state_key)
+        return record
+
+    def write(self, scope: str, state_key: str, record: dict[str, Any]) -> Path:
+        """
+        Atomically write a record.
+
+        Args:
+            scope: State scope value
+            state_key: Fully qualified state key
+            record: Record to store
+
+        Returns:
+            Path of the written file
+        """
+        with self.locked():
+            return self._write(scope, state_key, record)
+
+    def _write(
+        self, scope: str, state_key: str, record: dict[str, Any], sync: bool | None = None
+    ) -> Path:
+        """Write a record while holding the storage lock, synced if durable or sync."""
+        sync = self.durable if sync is None else sync
+        file_path = self.path(scope, state_key)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(file_path, self.codec.encode(record), sync=sync)
+        self.index_record(scope, state_key, record, sync=sync)
+
+        # Drop records written by older versions so they are not loaded again;
+        # pickle records are kept for a manual migration unless migrating
+        for suffix in self.LEGACY_SUFFIXES:
+            if suffix == ".pkl" and not self.migrate_pickle:
+                continue
+            legacy_path = self.path(scope, state_key, suffix)
+            if legacy_path.exists():
+                legacy_path.unlink()
+
+        self._record_change(scope, state_key)
+
+        return file_path
+
+    def delete(self, scope: str, state_key: str) -> bool:
+        """
+        Delete a record and any legacy copies.
+
+        Args:
+            scope: State scope value
+            state_key: Fully qualified state key
+
+        Returns:
+            True if a record file was removed
+        """
+        with self.locked():
+            return self._delete(scope, state_key)
+
+    def _delete(self, scope: str, state_key: str) -> bool:
+        """Delete a record while holding the storage lock."""
+        deleted = False
+
+        try:
+            record = self.load(scope, state_key)
+        except Exception:
+            record = None
+
+        for suffix in (self.RECORD_SUFFIX, *self.LEGACY_SUFFIXES):
+            file_path = self.path(scope, state_key, suffix)
+            if file_path.exists():
+                file_path.unlink()
+                deleted = True
+                logger.debug("State file deleted", file=str(file_path))
+
+        if record:
+            self._unindex_record(scope, state_key, record)
+
+        if deleted:
+            self._record_change(scope, state_key)
+
+        return deleted
+
+    def clear(self, scope: str) -> set[str]:
+        """
+        Delete every record in a scope, including its indexes.
+
+        Args:
+            scope: State scope value
+
+        Returns:
+            File stems (state keys with ``:`` replaced by ``_``) of removed records
+        """
+        scope_dir = self.storage_path / scope
+        if not scope_dir.is_dir():
+            return set()
+
+        with self.locked():
+            stems = {
+                file_path.name.rsplit(".", 1)[0]
+                for suffix in (self.RECORD_SUFFIX, *self.LEGACY_SUFFIXES)
+                for file_path in scope_dir.glob(f"*{suffix}")
+            }
+            shutil.rmtree(scope_dir)
+            self._record_change(scope, ALL_KEYS)
+
+        return stems
+
+    def lookup(self, scope: str, field: str, value: str) -> set[str]:
+        """
+        Find state keys through a secondary index.
+
+        Args:
+            scope: State scope value
+            field: Indexed field (one of INDEX_FIELDS)
+            value: Field value
+
+        Returns:
+            State keys of records with the given field value
+        """
+        marker_dir = self._marker_dir(scope, field, value)
+        if not marker_dir.is_dir():
+            return set()
+
+        return {marker.read_text(encoding="utf-8") for marker in marker_dir.iterdir()}
+
+    def index_record(
+        self, scope: str, state_key: str, record: dict[str, Any], sync: bool = False
+    ) -> None:
+        """
+        Add a record to the secondary indexes.
+
+        Args:
+            scope: State scope value
+            state_key: Fully qualified state key
+            record: Record whose identifier fields are indexed
+            sync: fsync new markers and their directories
+        """
+        stem = state_key.replace(":", "_")
+
+        for field in INDEX_FIELDS:
+            value = record.get(field)
+            if not value:
+                continue
+
+            marker = self._marker_dir(scope, field, value) / stem
+            if not marker.exists():
+                marker.parent.mkdir(parents=True, exist_ok=True)
+                if sync:
+                    self._atomic_write(marker, state_key.encode("utf-8"), sync=True)
+                else:
+                    marker.write_text(state_key, encoding="utf-8")
+
+    def drop_indexes(self, scope: str) -> None:
+        """
+        Remove all secondary indexes of a scope.
+
+        Args:
+            scope: State scope value
+        """
+        shutil.rmtree(self.storage_path / scope / self.INDEX_DIR, ignore_errors=True)
+
+    def write_batch(self, puts: list[BatchPut], deletes: list[BatchDelete]) -> set[tuple[str, str]]:
+        """
+        Atomically apply several writes and deletes.
+
+        Args:
+            puts: Records to write
+            deletes: Records to delete
+
+        Returns:
+            The (scope, state_key) pairs that had a stored record removed
+        """
+        with self.locked():
+            if len(puts) + len(deletes) == 1:
+                # A single operation is already atomic on its own
+                if puts:
+                    self._write(*puts[0])
+                    return set()
+                return {deletes[0]} if self._delete(*deletes[0]) else set()
+
+            journal_path = self.storage_path / self.JOURNAL_NAME
+            journal = {
+                "puts": [list(put) for put in puts],
+                "deletes": [list(delete) for delete in deletes],
+            }
+
+            self.storage_path.mkdir(parents=True, exist_ok=True)
+            self._atomic_write(journal_path, self.codec.encode(journal))
+            removed = self._apply_journal(journal, sync=True)
+            # Writes are already durable; make the deletes durable before
+            # dropping the journal that would replay them
+            for scope in {scope for scope, _ in removed}:
+                _fsync_directory(self.storage_path / scope)
+            journal_path.unlink()
+
+        return removed
+
+    def poll_changes(self) -> set[tuple[str, str]] | None:
+        """
+        Read changes made by other processes since the last poll.
+
+        Returns:
+            (scope, state_key) pairs that changed, where a state key of
+            ALL_KEYS covers the whole scope, or None if the change log was
+            rotated and every cached entry must be considered stale
+        """
+        if not self.multiprocess:
+            return set()
+
+        changelog_path = self.storage_path / self.CHANGELOG_NAME
+        epoch, offset = self._changelog_position
+
+        try:
+            with open(changelog_path, "rb") as f:
+                header = f.readline()
+                current_epoch = json.loads(header)[1] if header.endswith(b"\n") else None
+                if current_epoch is None:
+                    return set()
+
+                if epoch is None:
+                    # Created since the last poll, everything in it is new
+                    offset = len(header)
+                elif current_epoch != epoch:
+                    # Rotated since the last poll, entries in between are lost
+                    self._changelog_position = (current_epoch, f.seek(0, os.SEEK_END))
+                    return None
+
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return set()
+
+        # Only consume complete lines
+        end = data.rfind(b"\n") + 1
+        self._changelog_position = (current_epoch, offset + end)
+
+        changes = set()
+        for line in data[:end].splitlines():
+            writer_id, scope, state_key = json.loads(line)
+            if writer_id != self._writer_id:
+                changes.add((scope, state_key))
+
+        return changes
+
+    def iter_records(self, scope: str, key_prefix: str = "") -> Iterator[dict[str, Any]]:
+        """
+        Iterate over stored records whose key starts with a prefix.
+
+        Args:
+            scope: State scope value
+            key_prefix: Prefix of the unqualified state key
+
+        Yields:
+            Decoded records
+        """
+        scope_dir = self.storage_path / scope
+        if not scope_dir.is_dir():
+            return
+
+        safe_prefix = key_prefix.replace(":", "_")
+        seen: set[str] = set()
+
+        for suffix in (self.RECORD_SUFFIX, ".json"):
+            for file_path in scope_dir.glob(f"{glob.escape(safe_prefix)}*{suffix}"):
+                stem = file_path.name[: -len(suffix)]
+                if stem in seen:
+                    continue
+                seen.add(stem)
+
+                try:
+                    record = self.codec.decode(file_path.read_bytes())
+                except Exception as e:
+                    logger.error("Failed to read state record", file=str(file_path), error=str(e))
+                    continue
+
+                if str(record.get("key", "")).startswith(key_prefix):
+                    yield record
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """
+        Hold the cross-process storage lock.
+
+        The lock is re-entrant and a no-op unless in multi-process mode.
+        Use it to make a read followed by a write atomic across processes.
+        """
+        if not self.multiprocess:
+            yield
+            return
+
+        if self._lock_depth == 0:
+            if self._lock_fd is None:
+                self._lock_fd = os.open(self.storage_path / self.LOCK_NAME, os.O_RDWR | os.O_CREAT)
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                try:
+                    self._flush_changes()
+                finally:
+                    fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        """Release the file descriptor of the multi-process lock."""
+        if self._lock_fd is not None and self._lock_depth == 0:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _record_change(self, scope: str, state_key: str) -> None:
+        """Queue a change log entry, written when the lock is released."""
+        if self.multiprocess:
+            self._pending_changes.append((scope, state_key))
+
+    def _flush_changes(self) -> None:
+        """Append queued changes to the change log, rotating it when too large."""
+        if not self._pending_changes:
+            return
+
+        lines = b"".join(
+            json.dumps([self._writer_id, scope, state_key]).encode() + b"\n"
+            for scope, state_key in self._pending_changes
+        )
+        self._pending_changes.clear()
+
+        changelog_path = self.storage_path / self.CHANGELOG_NAME
+        if not changelog_path.exists():
+            self._start_changelog(changelog_path)
+
+        fd = os.open(changelog_path, os.O_WRONLY | os.O_APPEND)
+        try:
+            os.write(fd, lines)
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+
+        if size > self.max_changelog_bytes:
+            # A new epoch tells readers to drop their whole cache
+            self._start_changelog(changelog_path)
+            logger.info("State change log rotated", size=size)
+
+    def _start_changelog(self, changelog_path: Path) -> None:
+        """Replace the change log with an empty one under a new epoch."""
+        header = json.dumps(["epoch", uuid.uuid4().hex]).encode() + b"\n"
+        self._atomic_write(changelog_path, header)
+
+    def _changelog_end(self) -> tuple[str | None, int]:
+        """Get the current (epoch, size) of the change log."""
+        try:
+            with open(self.storage_path / self.CHANGELOG_NAME, "rb") as f:
+                header = f.readline()
+                if not header.endswith(b"\n"):
+                    return (None, 0)
+                return (json.loads(header)[1], f.seek(0, os.SEEK_END))
+        except FileNotFoundError:
+            return (None, 0)
+
+    def _marker_dir(self, scope: str, field: str, value: str) -> Path:
+        """Get the index directory listing records with a field value."""
+        return self.storage_path / scope / self.INDEX_DIR / field / quote(value, safe="")
+
+    def _unindex_record(self, scope: str, state_key: str, record: dict[str, Any]) -> None:
+        """Remove a record from the secondary indexes."""
+        stem = state_key.replace(":", "_")
+
+        for field in INDEX_FIELDS:
+            value = record.get(field)
+            if not value:
+                continue
+
+            marker_dir = self._marker_dir(scope, field, value)
+            (marker_dir / stem).unlink(missing_ok=True)
+            try:
+                marker_dir.rmdir()
+            except OSError:
+                pass  # Other records still share this value
+
+    def _atomic_write(self, file_path: Path, data: bytes, sync: bool = True) -> None:
+        """
+        Write data to a temporary file and rename it into place.
+
+        Readers never observe a partial file. With ``sync``, the file is also
+        synced before the rename and its directory after it, so a crash
+        leaves either the old or the new contents and a completed rename is
+        not lost.
+        """
+        tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+        if sync:
+            _fsync_directory(file_path.parent)
+
+    def _apply_journal(
+        self, journal: dict[str, Any], sync: bool | None = None
+    ) -> set[tuple[str, str]]:
+        """Apply the operations recorded in a journal."""
+        for scope, state_key, record in journal["puts"]:
+            self._write(scope, state_key, record, sync=sync)
+
+        removed = set()
+        for scope, state_key in journal["deletes"]:
+            if self._delete(scope, state_key):
+                removed.add((scope, state_key))
+
+        return removed
+
+    def _replay_journal(self, journal_path: Path) -> None:
+        """Finish a batch interrupted before it was fully applied."""
+        try:
+            self._apply_journal(self.codec.decode(journal_path.read_bytes()), sync=True)
+            logger.info("Replayed state journal", file=str(journal_path))
+        except Exception as e:
+            logger.error("Failed to replay state journal", file=str(journal_path), error=str(e))
+        journal_path.unlink()
@@ -0,0 +1,375 @@
+"""
+Binary codecs for persisted ability state.
+
+This module provides the on-disk record format used by the state manager:
+a small versioned header followed by a ``marshal`` body, optional zlib
+compression and a registry of codecs for non-primitive types such as
+datetimes, enums and pydantic models. Unlike pickle, decoding never
+constructs arbitrary classes - only types with a registered codec can be
+restored. Values of other enums are stored as their plain value, and read
+back as that value rather than the enum member.
+"""
+
+import json
+import marshal
+import struct
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel
+
+from bruno_abilities.schemas import (
+    Note,
+    NoteVersion,
+    PlaybackSession,
+    PlaybackState,
+    Playlist,
+    RecurrencePattern,
+    RepeatMode,
+    Task,
+    TaskPriority,
+    TaskStatus,
+    Track,
+)
+
+# Record header: format version byte followed by a flags byte
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("!BB")
+
+FLAG_COMPRESSED = 0x01
+FLAG_EXTENSIONS = 0x02
+
+# marshal format 4 has been stable since Python 3.4
+_MARSHAL_VERSION = 4
+
+_PRIMITIVES = (str, int, float, bool, bytes, type(None))
+
+
+def _encode_key(key: Any) -> Any:
+    """
+    Convert a dict key to a primitive.
+
+    Keys are not tagged, so only primitives, tuples of primitives, enums
+    and str/int/float subclasses are supported; other keys (such as dates)
+    could not be restored as they were.
+
+    Raises:
+        TypeError: If the key is of another type
+    """
+    if isinstance(key, Enum):
+        key = key.value
+    if type(key) in _PRIMITIVES:
+        return key
+    if type(key) is tuple:
+        return tuple(_encode_key(item) for item in key)
+    for primitive in (str, int, float):
+        if isinstance(key, primitive):
+            return primitive(key)
+    raise TypeError(f"Unsupported dict key type {type(key).__name__}")
+
+
+@dataclass(frozen=True)
+class TypeCodec:
+    """Encoder/decoder pair for a custom type."""
+
+    tag: str
+    python_type: type
+    encode: Callable[[Any], Any]
+    decode: Callable[[Any], Any]
+
+
+class CodecRegistry:
+    """
+    Registry of codecs for types that are not natively serializable.
+
+    Encoded values are stored as ``(tag, payload)`` tuples where the payload
+    is itself made of primitives or other registered types.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty codec registry."""
+        self._by_type: dict[type, TypeCodec | None] = {}
+        self._by_tag: dict[str, TypeCodec] = {}
+
+    def register(
+        self,
+        python_type: type,
+        tag: str,
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> None:
+        """
+        Register a codec for a type.
+
+        Args:
+            python_type: Type handled by the codec (subclasses are matched too)
+            tag: Stable identifier written to disk
+            encode: Converts an instance to a serializable payload
+            decode: Rebuilds an instance from its payload
+
+        Raises:
+            ValueError: If the tag is already used by another type
+        """
+        existing = self._by_tag.get(tag)
+        if existing and existing.python_type is not python_type:
+            raise ValueError(f"Codec tag '{tag}' is already registered")
+
+        codec = TypeCodec(tag=tag, python_type=python_type, encode=encode, decode=decode)
+        self._by_tag[tag] = codec
+
+        # Drop cached subclass lookups, they may now resolve differently
+        self._by_type = {t: c for t, c in self._by_type.items() if c is not None}
+        self._by_type[python_type] = codec
+
+    def register_model(self, model: type[BaseModel], tag: str | None = None) -> None:
+        """
+        Register a pydantic model.
+
+        Args:
+            model: Model class to register
+            tag: Stable identifier (defaults to ``model:<ClassName>``)
+        """
+        self.register(
+            model,
+            tag or f"model:{model.__name__}",
+            lambda value: value.model_dump(mode="python"),
+            model.model_validate,
+        )
+
+    def register_enum(self, enum: type[Enum], tag: str | None = None) -> None:
+        """
+        Register an enum, so its members are restored as members.
+
+        Args:
+            enum: Enum class to register
+            tag: Stable identifier (defaults to ``enum:<ClassName>``)
+        """
+        self.register(enum, tag or f"enum:{enum.__name__}", lambda member: member.value, enum)
+
+    def for_type(self, python_type: type) -> TypeCodec | None:
+        """
+        Find the codec for a type, walking its MRO for subclasses.
+
+        Args:
+            python_type: Type to look up
+
+        Returns:
+            Matching codec or None
+        """
+        try:
+            return self._by_type[python_type]
+        except KeyError:
+            pass
+
+        codec = None
+        for base in python_type.__mro__[1:]:
+            codec = self._by_type.get(base)
+            if codec is not None:
+                break
+
+        self._by_type[python_type] = codec
+        return codec
+
+    def for_tag(self, tag: str) -> TypeCodec:
+        """
+        Get the codec registered under a tag.
+
+        Args:
+            tag: Codec tag
+
+        Returns:
+            Registered codec
+
+        Raises:
+            ValueError: If no codec is registered for the tag
+        """
+        codec = self._by_tag.get(tag)
+        if codec is None:
+            raise ValueError(f"No codec registered for tag '{tag}'")
+        return codec
+
+
+def default_codec_registry() -> CodecRegistry:
+    """
+    Create a registry with codecs for common and built-in schema types.
+
+    Returns:
+        Codec registry for datetimes, collections and ability schemas and enums
+    """
+    registry = CodecRegistry()
+    registry.register(datetime, "datetime", datetime.isoformat, datetime.fromisoformat)
+    registry.register(date, "date", date.isoformat, date.fromisoformat)
+    registry.register(
+        timedelta,
+        "timedelta",
+        lambda td: [td.days, td.seconds, td.microseconds],
+        lambda parts: timedelta(days=parts[0], seconds=parts[1], microseconds=parts[2]),
+    )
+    registry.register(tuple, "tuple", list, tuple)
+    registry.register(set, "set", list, set)
+    registry.register(frozenset, "frozenset", list, frozenset)
+
+    for model in (Task, Note, NoteVersion, Track, Playlist, PlaybackSession):
+        registry.register_model(model)
+    for enum in (TaskStatus, TaskPriority, RecurrencePattern, PlaybackState, RepeatMode):
+        registry.register_enum(enum)
+
+    return registry
+
+
+class StateCodec:
+    """
+    Encodes state records to a compact, versioned binary format.
+
+    Records are laid out as ``[version][flags][body]``. The body is a
+    ``marshal`` dump of the record with custom types replaced by tagged
+    tuples, zlib-compressed when larger than ``compress_threshold``.
+    Legacy JSON records (starting with ``{``) are still accepted by
+    :meth:`decode`.
+    """
+
+    def __init__(
+        self,
+        registry: CodecRegistry | None = None,
+        compress_threshold: int | None = 1024,
+        compression_level: int = 6,
+    ) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            registry: Codec registry for custom types (defaults to the built-in one)
+            compress_threshold: Body size in bytes above which zlib is applied
+                               (None disables compression)
+            compression_level: zlib compression level
+        """
+        self.registry = registry or default_codec_registry()
+        self.compress_threshold = compress_threshold
+        self.compression_level = compression_level
+
+    def encode(self, record: dict[str, Any]) -> bytes:
+        """
+        Encode a state record.
+
+        Args:
+            record: Record to encode
+
+        Returns:
+            Encoded bytes
+
+        Raises:
+            TypeError: If the record contains a type without a registered codec
+        """
+        extensions: list[bool] = []
+        body = marshal.dumps(self._encode_value(record, extensions), _MARSHAL_VERSION)
+
+        flags = FLAG_EXTENSIONS if extensions else 0
+        if self.compress_threshold is not None and len(body) > self.compress_threshold:
+            body = zlib.compress(body, self.compression_level)
+            flags |= FLAG_COMPRESSED
+
+        return _HEADER.pack(FORMAT_VERSION, flags) + body
+
+    def decode(self, data: bytes) -> dict[str, Any]:
+        """
+        Decode a state record.
+
+        Args:
+            data: Encoded bytes (binary or legacy JSON)
+
+        Returns:
+            Decoded record
+
+        Raises:
+            ValueError: If the record is malformed or uses an unknown version/tag
+        """
+        if not data:
+            raise ValueError("Empty state record")
+
+        if data[:1] == b"{":
+            return json.loads(data)
+
+        version, flags = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported state record version: {version}")
+
+        body = data[_HEADER.size :]
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        try:
+            record = marshal.loads(body)
+        except (EOFError, TypeError) as e:
+            raise ValueError(f"Malformed state record: {e}") from e
+
+        if flags & FLAG_EXTENSIONS:
+            record = self._decode_value(record)
+
+        if not isinstance(record, dict):
+            raise ValueError("State record must decode to a mapping")
+
+        return record
+
+    def _encode_value(self, value: Any, extensions: list[bool]) -> Any:
+        """Convert a value to marshal-safe primitives, tagging custom types."""
+        value_type = type(value)
+
+        if value_type in _PRIMITIVES:
+            return value
+
+        if value_type is dict:
+            return {
+                k if type(k) in _PRIMITIVES else _encode_key(k): self._encode_value(v, extensions)
+                for k, v in value.items()
+            }
+
+        if value_type is list:
+            return [self._encode_value(v, extensions) for v in value]
+
+        codec = self.registry.for_type(value_type)
+        if codec is not None:
+            if not extensions:
+                extensions.append(True)
+            return (codec.tag, self._encode_value(codec.encode(value), extensions))
+
+        # Unregistered enums are stored by value, other str/int/float subclasses
+        # as their base value
+        if isinstance(value, Enum):
+            return self._encode_value(value.value, extensions)
+
+        for primitive in (str, int, float):
+            if isinstance(value, primitive):
+                return primitive(value)
+
+        if isinstance(value, dict):
+            return {
+                k if type(k) in _PRIMITIVES else _encode_key(k): self._encode_value(v, extensions)
+                for k, v in value.items()
+            }
+
+        if isinstance(value, list):
+            return [self._encode_value(v, extensions) for v in value]
+
+        raise TypeError(f"No codec registered for type {value_type.__name__}")
+
+    def _decode_value(self, value: Any) -> Any:
+        """Rebuild custom types from tagged tuples."""
+        value_type = type(value)
+
+        if value_type is dict:
+            return {k: self._decode_value(v) for k, v in value.items()}
+
+        if value_type is list:
+            return [self._decode_value(v) for v in value]
+
+        if value_type is tuple:
+            if len(value) != 2 or not isinstance(value[0], str):
+                raise ValueError("Malformed extension value in state record")
+            codec = self.registry.for_tag(value[0])
+            return codec.decode(self._decode_value(value[1]))
+
+        return value
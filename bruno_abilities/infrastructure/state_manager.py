@@ -6,8 +6,11 @@ across invocations, including different state scopes and persistence strategies.
 """
 
 import asyncio
-import json
-import pickle
+import inspect
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any
@@ -15,6 +18,11 @@ from typing import Any
 import structlog
 from pydantic import BaseModel, Field
 
+from bruno_abilities.base.deadline import DeadlineExceededError, remaining
+from bruno_abilities.base.tracing import start_span, traced
+from bruno_abilities.infrastructure.backends import ALL_KEYS, INDEX_FIELDS, FileStateBackend
+from bruno_abilities.infrastructure.codecs import StateCodec
+
 logger = structlog.get_logger(__name__)
 
 
@@ -38,9 +46,164 @@ class StateEntry(BaseModel):
     session_id: str | None = Field(default=None, description="Associated session")
     created_at: float = Field(..., description="Creation timestamp")
     updated_at: float = Field(..., description="Last update timestamp")
+    version: int = Field(default=0, description="Incremented on every write")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
 
 
+class StateConflictError(Exception):
+    """Raised when an optimistic update keeps losing to concurrent writers."""
+
+
+# Scopes that are written through to the storage backend
+_PERSISTENT_SCOPES = (StateScope.USER, StateScope.GLOBAL, StateScope.ABILITY)
+
+
+class _DeadlineLock:
+    """
+    asyncio.Lock honoring the request deadline.
+
+    Backend I/O is synchronous and cannot be interrupted, so the deadline is
+    enforced when an operation takes the state lock, before it reads or
+    changes anything: waiting for the lock stops at the deadline, and
+    operations fail fast once it has passed.
+    """
+
+    __slots__ = ("_lock",)
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+
+    async def __aenter__(self) -> None:
+        left = remaining()
+        if left is None:
+            await self._lock.acquire()
+            return
+        if left <= 0:
+            raise DeadlineExceededError("Deadline exceeded before state access")
+        try:
+            await asyncio.wait_for(self._lock.acquire(), left)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError("Deadline exceeded waiting for state lock") from None
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._lock.release()
+
+
+# Aliases for use in StateManager signatures, where ``set`` is shadowed by the method
+_KeySet = set[str]
+_ScopedKeySet = set[tuple[str, str]]
+
+
+def _entry_record(entry: StateEntry) -> dict[str, Any]:
+    """Build the persisted record for an entry."""
+    return {
+        "key": entry.key,
+        "value": entry.value,
+        "scope": entry.scope.value,
+        "ability_name": entry.ability_name,
+        "user_id": entry.user_id,
+        "session_id": entry.session_id,
+        "created_at": entry.created_at,
+        "updated_at": entry.updated_at,
+        "version": entry.version,
+        "metadata": entry.metadata,
+    }
+
+
+@dataclass
+class _StateOp:
+    """A buffered set or delete operation."""
+
+    key: str
+    scope: StateScope
+    ability_name: str | None = None
+    user_id: str | None = None
+    session_id: str | None = None
+    value: Any = None
+    metadata: dict[str, Any] | None = None
+    delete: bool = False
+
+
+class StateTransaction:
+    """
+    Buffers state changes and commits them together.
+
+    Changes are applied in order when the transaction commits, using a
+    single backend write for all persistent entries. Nothing is visible
+    to readers before the commit.
+    """
+
+    def __init__(self, manager: "StateManager") -> None:
+        """
+        Initialize the transaction.
+
+        Args:
+            manager: State manager to commit into
+        """
+        self._manager = manager
+        self._ops: list[_StateOp] = []
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Buffer a state write.
+
+        Args:
+            key: State key
+            value: State value
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            metadata: Additional metadata
+        """
+        self._ops.append(
+            _StateOp(key, scope, ability_name, user_id, session_id, value=value, metadata=metadata)
+        )
+
+    def delete(
+        self,
+        key: str,
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+    ) -> None:
+        """
+        Buffer a state deletion.
+
+        Args:
+            key: State key
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+        """
+        self._ops.append(_StateOp(key, scope, ability_name, user_id, session_id, delete=True))
+
+    async def commit(self) -> int:
+        """
+        Commit buffered changes.
+
+        Returns:
+            Number of entries deleted
+        """
+        ops, self._ops = self._ops, []
+        return await self._manager._commit(ops)
+
+    def discard(self) -> None:
+        """Drop buffered changes without applying them."""
+        self._ops.clear()
+
+
 class StateManager:
     """
     Manages state persistence for abilities.
@@ -49,21 +212,47 @@ class StateManager:
     from ephemeral session state to persistent user/global state.
     """
 
-    def __init__(self, storage_path: Path | None = None) -> None:
+    def __init__(
+        self,
+        storage_path: Path | None = None,
+        codec: StateCodec | None = None,
+        backend: FileStateBackend | None = None,
+        multiprocess: bool = False,
+        migrate_pickle: bool = False,
+        durable: bool | None = None,
+    ) -> None:
         """
         Initialize the state manager.
 
         Args:
             storage_path: Path for persistent state storage
+            codec: Codec used to encode persisted records (defaults to StateCodec)
+            backend: Storage backend (defaults to a FileStateBackend at storage_path)
+            multiprocess: Share storage_path safely with other processes, reloading
+                         entries they change
+            migrate_pickle: Load pickle records written by earlier versions and
+                           rewrite them in the current format (see FileStateBackend)
+            durable: Sync every write to disk before returning (defaults to multiprocess)
         """
         self._storage_path = storage_path or Path.home() / ".bruno" / "ability_state"
+        self._backend = backend or FileStateBackend(
+            self._storage_path,
+            codec,
+            multiprocess=multiprocess,
+            migrate_pickle=migrate_pickle,
+            durable=durable,
+        )
         self._state: dict[str, dict[str, StateEntry]] = {
             "session": {},
             "user": {},
             "global": {},
             "ability": {},
         }
-        self._lock = asyncio.Lock()
+        # scope -> field -> value -> state keys, for fields in INDEX_FIELDS
+        self._indexes: dict[str, dict[str, dict[str, set[str]]]] = {
+            scope: {field: {} for field in INDEX_FIELDS} for scope in self._state
+        }
+        self._lock = _DeadlineLock()
 
         # Ensure storage directory exists
         if storage_path:
@@ -94,6 +283,7 @@ class StateManager:
 
         return ":".join(parts)
 
+    @traced("state.set")
     async def set(
         self,
         key: str,
@@ -116,36 +306,21 @@ class StateManager:
             session_id: Associated session ID
             metadata: Additional metadata
         """
-        import time
-
         state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
 
         async with self._lock:
-            # Get or create entry
-            existing = self._state[scope.value].get(state_key)
-
-            if existing:
-                existing.value = value
-                existing.updated_at = time.time()
-                if metadata:
-                    existing.metadata.update(metadata)
-            else:
-                entry = StateEntry(
-                    key=key,
-                    value=value,
-                    scope=scope,
-                    ability_name=ability_name,
-                    user_id=user_id,
-                    session_id=session_id,
-                    created_at=time.time(),
-                    updated_at=time.time(),
-                    metadata=metadata or {},
+            self._sync_changes()
+            with self._backend.locked():
+                entry = self._build_entry(
+                    await self._current_entry(scope, state_key),
+                    _StateOp(key, scope, ability_name, user_id, session_id, value, metadata),
+                    time.time(),
                 )
-                self._state[scope.value][state_key] = entry
+                self._store_entry(scope, state_key, entry)
 
-            # Persist if not session scope
-            if scope in (StateScope.USER, StateScope.GLOBAL, StateScope.ABILITY):
-                await self._persist_entry(state_key, self._state[scope.value][state_key])
+                # Persist if not session scope
+                if scope in _PERSISTENT_SCOPES:
+                    await self._persist_entry(state_key, entry)
 
         logger.debug(
             "State set",
@@ -155,6 +330,7 @@ class StateManager:
             user=user_id,
         )
 
+    @traced("state.get")
     async def get(
         self,
         key: str,
@@ -181,20 +357,22 @@ class StateManager:
         state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
 
         async with self._lock:
+            self._sync_changes()
             entry = self._state[scope.value].get(state_key)
 
             if entry:
                 return entry.value
 
             # Try to load from persistent storage
-            if scope in (StateScope.USER, StateScope.GLOBAL, StateScope.ABILITY):
+            if scope in _PERSISTENT_SCOPES:
                 entry = await self._load_entry(state_key, scope)
                 if entry:
-                    self._state[scope.value][state_key] = entry
+                    self._store_entry(scope, state_key, entry)
                     return entry.value
 
         return default
 
+    @traced("state.delete")
     async def delete(
         self,
         key: str,
@@ -219,13 +397,14 @@ class StateManager:
         state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
 
         async with self._lock:
-            entry = self._state[scope.value].pop(state_key, None)
+            self._sync_changes()
+            deleted = self._evict_entry(scope, state_key) is not None
 
-            if entry:
-                # Delete from persistent storage
-                if scope in (StateScope.USER, StateScope.GLOBAL, StateScope.ABILITY):
-                    await self._delete_entry(state_key, scope)
+            # Delete from persistent storage, even if the entry was never loaded
+            if scope in _PERSISTENT_SCOPES:
+                deleted = await self._delete_entry(state_key, scope) or deleted
 
+            if deleted:
                 logger.debug(
                     "State deleted",
                     key=key,
@@ -237,6 +416,7 @@ class StateManager:
 
         return False
 
+    @traced("state.clear_scope")
     async def clear_scope(
         self,
         scope: StateScope,
@@ -247,6 +427,10 @@ class StateManager:
         """
         Clear all state in a scope.
 
+        Filtered clears are resolved through the secondary indexes, so they
+        cost O(matching entries) and include persisted entries that were
+        never loaded.
+
         Args:
             scope: State scope to clear
             ability_name: Filter by ability name
@@ -256,30 +440,27 @@ class StateManager:
         Returns:
             Number of entries cleared
         """
-        count = 0
+        filters = {
+            field: value
+            for field, value in zip(INDEX_FIELDS, (ability_name, user_id, session_id), strict=True)
+            if value
+        }
 
         async with self._lock:
-            entries_to_remove = []
-
-            for state_key, entry in self._state[scope.value].items():
-                # Check filters
-                if ability_name and entry.ability_name != ability_name:
-                    continue
-                if user_id and entry.user_id != user_id:
-                    continue
-                if session_id and entry.session_id != session_id:
-                    continue
-
-                entries_to_remove.append(state_key)
+            self._sync_changes()
+            if not filters:
+                count = await self._clear_all(scope)
+            else:
+                in_memory = self._lookup_index(scope, filters)
+                for state_key in in_memory:
+                    self._evict_entry(scope, state_key)
 
-            # Remove entries
-            for state_key in entries_to_remove:
-                self._state[scope.value].pop(state_key, None)
-                count += 1
+                removed: set[tuple[str, str]] = set()
+                if scope in _PERSISTENT_SCOPES:
+                    persisted = self._lookup_backend_index(scope, filters) | in_memory
+                    removed = await self._delete_entries(scope, persisted)
 
-                # Delete from persistent storage
-                if scope in (StateScope.USER, StateScope.GLOBAL, StateScope.ABILITY):
-                    await self._delete_entry(state_key, scope)
+                count = len(in_memory | {state_key for _, state_key in removed})
 
         logger.info(
             "Scope cleared",
@@ -291,37 +472,605 @@ class StateManager:
 
         return count
 
-    async def _persist_entry(self, state_key: str, entry: StateEntry) -> None:
-        """Persist a state entry to disk."""
+    @traced("state.get_with_version")
+    async def get_with_version(
+        self,
+        key: str,
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        default: Any = None,
+    ) -> tuple[Any, int]:
+        """
+        Get a state value together with its version.
+
+        Args:
+            key: State key
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            default: Default value if not found
+
+        Returns:
+            Tuple of (value, version), with version 0 for missing entries
+        """
+        state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
+
+        async with self._lock:
+            self._sync_changes()
+            entry = await self._cached_entry(scope, state_key)
+
+        return (entry.value, entry.version) if entry else (default, 0)
+
+    @traced("state.compare_and_set")
+    async def compare_and_set(
+        self,
+        key: str,
+        expected_version: int,
+        value: Any,
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> bool:
+        """
+        Set a state value only if its version has not changed.
+
+        Args:
+            key: State key
+            expected_version: Version the caller read (0 for a missing entry)
+            value: New state value
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            metadata: Additional metadata
+
+        Returns:
+            True if the value was written, False on a version mismatch
+        """
+        state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
+
+        async with self._lock:
+            self._sync_changes()
+            with self._backend.locked():
+                current = await self._current_entry(scope, state_key)
+                if (current.version if current else 0) != expected_version:
+                    return False
+
+                entry = self._build_entry(
+                    current,
+                    _StateOp(key, scope, ability_name, user_id, session_id, value, metadata),
+                    time.time(),
+                )
+                if scope in _PERSISTENT_SCOPES:
+                    self._backend.write(scope.value, state_key, _entry_record(entry))
+                self._store_entry(scope, state_key, entry)
+
+        return True
+
+    @traced("state.update")
+    async def update(
+        self,
+        key: str,
+        fn: Callable[[Any], Any | Awaitable[Any]],
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        default: Any = None,
+        max_attempts: int = 10,
+    ) -> Any:
+        """
+        Atomically transform a state value with optimistic retries.
+
+        ``fn`` receives the current value (or the default) and returns the
+        new one. It may run several times, so it must not have side effects.
+
+        Args:
+            key: State key
+            fn: Function (sync or async) computing the new value
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            default: Value passed to fn when the entry does not exist
+            max_attempts: Maximum number of compare-and-set attempts
+
+        Returns:
+            The value that was written
+
+        Raises:
+            StateConflictError: If every attempt lost to a concurrent writer
+
+        Example:
+            count = await state.update("count", lambda n: n + 1, default=0)
+        """
+        for attempt in range(max_attempts):
+            current, version = await self.get_with_version(
+                key, scope, ability_name, user_id, session_id, default
+            )
+
+            new_value = fn(current)
+            if inspect.isawaitable(new_value):
+                new_value = await new_value
+
+            if await self.compare_and_set(
+                key, version, new_value, scope, ability_name, user_id, session_id
+            ):
+                return new_value
+
+            logger.debug("State update conflict, retrying", key=key, attempt=attempt + 1)
+            await asyncio.sleep(0)
+
+        raise StateConflictError(f"Update of '{key}' failed after {max_attempts} attempts")
+
+    @traced("state.get_many")
+    async def get_many(
+        self,
+        keys: list[str],
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        default: Any = None,
+    ) -> dict[str, Any]:
+        """
+        Get several state values at once.
+
+        Args:
+            keys: State keys
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            default: Default value for keys that are not found
+
+        Returns:
+            Dictionary mapping each key to its value or the default
+        """
+        values: dict[str, Any] = {}
+        entries = self._state[scope.value]
+
+        async with self._lock:
+            self._sync_changes()
+            for key in keys:
+                state_key = self._get_state_key(key, scope, ability_name, user_id, session_id)
+                entry = entries.get(state_key)
+
+                if entry is None and scope in _PERSISTENT_SCOPES:
+                    entry = await self._load_entry(state_key, scope)
+                    if entry:
+                        self._store_entry(scope, state_key, entry)
+
+                values[key] = entry.value if entry else default
+
+        return values
+
+    @traced("state.set_many")
+    async def set_many(
+        self,
+        items: dict[str, Any],
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Set several state values in a single atomic commit.
+
+        Args:
+            items: Dictionary mapping state keys to values
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+            metadata: Additional metadata applied to every entry
+        """
+        await self._commit(
+            [
+                _StateOp(key, scope, ability_name, user_id, session_id, value, metadata)
+                for key, value in items.items()
+            ]
+        )
+
+    @traced("state.delete_many")
+    async def delete_many(
+        self,
+        keys: list[str],
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+    ) -> int:
+        """
+        Delete several state values in a single atomic commit.
+
+        Args:
+            keys: State keys
+            scope: State scope
+            ability_name: Associated ability name
+            user_id: Associated user ID
+            session_id: Associated session ID
+
+        Returns:
+            Number of entries deleted
+        """
+        return await self._commit(
+            [_StateOp(key, scope, ability_name, user_id, session_id, delete=True) for key in keys]
+        )
+
+    async def scan(
+        self,
+        prefix: str = "",
+        scope: StateScope = StateScope.SESSION,
+        ability_name: str | None = None,
+        user_id: str | None = None,
+        session_id: str | None = None,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """
+        Iterate over state entries whose key starts with a prefix.
+
+        Persisted entries that were never loaded are included. Results are
+        a snapshot taken when iteration starts, so the caller may modify
+        state while iterating.
+
+        Args:
+            prefix: State key prefix
+            scope: State scope
+            ability_name: Filter by ability name
+            user_id: Filter by user ID
+            session_id: Filter by session ID
+
+        Yields:
+            (key, value) tuples ordered by key
+        """
+        async with self._lock:
+            self._sync_changes()
+            entries = self._state[scope.value]
+
+            if scope in _PERSISTENT_SCOPES:
+                for record in self._backend.iter_records(scope.value, prefix):
+                    entry = StateEntry(**record)
+                    state_key = self._get_state_key(
+                        entry.key, scope, entry.ability_name, entry.user_id, entry.session_id
+                    )
+                    if state_key not in entries:
+                        self._store_entry(scope, state_key, entry)
+
+            matches = [
+                entry
+                for entry in entries.values()
+                if entry.key.startswith(prefix)
+                and self._matches_filters(entry, ability_name, user_id, session_id)
+            ]
+
+        for entry in sorted(matches, key=lambda e: e.key):
+            yield entry.key, entry.value
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[StateTransaction]:
+        """
+        Group state changes into one atomic commit.
+
+        Changes are committed when the block exits normally and discarded
+        if it raises.
+
+        Yields:
+            Transaction to buffer changes into
+
+        Example:
+            async with state.transaction() as txn:
+                txn.set("playlist", tracks, scope=StateScope.USER, user_id=user_id)
+                txn.delete("queue", scope=StateScope.USER, user_id=user_id)
+        """
+        txn = StateTransaction(self)
         try:
-            scope_dir = self._storage_path / entry.scope.value
-            scope_dir.mkdir(parents=True, exist_ok=True)
+            yield txn
+        except BaseException:
+            txn.discard()
+            raise
+        await txn.commit()
+
+    @traced("state.commit")
+    async def _commit(self, ops: list[_StateOp]) -> int:
+        """
+        Apply buffered operations with a single backend write.
+
+        The backend write happens before in-memory state is updated, so a
+        failed commit leaves the manager unchanged.
+
+        Returns:
+            Number of entries deleted
+        """
+        async with self._lock:
+            self._sync_changes()
+            with self._backend.locked():
+                deleted = await self._commit_locked(ops)
+
+        logger.debug("State committed", operations=len(ops), deleted=deleted)
+
+        return deleted
+
+    async def _commit_locked(self, ops: list[_StateOp]) -> int:
+        """Apply buffered operations while holding both state locks."""
+        now = time.time()
+        staged: dict[tuple[StateScope, str], StateEntry | None] = {}
+
+        for op in ops:
+            state_key = self._get_state_key(
+                op.key, op.scope, op.ability_name, op.user_id, op.session_id
+            )
+            slot = (op.scope, state_key)
 
-            file_path = scope_dir / f"{state_key.replace(':', '_')}.json"
+            if op.delete:
+                staged[slot] = None
+                continue
 
-            # Try JSON serialization first
+            if slot in staged:
+                current = staged[slot]
+            else:
+                current = await self._current_entry(op.scope, state_key)
+            staged[slot] = self._build_entry(current, op, now)
+
+        puts = [
+            (scope.value, state_key, _entry_record(entry))
+            for (scope, state_key), entry in staged.items()
+            if entry is not None and scope in _PERSISTENT_SCOPES
+        ]
+        deletes = [
+            (scope.value, state_key)
+            for (scope, state_key), entry in staged.items()
+            if entry is None and scope in _PERSISTENT_SCOPES
+        ]
+
+        removed: set[tuple[str, str]] = set()
+        if puts or deletes:
             try:
-                data = {
-                    "key": entry.key,
-                    "value": entry.value,
-                    "scope": entry.scope.value,
-                    "ability_name": entry.ability_name,
-                    "user_id": entry.user_id,
-                    "session_id": entry.session_id,
-                    "created_at": entry.created_at,
-                    "updated_at": entry.updated_at,
-                    "metadata": entry.metadata,
+                removed = self._backend.write_batch(puts, deletes)
+            except Exception as e:
+                logger.error("Failed to commit state", error=str(e), exc_info=True)
+                raise
+
+        deleted = 0
+        for (scope, state_key), entry in staged.items():
+            if entry is None:
+                in_memory = self._evict_entry(scope, state_key) is not None
+                if in_memory or (scope.value, state_key) in removed:
+                    deleted += 1
+            else:
+                self._store_entry(scope, state_key, entry)
+
+        return deleted
+
+    @traced("state.purge_user")
+    async def purge_user(self, user_id: str) -> int:
+        """
+        Delete every entry associated with a user, across all scopes.
+
+        Args:
+            user_id: User whose state should be removed
+
+        Returns:
+            Number of entries deleted
+        """
+        count = 0
+        for scope in StateScope:
+            count += await self.clear_scope(scope, user_id=user_id)
+
+        logger.info("User state purged", user=user_id, count=count)
+
+        return count
+
+    async def rebuild_indexes(self) -> None:
+        """
+        Rebuild the persisted secondary indexes from stored records.
+
+        Needed once for records written before indexes were maintained.
+        """
+        async with self._lock:
+            self._sync_changes()
+            for scope in _PERSISTENT_SCOPES:
+                self._backend.drop_indexes(scope.value)
+                for record in self._backend.iter_records(scope.value):
+                    state_key = self._get_state_key(
+                        record["key"],
+                        scope,
+                        record.get("ability_name"),
+                        record.get("user_id"),
+                        record.get("session_id"),
+                    )
+                    self._backend.index_record(scope.value, state_key, record)
+
+        logger.info("State indexes rebuilt")
+
+    async def _cached_entry(self, scope: StateScope, state_key: str) -> StateEntry | None:
+        """Get an entry from memory, loading it from storage on a miss."""
+        entry = self._state[scope.value].get(state_key)
+
+        if entry is None and scope in _PERSISTENT_SCOPES:
+            entry = await self._load_entry(state_key, scope)
+            if entry:
+                self._store_entry(scope, state_key, entry)
+
+        return entry
+
+    async def _current_entry(self, scope: StateScope, state_key: str) -> StateEntry | None:
+        """
+        Get the authoritative entry before a write.
+
+        In multi-process mode the stored record is re-read under the storage
+        lock, since another process may have written it since the last sync.
+        """
+        if scope in _PERSISTENT_SCOPES and self._backend.multiprocess:
+            entry = await self._load_entry(state_key, scope)
+            if entry:
+                self._store_entry(scope, state_key, entry)
+            else:
+                self._evict_entry(scope, state_key)
+            return entry
+
+        return await self._cached_entry(scope, state_key)
+
+    def _sync_changes(self) -> None:
+        """Drop cached entries that other processes changed since the last check."""
+        if not self._backend.multiprocess:
+            return
+
+        try:
+            changes = self._backend.poll_changes()
+        except Exception as e:
+            logger.error("Failed to read state changes", error=str(e))
+            changes = None
+
+        if changes is None:
+            for scope in _PERSISTENT_SCOPES:
+                self._evict_scope(scope)
+            return
+
+        for scope_value, state_key in changes:
+            scope = StateScope(scope_value)
+            if state_key == ALL_KEYS:
+                self._evict_scope(scope)
+            else:
+                self._evict_entry(scope, state_key)
+
+    def _evict_scope(self, scope: StateScope) -> None:
+        """Remove every entry of a scope from memory and the in-memory indexes."""
+        self._state[scope.value].clear()
+        for postings in self._indexes[scope.value].values():
+            postings.clear()
+
+    def _store_entry(self, scope: StateScope, state_key: str, entry: StateEntry) -> None:
+        """Put an entry in memory and in the in-memory indexes."""
+        previous = self._state[scope.value].get(state_key)
+        if previous is not None:
+            self._unindex_entry(scope, state_key, previous)
+
+        self._state[scope.value][state_key] = entry
+
+        indexes = self._indexes[scope.value]
+        for field in INDEX_FIELDS:
+            value = getattr(entry, field)
+            if value:
+                indexes[field].setdefault(value, set()).add(state_key)
+
+    def _evict_entry(self, scope: StateScope, state_key: str) -> StateEntry | None:
+        """Remove an entry from memory and from the in-memory indexes."""
+        entry = self._state[scope.value].pop(state_key, None)
+        if entry is not None:
+            self._unindex_entry(scope, state_key, entry)
+        return entry
+
+    def _unindex_entry(self, scope: StateScope, state_key: str, entry: StateEntry) -> None:
+        """Remove an entry from the in-memory indexes."""
+        indexes = self._indexes[scope.value]
+        for field in INDEX_FIELDS:
+            value = getattr(entry, field)
+            keys = indexes[field].get(value) if value else None
+            if keys is not None:
+                keys.discard(state_key)
+                if not keys:
+                    del indexes[field][value]
+
+    def _lookup_index(self, scope: StateScope, filters: dict[str, str]) -> _KeySet:
+        """Find in-memory state keys matching all filters."""
+        indexes = self._indexes[scope.value]
+        # Start from the smallest posting set
+        postings = sorted(
+            (indexes[field].get(value, set()) for field, value in filters.items()), key=len
+        )
+        return set(postings[0]).intersection(*postings[1:])
+
+    def _lookup_backend_index(self, scope: StateScope, filters: dict[str, str]) -> _KeySet:
+        """Find persisted state keys matching all filters."""
+        try:
+            postings = [
+                self._backend.lookup(scope.value, field, value) for field, value in filters.items()
+            ]
+        except Exception as e:
+            logger.error("Failed to read state index", scope=scope.value, error=str(e))
+            return set()
+
+        return postings[0].intersection(*postings[1:])
+
+    async def _clear_all(self, scope: StateScope) -> int:
+        """Clear a whole scope from memory and storage."""
+        stems = {state_key.replace(":", "_") for state_key in self._state[scope.value]}
+        self._evict_scope(scope)
+
+        if scope in _PERSISTENT_SCOPES:
+            try:
+                stems |= self._backend.clear(scope.value)
+            except Exception as e:
+                logger.error("Failed to clear state", scope=scope.value, error=str(e))
+
+        return len(stems)
+
+    async def _delete_entries(self, scope: StateScope, state_keys: _KeySet) -> _ScopedKeySet:
+        """Delete persisted entries in one batch, returning those that existed."""
+        if not state_keys:
+            return set()
+
+        try:
+            return self._backend.write_batch(
+                [], [(scope.value, state_key) for state_key in sorted(state_keys)]
+            )
+        except Exception as e:
+            logger.error("Failed to delete state", scope=scope.value, error=str(e), exc_info=True)
+            return set()
+
+    @staticmethod
+    def _build_entry(current: StateEntry | None, op: _StateOp, now: float) -> StateEntry:
+        """Create the entry that results from applying a set operation."""
+        if current:
+            return current.model_copy(
+                update={
+                    "value": op.value,
+                    "updated_at": now,
+                    "version": current.version + 1,
+                    "metadata": {**current.metadata, **(op.metadata or {})},
                 }
+            )
 
-                with open(file_path, "w") as f:
-                    json.dump(data, f, indent=2)
+        return StateEntry(
+            key=op.key,
+            value=op.value,
+            scope=op.scope,
+            ability_name=op.ability_name,
+            user_id=op.user_id,
+            session_id=op.session_id,
+            created_at=now,
+            updated_at=now,
+            version=1,
+            metadata=op.metadata or {},
+        )
 
-            except (TypeError, ValueError):
-                # Fall back to pickle for non-JSON-serializable data
-                file_path = scope_dir / f"{state_key.replace(':', '_')}.pkl"
-                with open(file_path, "wb") as f:
-                    pickle.dump(entry.model_dump(), f)
+    @staticmethod
+    def _matches_filters(
+        entry: StateEntry,
+        ability_name: str | None,
+        user_id: str | None,
+        session_id: str | None,
+    ) -> bool:
+        """Check whether an entry matches optional identifier filters."""
+        if ability_name and entry.ability_name != ability_name:
+            return False
+        if user_id and entry.user_id != user_id:
+            return False
+        if session_id and entry.session_id != session_id:
+            return False
+        return True
 
+    async def _persist_entry(self, state_key: str, entry: StateEntry) -> None:
+        """Persist a state entry to disk."""
+        try:
+            with start_span("state.backend.write", {"state.scope": entry.scope.value}):
+                file_path = self._backend.write(entry.scope.value, state_key, _entry_record(entry))
             logger.debug("State persisted", state_key=state_key, file=str(file_path))
 
         except Exception as e:
@@ -332,42 +1081,27 @@ class StateManager:
     async def _load_entry(self, state_key: str, scope: StateScope) -> StateEntry | None:
         """Load a state entry from disk."""
         try:
-            scope_dir = self._storage_path / scope.value
-
-            # Try JSON first
-            json_path = scope_dir / f"{state_key.replace(':', '_')}.json"
-            if json_path.exists():
-                with open(json_path) as f:
-                    data = json.load(f)
-                    return StateEntry(**data)
-
-            # Try pickle
-            pkl_path = scope_dir / f"{state_key.replace(':', '_')}.pkl"
-            if pkl_path.exists():
-                with open(pkl_path, "rb") as f:
-                    data = pickle.load(f)
-                    return StateEntry(**data)
-
-            return None
+            with start_span("state.backend.load", {"state.scope": scope.value}):
+                record = self._backend.load(scope.value, state_key)
+            return StateEntry(**record) if record else None
 
         except Exception as e:
             logger.error("Failed to load state", state_key=state_key, error=str(e), exc_info=True)
             return None
 
-    async def _delete_entry(self, state_key: str, scope: StateScope) -> None:
+    async def _delete_entry(self, state_key: str, scope: StateScope) -> bool:
         """Delete a persisted state entry."""
         try:
-            scope_dir = self._storage_path / scope.value
-            safe_key = state_key.replace(":", "_")
-
-            for ext in [".json", ".pkl"]:
-                file_path = scope_dir / f"{safe_key}{ext}"
-                if file_path.exists():
-                    file_path.unlink()
-                    logger.debug("State file deleted", file=str(file_path))
+            with start_span("state.backend.delete", {"state.scope": scope.value}):
+                return self._backend.delete(scope.value, state_key)
 
         except Exception as e:
             logger.error("Failed to delete state", state_key=state_key, error=str(e), exc_info=True)
+            return False
+
+    def close(self) -> None:
+        """Release resources held by the storage backend."""
+        self._backend.close()
 
     def get_stats(self) -> dict[str, Any]:
         """Get state manager statistics."""
@@ -1,12 +1,28 @@
 """Registry and discovery system for abilities."""
 
 from bruno_abilities.registry.discovery import AbilityDiscovery
+from bruno_abilities.registry.discovery_cache import DiscoveryCache
+from bruno_abilities.registry.lazy import LazyAbility
 from bruno_abilities.registry.lifecycle import LifecycleManager
-from bruno_abilities.registry.registry import AbilityRegistry, get_registry
+from bruno_abilities.registry.registry import (
+    AbilityRegistry,
+    FunctionSchemaBundle,
+    get_registry,
+)
+from bruno_abilities.registry.resolver import AbilityMatch
+from bruno_abilities.registry.snapshot import RegistrySnapshot
+from bruno_abilities.registry.workers import WorkerAbility, WorkerPool
 
 __all__ = [
     "AbilityRegistry",
+    "FunctionSchemaBundle",
+    "AbilityMatch",
+    "RegistrySnapshot",
     "get_registry",
     "AbilityDiscovery",
+    "DiscoveryCache",
+    "LazyAbility",
     "LifecycleManager",
+    "WorkerAbility",
+    "WorkerPool",
 ]
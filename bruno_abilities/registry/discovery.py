@@ -7,10 +7,14 @@ through Python package entry points.
 
 import importlib
 import importlib.metadata
+from collections.abc import Mapping
 
 import structlog
 
 from bruno_abilities.base.ability_base import BaseAbility
+from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.registry.discovery_cache import CachedAbility, DiscoveryCache
+from bruno_abilities.registry.lazy import LazyAbility
 
 logger = structlog.get_logger(__name__)
 
@@ -36,18 +40,7 @@ class AbilityDiscovery:
         discovered = {}
 
         try:
-            # Get all entry points for bruno.abilities
-            entry_points = importlib.metadata.entry_points()
-
-            # Handle different Python versions' entry_points return type
-            if hasattr(entry_points, "select"):
-                # Python 3.10+
-                ability_eps = entry_points.select(group=AbilityDiscovery.ENTRY_POINT_GROUP)
-            else:
-                # Python 3.9
-                ability_eps = entry_points.get(AbilityDiscovery.ENTRY_POINT_GROUP, [])
-
-            for ep in ability_eps:
+            for ep in AbilityDiscovery._select_entry_points():
                 try:
                     # Load the ability class
                     ability_class = ep.load()
@@ -76,6 +69,42 @@ class AbilityDiscovery:
 
         return discovered
 
+    @staticmethod
+    def _select_entry_points() -> list[importlib.metadata.EntryPoint]:
+        """Get all entry points in the abilities group."""
+        entry_points = importlib.metadata.entry_points()
+
+        # Handle different Python versions' entry_points return type
+        if hasattr(entry_points, "select"):
+            # Python 3.10+
+            return list(entry_points.select(group=AbilityDiscovery.ENTRY_POINT_GROUP))
+
+        # Python 3.9
+        return list(entry_points.get(AbilityDiscovery.ENTRY_POINT_GROUP, []))
+
+    @staticmethod
+    def discover_entry_points() -> dict[str, tuple[str, str]]:
+        """
+        Discover ability entry points without importing them.
+
+        Returns:
+            Dictionary mapping ability names to (module path, class name)
+        """
+        discovered = {}
+
+        try:
+            for ep in AbilityDiscovery._select_entry_points():
+                module_path, _, class_name = ep.value.partition(":")
+                if not class_name:
+                    logger.warning("Entry point does not name a class", entry_point=ep.name)
+                    continue
+                discovered[ep.name] = (module_path.strip(), class_name.strip())
+
+        except Exception as e:
+            logger.error("Failed to discover abilities", error=str(e))
+
+        return discovered
+
     @staticmethod
     def load_ability(module_path: str, class_name: str) -> type[BaseAbility]:
         """
@@ -154,3 +183,111 @@ class AbilityDiscovery:
         """
         ability_classes = AbilityDiscovery.discover_abilities()
         return AbilityDiscovery.instantiate_abilities(ability_classes)
+
+    @staticmethod
+    def discover_lazy(
+        metadata: Mapping[str, AbilityMetadata] | None = None,
+        idle_timeout: float | None = None,
+    ) -> dict[str, BaseAbility]:
+        """
+        Discover abilities, deferring imports where metadata is known.
+
+        Entry points with known metadata become :class:`LazyAbility` proxies
+        that import and initialize the real ability on first execute. The
+        rest are loaded and instantiated eagerly, since their metadata is
+        only available from an instance.
+
+        Args:
+            metadata: Known metadata by entry point name
+            idle_timeout: Idle timeout passed to the lazy proxies
+
+        Returns:
+            Dictionary of ability instances and proxies
+        """
+        return AbilityDiscovery._instantiate_lazy(
+            AbilityDiscovery.discover_entry_points(), metadata or {}, idle_timeout
+        )
+
+    @staticmethod
+    def _instantiate_lazy(
+        entry_points: Mapping[str, tuple[str, str]],
+        metadata: Mapping[str, AbilityMetadata],
+        idle_timeout: float | None,
+    ) -> dict[str, BaseAbility]:
+        """Create proxies for entry points with known metadata, instances for the rest."""
+        abilities: dict[str, BaseAbility] = {}
+        eager: dict[str, type[BaseAbility]] = {}
+
+        for name, (module_path, class_name) in entry_points.items():
+            if name in metadata:
+                abilities[name] = LazyAbility(
+                    metadata[name], module_path, class_name, idle_timeout=idle_timeout
+                )
+                continue
+
+            try:
+                eager[name] = AbilityDiscovery.load_ability(module_path, class_name)
+            except Exception as e:
+                logger.error(
+                    "Failed to load ability from entry point", entry_point=name, error=str(e)
+                )
+
+        abilities.update(AbilityDiscovery.instantiate_abilities(eager))
+        return abilities
+
+    @staticmethod
+    def discover_cached(
+        cache: DiscoveryCache | None = None, idle_timeout: float | None = None
+    ) -> dict[str, BaseAbility]:
+        """
+        Discover abilities through a persistent discovery cache.
+
+        On a cache hit, neither entry points nor ability modules are
+        touched: every cached ability becomes a :class:`LazyAbility`. On a
+        miss, abilities are discovered and instantiated eagerly and the
+        cache is rewritten for the next start, unless an entry point failed
+        to load or instantiate.
+
+        Args:
+            cache: Discovery cache (defaults to the per-user cache file)
+            idle_timeout: Idle timeout passed to the lazy proxies
+
+        Returns:
+            Dictionary of ability instances and proxies
+        """
+        cache = cache or DiscoveryCache()
+        fingerprint = DiscoveryCache.fingerprint()
+
+        entries = cache.load(fingerprint)
+        if entries is not None:
+            logger.info("Using discovery cache", path=str(cache.path), abilities=len(entries))
+            # Entries whose metadata could not be cached are loaded eagerly
+            return AbilityDiscovery._instantiate_lazy(
+                {name: (entry.module_path, entry.class_name) for name, entry in entries.items()},
+                {name: entry.metadata for name, entry in entries.items() if entry.metadata},
+                idle_timeout,
+            )
+
+        entry_points = AbilityDiscovery.discover_entry_points()
+        abilities = AbilityDiscovery._instantiate_lazy(entry_points, {}, idle_timeout)
+
+        failed = sorted(set(entry_points) - set(abilities))
+        if failed:
+            # The failure may be transient; caching it would hide these
+            # abilities until the installed packages change
+            logger.warning("Not storing discovery cache, some abilities failed", failed=failed)
+            return abilities
+
+        cache.store(
+            {
+                name: CachedAbility(
+                    name=name,
+                    module_path=entry_points[name][0],
+                    class_name=entry_points[name][1],
+                    metadata=ability.metadata,
+                )
+                for name, ability in abilities.items()
+            },
+            fingerprint,
+        )
+        return abilities
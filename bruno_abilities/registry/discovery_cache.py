@@ -0,0 +1,262 @@
+"""
+Persistent cache of discovered abilities.
+
+Scanning entry points parses the metadata of every installed distribution,
+and reading ability metadata requires importing each ability module. This
+module stores the result of both in a file keyed by a fingerprint of the
+installed distributions, so later process starts can skip them entirely.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import tempfile
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from bruno_abilities.base.metadata import AbilityMetadata
+
+logger = structlog.get_logger(__name__)
+
+_DIST_SUFFIXES = (".dist-info", ".egg-info")
+
+
+def _type_ref(value: type) -> str:
+    """Get an importable reference to a type."""
+    return f"{value.__module__}:{value.__qualname__}"
+
+
+def _resolve_type(ref: str) -> type:
+    """Import a type from a reference produced by _type_ref."""
+    module_path, _, qualname = ref.partition(":")
+    value: Any = importlib.import_module(module_path)
+    for part in qualname.split("."):
+        value = getattr(value, part)
+    return value
+
+
+def dump_metadata(metadata: AbilityMetadata) -> dict[str, Any]:
+    """
+    Serialize ability metadata to JSON-compatible data.
+
+    Parameter types are stored as import references.
+
+    Args:
+        metadata: Ability metadata
+
+    Returns:
+        JSON-compatible dictionary
+
+    Raises:
+        TypeError: If the metadata contains values JSON cannot represent
+    """
+    data = metadata.model_dump()
+    for param in data["parameters"]:
+        if param["type"] is not None:
+            param["type"] = _type_ref(param["type"])
+
+    # Fail here rather than when the whole cache file is written
+    json.dumps(data)
+    return data
+
+
+def load_metadata(data: dict[str, Any]) -> AbilityMetadata:
+    """
+    Restore ability metadata serialized by :func:`dump_metadata`.
+
+    Args:
+        data: Serialized metadata
+
+    Returns:
+        Ability metadata
+    """
+    data = dict(data)
+    data["parameters"] = [
+        {**param, "type": _resolve_type(param["type"]) if param.get("type") else None}
+        for param in data.get("parameters", [])
+    ]
+    return AbilityMetadata.model_validate(data)
+
+
+@dataclass(frozen=True)
+class CachedAbility:
+    """
+    Discovery result for one entry point.
+
+    Attributes:
+        name: Entry point name
+        module_path: Module defining the ability class
+        class_name: Name of the ability class
+        metadata: Ability metadata, or None if it could not be serialized
+    """
+
+    name: str
+    module_path: str
+    class_name: str
+    metadata: AbilityMetadata | None = None
+
+
+class DiscoveryCache:
+    """
+    File cache of discovered abilities.
+
+    The cache is keyed by a fingerprint of the distributions visible on
+    ``sys.path`` (their dist-info and egg-info names and mtimes), so it is
+    invalidated automatically when packages are installed, upgraded or
+    removed.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, path: Path | None = None) -> None:
+        """
+        Initialize the discovery cache.
+
+        Args:
+            path: Cache file location
+        """
+        self._path = path or Path.home() / ".bruno" / "discovery_cache.json"
+
+    @property
+    def path(self) -> Path:
+        """Cache file location."""
+        return self._path
+
+    @staticmethod
+    def fingerprint(paths: Iterable[str] | None = None) -> str:
+        """
+        Fingerprint the installed distributions.
+
+        Only directory listings and stats are read, which is much cheaper
+        than parsing every distribution's entry points.
+
+        Args:
+            paths: Import paths to inspect (defaults to sys.path)
+
+        Returns:
+            Hex digest identifying the installed distributions
+        """
+        digest = hashlib.sha256(sys.version.encode())
+
+        for entry in sys.path if paths is None else paths:
+            digest.update(b"\0" + os.fsencode(entry))
+            try:
+                with os.scandir(entry or ".") as it:
+                    dists = sorted(
+                        (item.name, item.stat().st_mtime_ns)
+                        for item in it
+                        if item.name.endswith(_DIST_SUFFIXES)
+                    )
+            except NotADirectoryError:
+                # Zipped eggs and archives on sys.path
+                dists = [("", os.stat(entry).st_mtime_ns)]
+            except OSError:
+                continue
+
+            for name, mtime in dists:
+                digest.update(f"\0{name}\0{mtime}".encode())
+
+        return digest.hexdigest()
+
+    def load(self, fingerprint: str | None = None) -> dict[str, CachedAbility] | None:
+        """
+        Load cached discovery results if they are still valid.
+
+        Args:
+            fingerprint: Current fingerprint (computed if not given)
+
+        Returns:
+            Cached abilities by name, or None if the cache is missing or stale
+        """
+        try:
+            data = json.loads(self._path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to read discovery cache", path=str(self._path), error=str(e))
+            return None
+
+        if data.get("format") != self.FORMAT_VERSION:
+            return None
+        if data.get("fingerprint") != (fingerprint or self.fingerprint()):
+            logger.info("Discovery cache is stale", path=str(self._path))
+            return None
+
+        entries = {}
+        for item in data.get("abilities", []):
+            metadata = None
+            if item.get("metadata") is not None:
+                try:
+                    metadata = load_metadata(item["metadata"])
+                except Exception as e:
+                    logger.warning(
+                        "Failed to restore cached metadata", ability=item["name"], error=str(e)
+                    )
+
+            entries[item["name"]] = CachedAbility(
+                name=item["name"],
+                module_path=item["module"],
+                class_name=item["class"],
+                metadata=metadata,
+            )
+
+        return entries
+
+    def store(self, entries: Mapping[str, CachedAbility], fingerprint: str | None = None) -> None:
+        """
+        Write discovery results to the cache file.
+
+        Args:
+            entries: Discovered abilities by name
+            fingerprint: Fingerprint the results were computed under
+        """
+        abilities = []
+        for entry in entries.values():
+            metadata = None
+            if entry.metadata is not None:
+                try:
+                    metadata = dump_metadata(entry.metadata)
+                except TypeError as e:
+                    logger.warning(
+                        "Ability metadata is not cacheable", ability=entry.name, error=str(e)
+                    )
+
+            abilities.append(
+                {
+                    "name": entry.name,
+                    "module": entry.module_path,
+                    "class": entry.class_name,
+                    "metadata": metadata,
+                }
+            )
+
+        payload = json.dumps(
+            {
+                "format": self.FORMAT_VERSION,
+                "fingerprint": fingerprint or self.fingerprint(),
+                "abilities": abilities,
+            }
+        )
+
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self._path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_name, self._path)
+            except BaseException:
+                os.unlink(tmp_name)
+                raise
+        except OSError as e:
+            logger.warning("Failed to write discovery cache", path=str(self._path), error=str(e))
+
+    def invalidate(self) -> None:
+        """Delete the cache file."""
+        self._path.unlink(missing_ok=True)
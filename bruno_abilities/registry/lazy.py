@@ -0,0 +1,207 @@
+"""
+Lazily loaded abilities.
+
+This module provides a proxy that carries an ability's precomputed
+metadata, so it can be registered, searched and described to the LLM
+without importing or constructing the real ability until it is used.
+"""
+
+import asyncio
+from typing import Any
+
+import structlog
+
+from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.deadline import create_detached_task
+from bruno_abilities.base.metadata import AbilityMetadata
+
+logger = structlog.get_logger(__name__)
+
+
+class LazyAbility(BaseAbility):
+    """
+    Proxy for an ability that is imported and initialized on first use.
+
+    Concurrent first calls share a single import and initialization. With
+    an idle timeout, the real ability is cleaned up and released once it
+    has not been used for that long, and reloaded on the next call.
+    """
+
+    def __init__(
+        self,
+        metadata: AbilityMetadata,
+        module_path: str,
+        class_name: str,
+        idle_timeout: float | None = None,
+    ) -> None:
+        """
+        Initialize the proxy.
+
+        Args:
+            metadata: Precomputed metadata of the real ability
+            module_path: Module defining the ability class
+            class_name: Name of the ability class
+            idle_timeout: Seconds of inactivity before the real ability is
+                          unloaded (None keeps it loaded)
+        """
+        super().__init__()
+        self._metadata = metadata
+        self._module_path = module_path
+        self._class_name = class_name
+        self._idle_timeout = idle_timeout
+
+        self._target: BaseAbility | None = None
+        self._load_lock = asyncio.Lock()
+        self._last_used = 0.0
+        self._idle_task: asyncio.Task | None = None
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        """Return the precomputed metadata."""
+        return self._metadata
+
+    @property
+    def module_path(self) -> str:
+        """Module defining the real ability class."""
+        return self._module_path
+
+    @property
+    def class_name(self) -> str:
+        """Name of the real ability class."""
+        return self._class_name
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the real ability is currently loaded."""
+        return self._target is not None
+
+    async def load(self) -> BaseAbility:
+        """
+        Import, construct and initialize the real ability if needed.
+
+        Returns:
+            The loaded ability
+
+        Raises:
+            ImportError: If the module cannot be imported
+            AttributeError: If the class does not exist in the module
+            TypeError: If the class is not a BaseAbility subclass
+        """
+        target = self._target
+        if target is not None:
+            return target
+
+        async with self._load_lock:
+            if self._target is None:
+                # Imported here to avoid a cycle with the discovery module
+                from bruno_abilities.registry.discovery import AbilityDiscovery
+
+                ability_class = AbilityDiscovery.load_ability(self._module_path, self._class_name)
+                target = ability_class()
+                await target.initialize()
+
+                self._target = target
+                logger.info("Lazy ability loaded", ability=self._metadata.name)
+
+            return self._target
+
+    async def execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
+        """
+        Execute the real ability, loading it first if needed.
+
+        Args:
+            parameters: Dictionary of parameters for the ability
+            context: Execution context with user and session information
+
+        Returns:
+            AbilityResult with execution outcome
+        """
+        if not self._is_initialized:
+            await self.initialize()
+
+        self._enter_call()
+        try:
+            try:
+                target = await self.load()
+            except Exception as e:
+                logger.error("Failed to load ability", ability=self._metadata.name, error=str(e))
+                return AbilityResult(success=False, error=f"Ability failed to load: {str(e)}")
+
+            return await target.execute(parameters, context)
+        finally:
+            self._exit_call()
+            self._last_used = asyncio.get_running_loop().time()
+            self._schedule_idle_unload()
+
+    async def _execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
+        """Delegate to the real ability."""
+        target = await self.load()
+        return await target._execute(parameters, context)
+
+    async def _cleanup(self) -> None:
+        """Stop the idle watcher and clean up the real ability if loaded."""
+        if self._idle_task is not None:
+            self._idle_task.cancel()
+            self._idle_task = None
+
+        await self._unload()
+
+    async def cancel(self) -> None:
+        """Cancel ongoing operations of the real ability."""
+        await super().cancel()
+        if self._target is not None:
+            await self._target.cancel()
+
+    async def reset_cancellation(self) -> None:
+        """Reset the cancellation token of the proxy and the real ability."""
+        await super().reset_cancellation()
+        if self._target is not None:
+            await self._target.reset_cancellation()
+
+    async def _health_check(self) -> bool:
+        """Check the real ability if loaded; an unloaded proxy is healthy."""
+        if self._target is None:
+            return True
+        return await self._target.health_check()
+
+    def _schedule_idle_unload(self) -> None:
+        """Start the idle watcher if an idle timeout is configured."""
+        if self._idle_timeout is None or self._target is None:
+            return
+        if self._idle_task is None or self._idle_task.done():
+            self._idle_task = create_detached_task(self._watch_idle())
+
+    async def _watch_idle(self) -> None:
+        """Unload the real ability once it has been idle long enough."""
+        loop = asyncio.get_running_loop()
+
+        while self._target is not None:
+            idle_for = loop.time() - self._last_used
+            if self._in_flight == 0 and idle_for >= self._idle_timeout:
+                if await self._unload(only_if_idle=True):
+                    logger.info("Idle ability unloaded", ability=self._metadata.name)
+                    return
+                continue
+
+            await asyncio.sleep(max(self._idle_timeout - idle_for, self._idle_timeout / 10))
+
+    async def _unload(self, only_if_idle: bool = False) -> bool:
+        """
+        Release and clean up the real ability.
+
+        Args:
+            only_if_idle: Keep the ability if a call started in the meantime
+
+        Returns:
+            True if an ability was unloaded
+        """
+        async with self._load_lock:
+            if only_if_idle and self._in_flight:
+                return False
+            target, self._target = self._target, None
+
+        if target is None:
+            return False
+
+        await target.cleanup()
+        return True
@@ -6,6 +6,8 @@ including initialization, state management, and cleanup.
 """
 
 import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
 from enum import Enum
 
 import structlog
@@ -27,6 +29,173 @@ class LifecycleState(str, Enum):
     ERROR = "error"
 
 
+@dataclass(frozen=True)
+class DependencySchedule:
+    """
+    Topological schedule for running abilities in dependency order.
+
+    Built once with Kahn's algorithm; running it only needs the
+    precomputed in-degrees and dependents, so each ability can start as
+    soon as its own dependencies have finished.
+
+    Attributes:
+        order: Runnable abilities in a valid topological order
+        dependents: Ability name -> abilities that depend on it
+        indegree: Ability name -> number of dependencies within the schedule
+        blocked: Abilities that can never run (missing or cyclic dependencies)
+    """
+
+    order: tuple[str, ...]
+    dependents: Mapping[str, tuple[str, ...]]
+    indegree: Mapping[str, int]
+    blocked: frozenset[str]
+
+    @classmethod
+    def build(
+        cls,
+        names: Iterable[str],
+        dependencies: Mapping[str, Iterable[str]],
+        ignore_missing: bool = False,
+    ) -> "DependencySchedule":
+        """
+        Build a schedule for a set of abilities.
+
+        Args:
+            names: Abilities to schedule
+            dependencies: Ability name -> names it depends on
+            ignore_missing: Drop dependencies outside ``names`` instead of
+                            blocking the abilities that need them
+
+        Returns:
+            Dependency schedule
+        """
+        names = list(dict.fromkeys(names))
+        scheduled = set(names)
+
+        dependents: dict[str, list[str]] = {name: [] for name in names}
+        indegree: dict[str, int] = {}
+        blocked: set[str] = set()
+
+        for name in names:
+            deps = set(dependencies.get(name, ()))
+            if not ignore_missing and not deps <= scheduled:
+                blocked.add(name)
+            deps &= scheduled
+            indegree[name] = len(deps)
+            for dep in deps:
+                dependents[dep].append(name)
+
+        # Kahn's algorithm over the abilities that are not blocked up front
+        remaining = dict(indegree)
+        queue = [name for name in names if remaining[name] == 0 and name not in blocked]
+        order = []
+        for name in queue:
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0 and dependent not in blocked:
+                    queue.append(dependent)
+
+        # Anything left is blocked directly, downstream of a block, or in a cycle
+        runnable = set(order)
+        blocked.update(name for name in names if name not in runnable)
+
+        return cls(
+            order=tuple(order),
+            dependents={name: tuple(deps) for name, deps in dependents.items()},
+            indegree=indegree,
+            blocked=frozenset(blocked),
+        )
+
+    def reversed(self) -> "DependencySchedule":
+        """
+        Get the schedule for running abilities in reverse dependency order.
+
+        Each ability then waits for everything that depends on it, which is
+        the order cleanup needs. Blocked abilities are included too, since
+        they may still hold resources: they wait for nothing, and the
+        abilities they depend on wait for them.
+
+        Returns:
+            Reversed schedule
+        """
+        blocked = [name for name in self.indegree if name in self.blocked]
+        dependents: dict[str, list[str]] = {name: [] for name in self.indegree}
+        indegree = dict.fromkeys(self.indegree, 0)
+
+        # Blocked abilities only depend on each other or on runnable ones, so
+        # edges between blocked abilities (possibly cycles) are left out
+        for name in self.order:
+            for dependent in self.dependents[name]:
+                dependents[dependent].append(name)
+                indegree[name] += 1
+
+        return DependencySchedule(
+            order=(*blocked, *reversed(self.order)),
+            dependents={name: tuple(deps) for name, deps in dependents.items()},
+            indegree=indegree,
+            blocked=frozenset(),
+        )
+
+    async def run(
+        self,
+        action: Callable[[str], Awaitable[bool]],
+        max_concurrency: int | None = None,
+        stop_on_failure: bool = True,
+    ) -> dict[str, bool]:
+        """
+        Run an action for every ability, as early as dependencies allow.
+
+        Args:
+            action: Coroutine function called with each ability name,
+                    returning True on success
+            max_concurrency: Maximum number of actions running at once
+            stop_on_failure: Skip abilities whose dependencies failed
+
+        Returns:
+            Ability name -> whether its action succeeded (skipped and
+            blocked abilities map to False)
+        """
+        results = dict.fromkeys(self.blocked, False)
+        remaining = dict(self.indegree)
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+
+        async def run_one(name: str) -> bool:
+            try:
+                if semaphore is None:
+                    return await action(name)
+                async with semaphore:
+                    return await action(name)
+            except Exception as e:
+                logger.error("Scheduled action failed", ability=name, error=str(e))
+                return False
+
+        pending = {
+            asyncio.create_task(run_one(name)): name for name in self.order if remaining[name] == 0
+        }
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+            for task in done:
+                name = pending.pop(task)
+                results[name] = task.result()
+
+                if stop_on_failure and not results[name]:
+                    continue
+
+                for dependent in self.dependents[name]:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0 and dependent not in self.blocked:
+                        pending[asyncio.create_task(run_one(dependent))] = dependent
+
+        # Abilities downstream of a failure never became ready
+        for name in self.order:
+            results.setdefault(name, False)
+
+        return results
+
+
 class LifecycleManager:
     """
     Manages the lifecycle of abilities.
@@ -201,54 +370,14 @@ class LifecycleManager:
         Returns:
             Dictionary of initialization results
         """
-        results = {}
-        initialized: set[str] = set()
-        failed: set[str] = set()
-
-        # Build dependency graph
-        remaining = set(abilities.keys())
-
-        while remaining:
-            # Find abilities with satisfied dependencies
-            ready = []
-
-            for name in remaining:
-                deps = dependencies.get(name, [])
-
-                # Check if all dependencies are satisfied
-                if all(dep in initialized for dep in deps):
-                    ready.append(name)
-
-            if not ready:
-                # Circular dependency or missing dependencies
-                logger.error("Cannot satisfy dependencies", remaining=list(remaining))
-                for name in remaining:
-                    results[name] = False
-                    failed.add(name)
-                break
-
-            # Initialize ready abilities in parallel
-            tasks = [
-                self.initialize_ability(abilities[name], dependencies.get(name)) for name in ready
-            ]
-
-            init_results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            for name, result in zip(ready, init_results, strict=False):
-                if isinstance(result, Exception):
-                    results[name] = False
-                    failed.add(name)
-                    logger.error("Failed to initialize ability", ability=name, error=str(result))
-                elif result:
-                    results[name] = True
-                    initialized.add(name)
-                else:
-                    results[name] = False
-                    failed.add(name)
-
-                remaining.discard(name)
+        schedule = DependencySchedule.build(abilities, dependencies)
+        if schedule.blocked:
+            logger.error("Cannot satisfy dependencies", remaining=sorted(schedule.blocked))
 
-        return results
+        async def initialize(name: str) -> bool:
+            return await self.initialize_ability(abilities[name], dependencies.get(name))
+
+        return await schedule.run(initialize)
 
     async def health_check(self, ability: BaseAbility) -> bool:
         """
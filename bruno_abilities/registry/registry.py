@@ -6,15 +6,54 @@ handling registration, lookup, and lifecycle management.
 """
 
 import asyncio
+import hashlib
+import json
 from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
 
 import structlog
 
 from bruno_abilities.base.ability_base import BaseAbility
-from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.base.deadline import create_detached_task
+from bruno_abilities.base.metadata import AbilityCapability, AbilityMetadata
+from bruno_abilities.registry.lazy import LazyAbility
+from bruno_abilities.registry.lifecycle import DependencySchedule
+from bruno_abilities.registry.resolver import AbilityMatch, AbilityResolver
+from bruno_abilities.registry.search_index import AbilitySearchIndex
+from bruno_abilities.registry.snapshot import RegistrySnapshot
+from bruno_abilities.registry.workers import WorkerAbility, WorkerPool
 
 logger = structlog.get_logger(__name__)
 
+# Defaults bounding cleanup_all during shutdown
+DEFAULT_CLEANUP_CONCURRENCY = 8
+DEFAULT_CLEANUP_TIMEOUT = 10.0
+
+# Default time unregister and replace wait for in-flight executions
+DEFAULT_DRAIN_TIMEOUT = 30.0
+
+# (category, tag, enabled_only) filter used to select a schema bundle
+_SchemaFilter = tuple[str | None, str | None, bool]
+
+
+@dataclass(frozen=True)
+class FunctionSchemaBundle:
+    """
+    Precomputed LLM function schemas for a set of abilities.
+
+    Attributes:
+        schemas: Function schemas, ordered by ability name
+        payload: Schemas serialized as compact JSON
+        etag: Content hash of the payload, stable across rebuilds
+        version: Registry version the bundle was built from
+    """
+
+    schemas: tuple[dict[str, Any], ...]
+    payload: bytes
+    etag: str
+    version: int
+
 
 class AbilityRegistry:
     """
@@ -22,6 +61,10 @@ class AbilityRegistry:
 
     The registry maintains a collection of registered abilities,
     handles their lifecycle, and provides lookup and discovery functionality.
+
+    Writers update the registry under a lock and then publish a new
+    immutable :class:`RegistrySnapshot`; lookups read the current snapshot
+    and never see a half-applied change.
     """
 
     def __init__(self) -> None:
@@ -32,6 +75,14 @@ class AbilityRegistry:
         self._tags: dict[str, set[str]] = defaultdict(set)  # tag -> ability_names
         self._enabled: dict[str, bool] = {}  # ability_name -> enabled
         self._dependencies: dict[str, list[str]] = {}  # ability_name -> dependencies
+        self._search_index = AbilitySearchIndex()
+        self._resolver = AbilityResolver()
+        self._function_schemas: dict[str, dict[str, Any]] = {}  # ability_name -> schema
+        self._schema_bundles: dict[_SchemaFilter, FunctionSchemaBundle] = {}
+        self._schedules: dict[bool, DependencySchedule] = {}  # enabled_only -> schedule
+        self._version = 0  # Bumped whenever the set of (enabled) abilities changes
+        self._retiring: set[asyncio.Task] = set()  # Drains of replaced abilities
+        self._snapshot = self._build_snapshot()
         self._lock = asyncio.Lock()
 
         logger.info("Ability registry initialized")
@@ -62,36 +113,26 @@ class AbilityRegistry:
             if not isinstance(ability, BaseAbility):
                 raise TypeError(f"Ability must extend BaseAbility, got {type(ability)}")
 
-            # Register the ability
-            self._abilities[name] = ability
-            self._enabled[name] = enabled
-
-            # Register aliases
-            for alias in metadata.aliases:
-                self._aliases[alias.lower()] = name
-
-            # Register category
-            if metadata.category:
-                self._categories[metadata.category].add(name)
-
-            # Register tags
-            for tag in metadata.tags:
-                self._tags[tag.lower()].add(name)
-
-            # Register dependencies
-            if dependencies:
-                self._dependencies[name] = dependencies
+            self._add_entry(ability, enabled, dependencies)
+            self._publish()
 
             logger.info(
                 "Ability registered", ability=name, category=metadata.category, enabled=enabled
             )
 
-    async def unregister(self, name: str) -> None:
+    async def unregister(
+        self, name: str, drain_timeout: float | None = DEFAULT_DRAIN_TIMEOUT
+    ) -> None:
         """
         Unregister an ability from the registry.
 
+        The ability is removed immediately; its cleanup runs once in-flight
+        executions finish (or the drain timeout expires), outside the
+        registry lock.
+
         Args:
             name: Name of ability to unregister
+            drain_timeout: Maximum time to wait for in-flight executions
 
         Raises:
             KeyError: If ability is not registered
@@ -100,53 +141,242 @@ class AbilityRegistry:
             if name not in self._abilities:
                 raise KeyError(f"Ability '{name}' is not registered")
 
-            ability = self._abilities[name]
-            metadata = ability.metadata
+            ability = self._remove_entry(name)
+            self._publish()
+
+            logger.info("Ability unregistered", ability=name)
+
+        await self._retire(ability, drain_timeout)
+
+    async def replace(
+        self,
+        name: str,
+        new_ability: BaseAbility,
+        drain_timeout: float | None = DEFAULT_DRAIN_TIMEOUT,
+        wait: bool = False,
+    ) -> None:
+        """
+        Swap a registered ability for a new instance without downtime.
+
+        The new instance is initialized (if the old one was) and receives
+        the old instance's :meth:`~BaseAbility.export_state` through
+        :meth:`~BaseAbility.import_state` before the swap. From the swap
+        on, lookups return the new instance; in-flight executions finish on
+        the old one, which is cleaned up once they drain.
 
-            # Cleanup ability
+        Args:
+            name: Name of the ability to replace
+            new_ability: Replacement instance with the same name
+            drain_timeout: Maximum time to wait for in-flight executions on
+                           the old instance before cleaning it up
+            wait: Wait for the old instance to drain and clean up
+
+        Raises:
+            KeyError: If ability is not registered
+            ValueError: If the new ability has a different name
+        """
+        if not isinstance(new_ability, BaseAbility):
+            raise TypeError(f"Ability must extend BaseAbility, got {type(new_ability)}")
+        if new_ability.metadata.name != name:
+            raise ValueError(f"Replacement for '{name}' is named '{new_ability.metadata.name}'")
+
+        old_ability = self._snapshot.abilities.get(name)
+        if old_ability is None:
+            raise KeyError(f"Ability '{name}' is not registered")
+
+        # Prepare the new instance before it becomes visible
+        if old_ability.is_initialized:
+            await new_ability.initialize()
+        state = await old_ability.export_state()
+        if state is not None:
+            await new_ability.import_state(state)
+
+        async with self._lock:
+            current = self._abilities.get(name)
+            if current is not old_ability:
+                raise KeyError(f"Ability '{name}' was changed during replace")
+
+            enabled = self._enabled[name]
+            dependencies = self._dependencies.get(name)
+            self._remove_entry(name)
+            self._add_entry(new_ability, enabled, dependencies)
+            self._publish()
+
+            logger.info("Ability replaced", ability=name, in_flight=old_ability.in_flight)
+
+        retire = self._retire(old_ability, drain_timeout)
+        if wait:
+            await retire
+        else:
+            task = create_detached_task(retire)
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    async def offload_cpu_bound(self, pool: WorkerPool) -> list[str]:
+        """
+        Route CPU-bound abilities to a worker pool.
+
+        Every registered ability with the ``CPU_BOUND`` capability is
+        replaced by a :class:`WorkerAbility` that executes it in the worker
+        pinned to the calling user. In-memory state of the local instances
+        is not transferred to the workers.
+
+        Args:
+            pool: Worker pool to execute the abilities in
+
+        Returns:
+            Names of the abilities routed to the pool
+        """
+        offloaded = []
+
+        for name, ability in self._snapshot.abilities.items():
+            if isinstance(ability, WorkerAbility):
+                continue
+            if not ability.metadata.has_capability(AbilityCapability.CPU_BOUND):
+                continue
+
+            if isinstance(ability, LazyAbility):
+                module_path, class_name = ability.module_path, ability.class_name
+            else:
+                module_path = type(ability).__module__
+                class_name = type(ability).__qualname__
+
+            await self.replace(name, WorkerAbility(ability.metadata, module_path, class_name, pool))
+            offloaded.append(name)
+
+        logger.info("CPU-bound abilities offloaded", abilities=offloaded, workers=pool.size)
+        return offloaded
+
+    async def wait_retired(self) -> None:
+        """Wait for replaced abilities to finish draining and cleaning up."""
+        while self._retiring:
+            await asyncio.gather(*self._retiring, return_exceptions=True)
+
+    async def _retire(self, ability: BaseAbility, drain_timeout: float | None) -> None:
+        """Wait for an ability's in-flight executions, then clean it up."""
+        name = ability.metadata.name
+
+        if not await ability.wait_idle(drain_timeout):
+            logger.warning(
+                "Drain timed out, cleaning up with executions in flight",
+                ability=name,
+                in_flight=ability.in_flight,
+            )
+
+        try:
             await ability.cleanup()
+        except Exception as e:
+            logger.error("Failed to cleanup ability", ability=name, error=str(e))
+
+    def _add_entry(
+        self, ability: BaseAbility, enabled: bool, dependencies: list[str] | None
+    ) -> None:
+        """Add an ability to the working state (caller holds the lock and publishes)."""
+        metadata = ability.metadata
+        name = metadata.name
 
-            # Remove from registry
-            del self._abilities[name]
-            del self._enabled[name]
+        # Register the ability
+        self._abilities[name] = ability
+        self._enabled[name] = enabled
 
-            # Remove aliases
-            for alias in metadata.aliases:
-                self._aliases.pop(alias.lower(), None)
+        # Register aliases
+        for alias in metadata.aliases:
+            self._aliases[alias.lower()] = name
 
-            # Remove from category
-            if metadata.category:
-                self._categories[metadata.category].discard(name)
+        # Register category
+        if metadata.category:
+            self._categories[metadata.category].add(name)
 
-            # Remove from tags
-            for tag in metadata.tags:
-                self._tags[tag.lower()].discard(name)
+        # Register tags
+        for tag in metadata.tags:
+            self._tags[tag.lower()].add(name)
 
-            # Remove dependencies
-            self._dependencies.pop(name, None)
+        # Register dependencies
+        if dependencies:
+            self._dependencies[name] = dependencies
 
-            logger.info("Ability unregistered", ability=name)
+        self._search_index.add(metadata)
+        self._resolver.add(metadata)
+        self._function_schemas[name] = metadata.to_function_schema()
+
+    def _remove_entry(self, name: str) -> BaseAbility:
+        """Remove an ability from the working state (caller holds the lock and publishes)."""
+        ability = self._abilities.pop(name)
+        metadata = ability.metadata
+        del self._enabled[name]
+
+        # Remove aliases
+        for alias in metadata.aliases:
+            self._aliases.pop(alias.lower(), None)
+
+        # Remove from category
+        if metadata.category:
+            self._categories[metadata.category].discard(name)
+
+        # Remove from tags
+        for tag in metadata.tags:
+            self._tags[tag.lower()].discard(name)
 
-    def get(self, name_or_alias: str) -> BaseAbility | None:
+        # Remove dependencies
+        self._dependencies.pop(name, None)
+
+        self._search_index.remove(name)
+        self._resolver.remove(name)
+        self._function_schemas.pop(name, None)
+        return ability
+
+    def get(self, name_or_alias: str, fuzzy: bool = False) -> BaseAbility | None:
         """
         Get an ability by name or alias.
 
+        Only exact names and aliases match by default, so a mistyped name
+        never runs a different ability. With ``fuzzy`` enabled, near misses
+        such as ``set_timer``, ``timers`` or ``Todo-List`` are resolved as
+        well; use :meth:`resolve` to check the match confidence first.
+
         Args:
             name_or_alias: Ability name or alias
+            fuzzy: Fall back to fuzzy resolution when there is no exact match
 
         Returns:
             Ability instance or None if not found
         """
-        # Try direct lookup
-        if name_or_alias in self._abilities:
-            return self._abilities[name_or_alias]
+        snapshot = self._snapshot
+
+        ability = snapshot.get(name_or_alias)
+        if ability is None and fuzzy:
+            match = self._resolver.resolve(name_or_alias)
+            if match:
+                ability = snapshot.abilities.get(match.name)
+
+        return ability
+
+    def resolve(self, name_or_alias: str, max_distance: int | None = None) -> AbilityMatch | None:
+        """
+        Resolve a name, alias or near miss to an ability.
 
-        # Try alias lookup
-        actual_name = self._aliases.get(name_or_alias.lower())
+        Args:
+            name_or_alias: Ability name, alias or near miss
+            max_distance: Maximum edit distance after normalization
+
+        Returns:
+            Match with a confidence score (1.0 for exact names and aliases),
+            or None if nothing is close enough
+        """
+        snapshot = self._snapshot
+
+        if name_or_alias in snapshot.abilities:
+            return AbilityMatch(
+                name=name_or_alias, matched=name_or_alias, distance=0, confidence=1.0
+            )
+
+        actual_name = snapshot.aliases.get(name_or_alias.lower())
         if actual_name:
-            return self._abilities.get(actual_name)
+            return AbilityMatch(
+                name=actual_name, matched=name_or_alias.lower(), distance=0, confidence=1.0
+            )
 
-        return None
+        return self._resolver.resolve(name_or_alias, max_distance=max_distance)
 
     def is_enabled(self, name: str) -> bool:
         """
@@ -158,7 +388,7 @@ class AbilityRegistry:
         Returns:
             True if enabled, False otherwise
         """
-        return self._enabled.get(name, False)
+        return self._snapshot.is_enabled(name)
 
     async def enable(self, name: str) -> None:
         """
@@ -174,7 +404,9 @@ class AbilityRegistry:
             if name not in self._abilities:
                 raise KeyError(f"Ability '{name}' is not registered")
 
-            self._enabled[name] = True
+            if not self._enabled[name]:
+                self._enabled[name] = True
+                self._publish()
             logger.info("Ability enabled", ability=name)
 
     async def disable(self, name: str) -> None:
@@ -191,7 +423,9 @@ class AbilityRegistry:
             if name not in self._abilities:
                 raise KeyError(f"Ability '{name}' is not registered")
 
-            self._enabled[name] = False
+            if self._enabled[name]:
+                self._enabled[name] = False
+                self._publish()
             logger.info("Ability disabled", ability=name)
 
     def list_abilities(
@@ -200,51 +434,58 @@ class AbilityRegistry:
         """
         List abilities matching criteria.
 
+        Results are precomputed on the current snapshot, so a call only
+        copies the matching names.
+
         Args:
             category: Filter by category
             tag: Filter by tag
             enabled_only: Only include enabled abilities
 
         Returns:
-            List of ability names
+            Sorted list of ability names
         """
-        abilities = set(self._abilities.keys())
-
-        # Filter by category
-        if category:
-            abilities &= self._categories.get(category, set())
-
-        # Filter by tag
-        if tag:
-            abilities &= self._tags.get(tag.lower(), set())
-
-        # Filter by enabled status
-        if enabled_only:
-            abilities = {name for name in abilities if self._enabled.get(name, False)}
-
-        return sorted(abilities)
-
-    def search(self, query: str, enabled_only: bool = False) -> list[BaseAbility]:
+        return list(
+            self._snapshot.list_names(category=category, tag=tag, enabled_only=enabled_only)
+        )
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """Current immutable view of the registry."""
+        return self._snapshot
+
+    def search(
+        self, query: str, enabled_only: bool = False, limit: int | None = None
+    ) -> list[BaseAbility]:
         """
         Search for abilities matching a query.
 
+        Matches are ranked by where the query was found: name first, then
+        aliases, tags and description.
+
         Args:
             query: Search query
             enabled_only: Only search enabled abilities
+            limit: Maximum number of results
 
         Returns:
-            List of matching abilities
+            List of matching abilities, best match first
         """
+        snapshot = self._snapshot
         results = []
 
-        for name, ability in self._abilities.items():
+        for name, _score in self._search_index.search(query):
+            ability = snapshot.abilities.get(name)
+            if ability is None:
+                continue
+
             # Skip disabled if filtering
-            if enabled_only and not self._enabled.get(name, False):
+            if enabled_only and name not in snapshot.enabled:
                 continue
 
-            # Check if metadata matches query
-            if ability.metadata.matches_query(query):
-                results.append(ability)
+            results.append(ability)
+            if limit is not None and len(results) >= limit:
+                break
 
         return results
 
@@ -258,8 +499,8 @@ class AbilityRegistry:
         Returns:
             List of abilities
         """
-        ability_names = self._categories.get(category, set())
-        return [self._abilities[name] for name in ability_names if name in self._abilities]
+        snapshot = self._snapshot
+        return [snapshot.abilities[name] for name in snapshot.categories.get(category, ())]
 
     def get_by_tag(self, tag: str) -> list[BaseAbility]:
         """
@@ -271,8 +512,8 @@ class AbilityRegistry:
         Returns:
             List of abilities
         """
-        ability_names = self._tags.get(tag.lower(), set())
-        return [self._abilities[name] for name in ability_names if name in self._abilities]
+        snapshot = self._snapshot
+        return [snapshot.abilities[name] for name in snapshot.tags.get(tag.lower(), ())]
 
     def get_dependencies(self, name: str) -> list[str]:
         """
@@ -284,7 +525,7 @@ class AbilityRegistry:
         Returns:
             List of dependency names
         """
-        return self._dependencies.get(name, [])
+        return list(self._snapshot.dependencies.get(name, ()))
 
     def check_dependencies(self, name: str) -> bool:
         """
@@ -296,35 +537,168 @@ class AbilityRegistry:
         Returns:
             True if all dependencies are registered and enabled
         """
-        dependencies = self._dependencies.get(name, [])
+        snapshot = self._snapshot
 
-        for dep in dependencies:
-            if dep not in self._abilities:
+        for dep in snapshot.dependencies.get(name, ()):
+            if dep not in snapshot.abilities:
                 logger.warning("Missing dependency", ability=name, dependency=dep)
                 return False
 
-            if not self._enabled.get(dep, False):
+            if dep not in snapshot.enabled:
                 logger.warning("Dependency not enabled", ability=name, dependency=dep)
                 return False
 
         return True
 
-    async def initialize_all(self) -> None:
-        """Initialize all registered abilities."""
-        for name, ability in self._abilities.items():
-            if self._enabled.get(name, False):
-                try:
-                    await ability.initialize()
-                except Exception as e:
-                    logger.error("Failed to initialize ability", ability=name, error=str(e))
-
-    async def cleanup_all(self) -> None:
-        """Cleanup all registered abilities."""
-        for name, ability in self._abilities.items():
+    async def initialize_all(
+        self, max_concurrency: int | None = None, timeout: float | None = None
+    ) -> dict[str, bool]:
+        """
+        Initialize all enabled abilities in dependency order.
+
+        Each ability starts as soon as its own dependencies are initialized,
+        so independent abilities initialize concurrently. Abilities with
+        missing, disabled or cyclic dependencies, or whose dependencies
+        failed, are not initialized.
+
+        Args:
+            max_concurrency: Maximum number of abilities initializing at once
+            timeout: Per-ability initialization timeout in seconds
+
+        Returns:
+            Ability name -> whether it was initialized
+        """
+        snapshot = self._snapshot
+        schedule = self._get_schedule(enabled_only=True)
+
+        if schedule.blocked:
+            logger.error("Cannot satisfy dependencies", abilities=sorted(schedule.blocked))
+
+        async def initialize(name: str) -> bool:
+            try:
+                await asyncio.wait_for(snapshot.abilities[name].initialize(), timeout)
+                return True
+            except Exception as e:
+                logger.error("Failed to initialize ability", ability=name, error=repr(e))
+                return False
+
+        return await schedule.run(initialize, max_concurrency=max_concurrency)
+
+    async def cleanup_all(
+        self,
+        max_concurrency: int | None = DEFAULT_CLEANUP_CONCURRENCY,
+        timeout: float | None = DEFAULT_CLEANUP_TIMEOUT,
+    ) -> dict[str, bool]:
+        """
+        Cleanup all registered abilities in reverse dependency order.
+
+        An ability is cleaned up only after everything depending on it,
+        whether or not those cleanups succeeded.
+
+        Args:
+            max_concurrency: Maximum number of abilities cleaning up at once
+            timeout: Per-ability cleanup timeout in seconds
+
+        Returns:
+            Ability name -> whether its cleanup succeeded
+        """
+        snapshot = self._snapshot
+        schedule = self._get_schedule(enabled_only=False).reversed()
+
+        async def cleanup(name: str) -> bool:
             try:
-                await ability.cleanup()
+                await asyncio.wait_for(snapshot.abilities[name].cleanup(), timeout)
+                return True
             except Exception as e:
-                logger.error("Failed to cleanup ability", ability=name, error=str(e))
+                logger.error("Failed to cleanup ability", ability=name, error=repr(e))
+                return False
+
+        return await schedule.run(cleanup, max_concurrency=max_concurrency, stop_on_failure=False)
+
+    def _get_schedule(self, enabled_only: bool) -> DependencySchedule:
+        """
+        Get the dependency schedule for the current snapshot.
+
+        Args:
+            enabled_only: Schedule only enabled abilities, blocking those
+                          whose dependencies are missing or disabled
+
+        Returns:
+            Cached dependency schedule
+        """
+        schedule = self._schedules.get(enabled_only)
+        if schedule is None:
+            snapshot = self._snapshot
+            schedule = DependencySchedule.build(
+                snapshot.enabled_names if enabled_only else snapshot.names,
+                snapshot.dependencies,
+                # Cleanup still has to reach abilities with unmet dependencies
+                ignore_missing=not enabled_only,
+            )
+            self._schedules[enabled_only] = schedule
+        return schedule
+
+    @property
+    def version(self) -> int:
+        """Registry version, incremented whenever abilities change."""
+        return self._version
+
+    def get_function_schemas(
+        self, category: str | None = None, tag: str | None = None, enabled_only: bool = True
+    ) -> FunctionSchemaBundle:
+        """
+        Get LLM function schemas for abilities matching criteria.
+
+        Bundles are cached per filter and only rebuilt after register,
+        unregister, enable or disable change the registry. Callers can
+        compare the bundle's etag with the last one they sent to skip
+        re-sending unchanged tool definitions.
+
+        Args:
+            category: Filter by category
+            tag: Filter by tag
+            enabled_only: Only include enabled abilities
+
+        Returns:
+            Schema bundle for the matching abilities
+        """
+        key = (category, tag.lower() if tag else None, enabled_only)
+
+        bundle = self._schema_bundles.get(key)
+        if bundle is None:
+            snapshot = self._snapshot
+            names = snapshot.list_names(category=category, tag=tag, enabled_only=enabled_only)
+            schemas = tuple(self._function_schemas[name] for name in names)
+            payload = json.dumps(schemas, separators=(",", ":"), default=str).encode()
+
+            bundle = FunctionSchemaBundle(
+                schemas=schemas,
+                payload=payload,
+                etag=hashlib.sha256(payload).hexdigest()[:16],
+                version=snapshot.version,
+            )
+            self._schema_bundles[key] = bundle
+
+        return bundle
+
+    def _publish(self) -> None:
+        """Record a registry change, drop cached schema bundles and publish a snapshot."""
+        self._version += 1
+        self._schema_bundles.clear()
+        self._schedules.clear()
+        self._snapshot = self._build_snapshot()
+
+    def _build_snapshot(self) -> RegistrySnapshot:
+        """Build a snapshot of the current registry state."""
+        return RegistrySnapshot.build(
+            version=self._version,
+            abilities=self._abilities,
+            aliases=self._aliases,
+            enabled=self._enabled,
+            categories=self._categories,
+            tags=self._tags,
+            dependencies=self._dependencies,
+        )
 
     def get_all_metadata(self) -> list[AbilityMetadata]:
         """
@@ -333,7 +707,7 @@ class AbilityRegistry:
         Returns:
             List of ability metadata
         """
-        return [ability.metadata for ability in self._abilities.values()]
+        return [ability.metadata for ability in self._snapshot.abilities.values()]
 
 
 # Global registry instance
@@ -0,0 +1,259 @@
+"""
+Fuzzy resolution of ability names.
+
+This module maps near-miss names emitted by the LLM (``set_timer``,
+``timers``, ``todo list``) to registered abilities, using normalization
+followed by a bounded edit-distance lookup in a BK-tree.
+"""
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from bruno_abilities.base.metadata import AbilityMetadata
+
+_SEPARATORS = re.compile(r"[\s_\-./]+")
+
+# Confidence assigned to matches after normalization, before any edits
+NAME_CONFIDENCE = 0.95
+ALIAS_CONFIDENCE = 0.9
+
+
+def _singularize(word: str) -> str:
+    """Strip common English plural endings."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 4 and word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalize an ability name or alias for matching.
+
+    Lowercases, treats ``_``, ``-``, ``.``, ``/`` and whitespace as word
+    separators, and reduces plural words to their singular form.
+
+    Args:
+        text: Name to normalize
+
+    Returns:
+        Normalized name
+    """
+    words = _SEPARATORS.split(text.lower().strip())
+    return " ".join(_singularize(word) for word in words if word)
+
+
+def edit_distance(a: str, b: str, max_distance: int | None = None) -> int:
+    """
+    Compute the Levenshtein distance between two strings.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Stop early once the distance is known to exceed this
+
+    Returns:
+        Edit distance (or a value above max_distance when cut off)
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+
+    return previous[-1]
+
+
+class _BKTree:
+    """Burkhard-Keller tree for bounded edit-distance queries."""
+
+    def __init__(self) -> None:
+        self._root: str | None = None
+        self._children: dict[str, dict[int, str]] = {}
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = word
+            self._children[word] = {}
+            return
+
+        node = self._root
+        while True:
+            distance = edit_distance(word, node)
+            if distance == 0:
+                return
+            child = self._children[node].get(distance)
+            if child is None:
+                self._children[node][distance] = word
+                self._children[word] = {}
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        if self._root is None:
+            return []
+
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            distance = edit_distance(word, node)
+            if distance <= max_distance:
+                found.append((distance, node))
+
+            # Triangle inequality bounds the subtrees worth visiting
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for d, child in self._children[node].items() if low <= d <= high)
+
+        return found
+
+
+@dataclass(frozen=True)
+class AbilityMatch:
+    """
+    Result of resolving a name to an ability.
+
+    Attributes:
+        name: Resolved ability name
+        matched: Normalized name or alias that matched
+        distance: Edit distance between the normalized query and the match
+        confidence: Match confidence between 0 and 1
+    """
+
+    name: str
+    matched: str
+    distance: int
+    confidence: float
+
+
+class AbilityResolver:
+    """
+    Resolves near-miss names to abilities.
+
+    Names and aliases are normalized and stored in a BK-tree, which is
+    rebuilt lazily after abilities change. Resolutions are cached in a
+    bounded LRU keyed by the normalized query.
+    """
+
+    def __init__(self, cache_size: int = 1024) -> None:
+        """
+        Initialize the resolver.
+
+        Args:
+            cache_size: Maximum number of cached resolutions
+        """
+        self._cache_size = cache_size
+        # normalized key -> [(ability name, is the ability's own name)]
+        self._keys: dict[str, list[tuple[str, bool]]] = {}
+        self._tree: _BKTree | None = None
+        self._cache: OrderedDict[tuple[str, int], AbilityMatch | None] = OrderedDict()
+
+    def add(self, metadata: AbilityMetadata) -> None:
+        """
+        Add an ability's name and aliases.
+
+        Args:
+            metadata: Ability metadata
+        """
+        self.remove(metadata.name)
+
+        self._keys.setdefault(normalize_name(metadata.name), []).append((metadata.name, True))
+        for alias in metadata.aliases:
+            self._keys.setdefault(normalize_name(alias), []).append((metadata.name, False))
+
+        self._invalidate()
+
+    def remove(self, name: str) -> None:
+        """
+        Remove an ability's name and aliases.
+
+        Args:
+            name: Ability name
+        """
+        for key in list(self._keys):
+            targets = [target for target in self._keys[key] if target[0] != name]
+            if len(targets) == len(self._keys[key]):
+                continue
+            if targets:
+                self._keys[key] = targets
+            else:
+                del self._keys[key]
+
+        self._invalidate()
+
+    def resolve(self, query: str, max_distance: int | None = None) -> AbilityMatch | None:
+        """
+        Resolve a query to the closest ability.
+
+        Args:
+            query: Name, alias or near miss
+            max_distance: Maximum edit distance (defaults to 1 for short
+                         queries and 2 otherwise)
+
+        Returns:
+            Best match or None if nothing is close enough
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return None
+
+        if max_distance is None:
+            max_distance = 1 if len(normalized) <= 4 else 2
+
+        cache_key = (normalized, max_distance)
+        if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
+            return self._cache[cache_key]
+
+        match = self._lookup(normalized, max_distance)
+
+        self._cache[cache_key] = match
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return match
+
+    def _lookup(self, normalized: str, max_distance: int) -> AbilityMatch | None:
+        """Find the best match without consulting the cache."""
+        if self._tree is None:
+            self._tree = _BKTree()
+            for key in self._keys:
+                self._tree.add(key)
+
+        candidates = []
+        for distance, key in self._tree.search(normalized, max_distance):
+            for name, is_name in self._keys[key]:
+                base = NAME_CONFIDENCE if is_name else ALIAS_CONFIDENCE
+                confidence = base * (1 - distance / max(len(normalized), len(key)))
+                candidates.append((distance, not is_name, name, key, confidence))
+
+        if not candidates:
+            return None
+
+        distance, _, name, key, confidence = min(candidates)
+        return AbilityMatch(
+            name=name, matched=key, distance=distance, confidence=round(confidence, 3)
+        )
+
+    def _invalidate(self) -> None:
+        """Drop the tree and cached resolutions after a change."""
+        self._tree = None
+        self._cache.clear()
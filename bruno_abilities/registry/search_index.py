@@ -0,0 +1,153 @@
+"""
+Search index for ability lookup.
+
+This module provides an n-gram index over ability names, aliases, tags
+and descriptions, so registry searches only inspect abilities that can
+match instead of scanning every registered ability.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from bruno_abilities.base.metadata import AbilityMetadata
+
+# Longest n-gram indexed; shorter queries use grams of their own length
+MAX_GRAM = 3
+
+# Field weights used for ranking (name > alias > tag > description)
+FIELD_WEIGHTS = {
+    "name": 8.0,
+    "alias": 4.0,
+    "tag": 2.0,
+    "description": 1.0,
+}
+
+# Score multipliers for matches on a whole field or at its start
+EXACT_BONUS = 2.0
+PREFIX_BONUS = 1.5
+
+
+def _grams(text: str, size: int) -> set[str]:
+    """Get all n-grams of a given size from a string."""
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+@dataclass(frozen=True)
+class _Document:
+    """A single indexed field value."""
+
+    name: str
+    field: str
+    text: str
+
+
+class AbilitySearchIndex:
+    """
+    N-gram index over ability metadata.
+
+    Every 1-, 2- and 3-gram of each lowercased field value is mapped to the
+    documents containing it. A query is answered by intersecting the
+    postings of its grams and confirming the substring match on the few
+    remaining candidates, so results match
+    :meth:`AbilityMetadata.matches_query` but are ranked by field weight.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._documents: dict[int, _Document] = {}
+        self._postings: dict[str, set[int]] = defaultdict(set)
+        self._by_name: dict[str, list[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        """Return the number of indexed abilities."""
+        return len(self._by_name)
+
+    def add(self, metadata: AbilityMetadata) -> None:
+        """
+        Index an ability, replacing any previous entry with the same name.
+
+        Args:
+            metadata: Metadata of the ability to index
+        """
+        name = metadata.name
+        self.remove(name)
+
+        fields = [("name", name)]
+        fields.extend(("alias", alias) for alias in metadata.aliases)
+        fields.extend(("tag", tag) for tag in metadata.tags)
+        fields.append(("description", metadata.description))
+
+        doc_ids = []
+        for field, text in fields:
+            doc_id = self._next_id
+            self._next_id += 1
+
+            lowered = text.lower()
+            self._documents[doc_id] = _Document(name=name, field=field, text=lowered)
+            doc_ids.append(doc_id)
+
+            for size in range(1, MAX_GRAM + 1):
+                for gram in _grams(lowered, size):
+                    self._postings[gram].add(doc_id)
+
+        self._by_name[name] = doc_ids
+
+    def remove(self, name: str) -> None:
+        """
+        Remove an ability from the index.
+
+        Args:
+            name: Ability name
+        """
+        for doc_id in self._by_name.pop(name, []):
+            document = self._documents.pop(doc_id)
+
+            for size in range(1, MAX_GRAM + 1):
+                for gram in _grams(document.text, size):
+                    postings = self._postings.get(gram)
+                    if postings is not None:
+                        postings.discard(doc_id)
+                        if not postings:
+                            del self._postings[gram]
+
+    def search(self, query: str, limit: int | None = None) -> list[tuple[str, float]]:
+        """
+        Find abilities whose fields contain the query.
+
+        Args:
+            query: Search query (matched as a case-insensitive substring)
+            limit: Maximum number of results
+
+        Returns:
+            (ability name, score) tuples, best match first
+        """
+        query = query.lower()
+        if not query:
+            return [(name, 0.0) for name in sorted(self._by_name)][:limit]
+
+        size = min(len(query), MAX_GRAM)
+        postings = sorted(
+            (self._postings.get(gram, set()) for gram in _grams(query, size)), key=len
+        )
+        if not postings[0]:
+            return []
+
+        candidates = postings[0].intersection(*postings[1:])
+
+        scores: dict[str, float] = defaultdict(float)
+        for doc_id in candidates:
+            document = self._documents[doc_id]
+            if query not in document.text:
+                continue
+
+            score = FIELD_WEIGHTS[document.field]
+            if document.text == query:
+                score *= EXACT_BONUS
+            elif document.text.startswith(query):
+                score *= PREFIX_BONUS
+
+            scores[document.name] += score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
@@ -0,0 +1,162 @@
+"""
+Immutable registry snapshots.
+
+The registry publishes a new :class:`RegistrySnapshot` after every change.
+Readers grab the current snapshot once and see a consistent view of the
+registry without locking, even while registrations are in progress.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+from bruno_abilities.base.ability_base import BaseAbility
+
+# (category, tag, enabled_only) filter for a list of ability names
+_NameFilter = tuple[str | None, str | None, bool]
+
+
+def _freeze(groups: Mapping[str, set[str]]) -> Mapping[str, tuple[str, ...]]:
+    """Convert a name -> set mapping into a read-only mapping of sorted tuples."""
+    return MappingProxyType({key: tuple(sorted(names)) for key, names in groups.items() if names})
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """
+    Read-only view of the registry at one version.
+
+    Name lists are sorted once when the snapshot is built, so listing
+    abilities returns a shared tuple instead of building a new list.
+
+    Attributes:
+        version: Registry version the snapshot was built from
+        abilities: Ability name -> instance
+        aliases: Lowercased alias -> ability name
+        enabled: Names of enabled abilities
+        names: All ability names, sorted
+        enabled_names: Enabled ability names, sorted
+        categories: Category -> sorted ability names
+        tags: Lowercased tag -> sorted ability names
+        dependencies: Ability name -> dependency names
+    """
+
+    version: int
+    abilities: Mapping[str, BaseAbility]
+    aliases: Mapping[str, str]
+    enabled: frozenset[str]
+    names: tuple[str, ...]
+    enabled_names: tuple[str, ...]
+    categories: Mapping[str, tuple[str, ...]]
+    tags: Mapping[str, tuple[str, ...]]
+    dependencies: Mapping[str, tuple[str, ...]]
+    _views: dict[_NameFilter, tuple[str, ...]] = field(
+        default_factory=dict, compare=False, repr=False
+    )
+
+    @classmethod
+    def build(
+        cls,
+        version: int,
+        abilities: Mapping[str, BaseAbility],
+        aliases: Mapping[str, str],
+        enabled: Mapping[str, bool],
+        categories: Mapping[str, set[str]],
+        tags: Mapping[str, set[str]],
+        dependencies: Mapping[str, list[str]],
+    ) -> "RegistrySnapshot":
+        """
+        Build a snapshot by copying the registry's working state.
+
+        Args:
+            version: Registry version
+            abilities: Ability name -> instance
+            aliases: Lowercased alias -> ability name
+            enabled: Ability name -> enabled flag
+            categories: Category -> ability names
+            tags: Lowercased tag -> ability names
+            dependencies: Ability name -> dependency names
+
+        Returns:
+            New snapshot
+        """
+        names = tuple(sorted(abilities))
+        enabled_names = tuple(name for name in names if enabled.get(name, False))
+
+        snapshot = cls(
+            version=version,
+            abilities=MappingProxyType(dict(abilities)),
+            aliases=MappingProxyType(dict(aliases)),
+            enabled=frozenset(enabled_names),
+            names=names,
+            enabled_names=enabled_names,
+            categories=_freeze(categories),
+            tags=_freeze(tags),
+            dependencies=MappingProxyType(
+                {name: tuple(deps) for name, deps in dependencies.items()}
+            ),
+        )
+        snapshot._views[(None, None, False)] = names
+        snapshot._views[(None, None, True)] = enabled_names
+        return snapshot
+
+    def get(self, name_or_alias: str) -> BaseAbility | None:
+        """
+        Get an ability by exact name or alias.
+
+        Args:
+            name_or_alias: Ability name or alias
+
+        Returns:
+            Ability instance or None if not found
+        """
+        ability = self.abilities.get(name_or_alias)
+        if ability is None:
+            actual_name = self.aliases.get(name_or_alias.lower())
+            if actual_name:
+                ability = self.abilities.get(actual_name)
+        return ability
+
+    def is_enabled(self, name: str) -> bool:
+        """
+        Check if an ability is enabled.
+
+        Args:
+            name: Ability name
+
+        Returns:
+            True if enabled, False otherwise
+        """
+        return name in self.enabled
+
+    def list_names(
+        self, category: str | None = None, tag: str | None = None, enabled_only: bool = False
+    ) -> tuple[str, ...]:
+        """
+        List ability names matching criteria.
+
+        Unfiltered lists are precomputed; filtered lists are computed on
+        first use and reused for the lifetime of the snapshot.
+
+        Args:
+            category: Filter by category
+            tag: Filter by tag
+            enabled_only: Only include enabled abilities
+
+        Returns:
+            Sorted ability names
+        """
+        key = (category or None, tag.lower() if tag else None, enabled_only)
+
+        names = self._views.get(key)
+        if names is None:
+            names = self.enabled_names if enabled_only else self.names
+            if key[0]:
+                in_category = set(self.categories.get(key[0], ()))
+                names = tuple(name for name in names if name in in_category)
+            if key[1]:
+                tagged = set(self.tags.get(key[1], ()))
+                names = tuple(name for name in names if name in tagged)
+            self._views[key] = names
+
+        return names
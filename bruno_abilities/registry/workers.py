@@ -0,0 +1,371 @@
+"""
+Worker-process execution for CPU-bound abilities.
+
+This module runs abilities flagged with
+:attr:`AbilityCapability.CPU_BOUND` in a pool of worker processes, so heavy
+work does not block the main event loop. Requests and results are framed
+JSON sent over pipes (no pickling), and each user is pinned to one worker
+so per-user in-memory state stays in a single process.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import threading
+import zlib
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+from typing import Any
+
+import structlog
+
+from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.deadline import effective_deadline
+from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.base.tracing import inject_trace_context
+
+logger = structlog.get_logger(__name__)
+
+
+def _encode(message: dict[str, Any]) -> bytes:
+    """Encode a message frame."""
+    return json.dumps(message, default=str, separators=(",", ":")).encode()
+
+
+def _worker_main(conn: Connection) -> None:
+    """Entry point of a worker process."""
+    asyncio.run(_serve(conn))
+
+
+async def _serve(conn: Connection) -> None:
+    """Execute requests from the parent until told to stop."""
+    loop = asyncio.get_running_loop()
+    abilities: dict[tuple[str, str], BaseAbility] = {}
+    tasks: set[asyncio.Task] = set()
+
+    async def handle(request: dict[str, Any]) -> None:
+        try:
+            key = (request["module"], request["class"])
+            ability = abilities.get(key)
+            if ability is None:
+                # Imported here to keep worker start-up light
+                from bruno_abilities.registry.discovery import AbilityDiscovery
+
+                ability = AbilityDiscovery.load_ability(*key)()
+                abilities[key] = ability
+
+            result = await ability.execute(
+                request["parameters"], AbilityContext(**request["context"])
+            )
+            response = {"id": request["id"], "result": result.model_dump(mode="json")}
+        except Exception as e:
+            response = {"id": request["id"], "error": f"{type(e).__name__}: {e}"}
+
+        conn.send_bytes(_encode(response))
+
+    while True:
+        try:
+            frame = await loop.run_in_executor(None, conn.recv_bytes)
+        except (EOFError, OSError):
+            break
+
+        request = json.loads(frame)
+        if request.get("op") == "stop":
+            break
+
+        task = asyncio.create_task(handle(request))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for ability in abilities.values():
+        try:
+            await ability.cleanup()
+        except Exception as e:
+            logger.error("Failed to cleanup ability in worker", error=str(e))
+
+
+@dataclass
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    process: multiprocessing.process.BaseProcess
+    conn: Connection
+    loop: asyncio.AbstractEventLoop
+    pending: dict[int, asyncio.Future] = field(default_factory=dict)
+    send_lock: threading.Lock = field(default_factory=threading.Lock)
+    reader: threading.Thread | None = None
+    closed: bool = False  # Set on the event loop once the reader has stopped
+
+    @property
+    def alive(self) -> bool:
+        return not self.closed and self.process.is_alive()
+
+
+class WorkerPool:
+    """
+    Pool of worker processes executing abilities.
+
+    Workers are started on first use, or up front with :meth:`start`;
+    startup runs in a thread, so it does not stall the event loop. Each
+    request is routed to the worker
+    chosen by a stable hash of the user ID; a worker that dies is replaced
+    on the next request routed to it, failing only the requests it had in
+    flight.
+    """
+
+    def __init__(self, size: int | None = None, start_method: str = "spawn") -> None:
+        """
+        Initialize the worker pool.
+
+        Args:
+            size: Number of worker processes (defaults to the CPU count)
+            start_method: Multiprocessing start method for the workers
+        """
+        self._size = size or os.cpu_count() or 1
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: list[_Worker | None] = [None] * self._size
+        # Serialize starting each worker, so concurrent requests start it once
+        self._start_locks = [asyncio.Lock() for _ in range(self._size)]
+        self._next_id = 0
+        self._closed = False
+
+    @property
+    def size(self) -> int:
+        """Number of worker processes."""
+        return self._size
+
+    async def start(self) -> None:
+        """
+        Start all workers now rather than on their first request.
+
+        Raises:
+            RuntimeError: If the pool is closed
+        """
+        await asyncio.gather(*(self._get_worker(index) for index in range(self._size)))
+
+    def worker_index(self, user_id: str) -> int:
+        """
+        Get the worker a user is pinned to.
+
+        Args:
+            user_id: User identifier
+
+        Returns:
+            Worker index
+        """
+        return zlib.crc32(user_id.encode()) % self._size
+
+    async def execute(
+        self,
+        module_path: str,
+        class_name: str,
+        parameters: dict[str, Any],
+        context: AbilityContext,
+    ) -> AbilityResult:
+        """
+        Execute an ability in the worker pinned to the context's user.
+
+        Parameters and context metadata must be JSON-serializable; models
+        in the result data arrive as plain dictionaries.
+
+        Args:
+            module_path: Module defining the ability class
+            class_name: Name of the ability class
+            parameters: Ability parameters
+            context: Execution context
+
+        Returns:
+            AbilityResult from the worker
+
+        Raises:
+            RuntimeError: If the pool is closed
+        """
+        worker = await self._get_worker(self.worker_index(context.user_id))
+
+        request_id = self._next_id
+        self._next_id += 1
+        future = worker.loop.create_future()
+        worker.pending[request_id] = future
+        if worker.closed:
+            worker.pending.pop(request_id, None)
+            return AbilityResult(success=False, error="Worker unavailable: worker exited")
+
+        payload = context.model_dump()
+        # Lets spans recorded in the worker join the caller's trace
+        inject_trace_context(payload["metadata"])
+        # The worker's execute enforces the tighter of the context and current deadlines
+        payload["deadline"] = effective_deadline(context.deadline)
+        frame = _encode(
+            {
+                "id": request_id,
+                "module": module_path,
+                "class": class_name,
+                "parameters": parameters,
+                "context": payload,
+            }
+        )
+        try:
+            with worker.send_lock:
+                worker.conn.send_bytes(frame)
+        except OSError as e:
+            worker.pending.pop(request_id, None)
+            return AbilityResult(success=False, error=f"Worker unavailable: {str(e)}")
+
+        response = await future
+        if "error" in response:
+            return AbilityResult(
+                success=False, error=f"Worker execution failed: {response['error']}"
+            )
+        return AbilityResult.model_validate(response["result"])
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Stop all workers, letting them clean up their abilities.
+
+        Args:
+            timeout: Time to wait for each worker before terminating it
+        """
+        self._closed = True
+
+        for index, worker in enumerate(self._workers):
+            if worker is None:
+                continue
+            self._workers[index] = None
+
+            try:
+                with worker.send_lock:
+                    worker.conn.send_bytes(_encode({"op": "stop"}))
+            except OSError:
+                pass
+
+            await asyncio.to_thread(worker.process.join, timeout)
+            if worker.process.is_alive():
+                logger.warning("Worker did not stop, terminating", pid=worker.process.pid)
+                worker.process.terminate()
+                await asyncio.to_thread(worker.process.join, timeout)
+            worker.conn.close()
+
+        logger.info("Worker pool closed")
+
+    async def _get_worker(self, index: int) -> _Worker:
+        """
+        Get a running worker, starting or replacing it if needed.
+
+        Raises:
+            RuntimeError: If the pool is closed
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        worker = self._workers[index]
+        if worker is not None and worker.alive:
+            return worker
+
+        async with self._start_locks[index]:
+            worker = self._workers[index]
+            if worker is not None and worker.alive:
+                return worker  # Started while this call waited for the lock
+            return await self._start_worker(index, worker)
+
+    async def _start_worker(self, index: int, previous: _Worker | None) -> _Worker:
+        """Start a worker, replacing a dead one."""
+        if previous is not None:
+            logger.warning("Replacing dead worker", index=index, pid=previous.process.pid)
+            previous.conn.close()
+
+        parent_conn, child_conn = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main, args=(child_conn,), name=f"bruno-worker-{index}", daemon=True
+        )
+        # Spawning starts an interpreter that imports the package, which takes
+        # long enough to stall every other ability if done on the event loop
+        await asyncio.to_thread(process.start)
+        child_conn.close()
+
+        if self._closed:
+            # Closed while starting: close() did not see this worker
+            process.terminate()
+            await asyncio.to_thread(process.join)
+            parent_conn.close()
+            raise RuntimeError("Worker pool is closed")
+
+        worker = _Worker(process=process, conn=parent_conn, loop=asyncio.get_running_loop())
+        worker.reader = threading.Thread(
+            target=self._read_responses, args=(worker,), name=f"bruno-worker-{index}-reader"
+        )
+        worker.reader.daemon = True
+        worker.reader.start()
+        self._workers[index] = worker
+
+        logger.info("Worker started", index=index, pid=process.pid)
+        return worker
+
+    @staticmethod
+    def _read_responses(worker: _Worker) -> None:
+        """Resolve pending requests from a worker's responses (runs in a thread)."""
+
+        def resolve(response: dict[str, Any]) -> None:
+            future = worker.pending.pop(response["id"], None)
+            if future is not None and not future.done():
+                future.set_result(response)
+
+        def fail_pending() -> None:
+            worker.closed = True
+            for future in worker.pending.values():
+                if not future.done():
+                    future.set_result({"error": "worker exited"})
+            worker.pending.clear()
+
+        while True:
+            try:
+                frame = worker.conn.recv_bytes()
+            except (EOFError, OSError):
+                break
+
+            try:
+                worker.loop.call_soon_threadsafe(resolve, json.loads(frame))
+            except RuntimeError:
+                # Event loop closed
+                return
+
+        try:
+            worker.loop.call_soon_threadsafe(fail_pending)
+        except RuntimeError:
+            pass
+
+
+class WorkerAbility(BaseAbility):
+    """
+    Proxy that executes an ability in a worker pool.
+
+    Parameters are validated in the parent against the precomputed
+    metadata before being sent to the worker.
+    """
+
+    def __init__(
+        self, metadata: AbilityMetadata, module_path: str, class_name: str, pool: WorkerPool
+    ) -> None:
+        """
+        Initialize the proxy.
+
+        Args:
+            metadata: Metadata of the real ability
+            module_path: Module defining the ability class
+            class_name: Name of the ability class
+            pool: Worker pool executing the ability
+        """
+        super().__init__()
+        self._metadata = metadata
+        self._module_path = module_path
+        self._class_name = class_name
+        self._pool = pool
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        """Return the real ability's metadata."""
+        return self._metadata
+
+    async def _execute(self, parameters: dict[str, Any], context: AbilityContext) -> AbilityResult:
+        """Send the call to the worker pinned to the user."""
+        return await self._pool.execute(self._module_path, self._class_name, parameters, context)
@@ -366,6 +366,24 @@ async def test_list_notes(notes_ability, context):
     assert list_result.data["count"] == 3
 
 
+@pytest.mark.asyncio
+async def test_list_notes_cache_invalidated_by_archive(notes_ability, context):
+    """Test that cached note lists are refreshed after a write."""
+    create_result = await notes_ability.execute(
+        {"action": "create", "title": "Cached", "content": "Listed once"},
+        context,
+    )
+    first = await notes_ability.execute({"action": "list"}, context)
+    assert await notes_ability.execute({"action": "list"}, context) is first
+
+    await notes_ability.execute(
+        {"action": "archive", "note_id": create_result.data["note_id"]}, context
+    )
+    list_result = await notes_ability.execute({"action": "list"}, context)
+
+    assert list_result.data["count"] == 0
+
+
 @pytest.mark.asyncio
 async def test_archive_note(notes_ability, context):
     """Test archiving a note."""
@@ -1,11 +1,13 @@
 """Tests for timer ability."""
 
 import asyncio
+import time
 
 import pytest
 
 from bruno_abilities.abilities.timer_ability import TimerAbility, TimerState
-from bruno_abilities.base.ability_base import AbilityContext
+from bruno_abilities.base.ability_base import IDEMPOTENCY_KEY, AbilityContext
+from bruno_abilities.infrastructure.state_manager import StateManager
 
 
 @pytest.fixture
@@ -458,3 +460,42 @@ async def test_timer_cleanup(timer_ability, context):
     # Verify all timers are cleared
     assert len(timer_ability._timers) == 0
     assert len(timer_ability._user_timers) == 0
+
+
+@pytest.mark.asyncio
+async def test_create_timer_retry_with_idempotency_key(timer_ability):
+    """Test that retrying a keyed create does not start a second timer."""
+    context = AbilityContext(user_id="retry_user", metadata={IDEMPOTENCY_KEY: "create-1"})
+
+    first = await timer_ability.execute({"action": "create", "duration": 60}, context)
+    retry = await timer_ability.execute({"action": "create", "duration": 60}, context)
+
+    assert retry.data["timer_id"] == first.data["timer_id"]
+    assert len(timer_ability._user_timers["retry_user"]) == 1
+    await timer_ability._cleanup()
+
+
+@pytest.mark.asyncio
+async def test_timer_callback_outlives_request_deadline(timer_ability, tmp_path):
+    """Test that a timer firing after its request's deadline is not bound by it."""
+    state_manager = StateManager(storage_path=tmp_path)
+    context = AbilityContext(user_id="deadline_user", deadline=time.time() + 0.5)
+    create_result = await timer_ability.execute({"action": "create", "duration": 1}, context)
+    timer_id = create_result.data["timer_id"]
+
+    outcomes = []
+
+    async def callback(timer):
+        status = await timer_ability.execute(
+            {"action": "status", "timer_id": timer.timer_id},
+            AbilityContext(user_id="deadline_user"),
+        )
+        await state_manager.set("last_timer", timer.timer_id)
+        outcomes.append(status)
+
+    timer_ability._timers[timer_id].callback = callback
+    await asyncio.sleep(1.5)
+
+    assert len(outcomes) == 1
+    assert outcomes[0].success is True
+    assert await state_manager.get("last_timer") == timer_id
@@ -4,6 +4,7 @@ import pytest
 
 from bruno_abilities.abilities.todo_ability import TodoAbility
 from bruno_abilities.base.ability_base import AbilityContext
+from bruno_abilities.base.metrics import get_metrics
 
 
 @pytest.fixture
@@ -168,6 +169,27 @@ async def test_list_tasks(todo, context):
     assert result.data["tasks"][0]["priority"] == "urgent"
 
 
+@pytest.mark.asyncio
+async def test_list_tasks_cached_until_write(todo, context, other_context):
+    """Test that list results are cached per user and invalidated by writes."""
+    metrics = get_metrics()
+    metrics.reset()
+    await todo.execute({"action": "create", "title": "Task 1"}, context)
+
+    first = await todo.execute({"action": "list"}, context)
+    second = await todo.execute({"action": "LIST"}, context)
+    assert second is first
+    assert metrics.collect()["counters"][("cache_hits", "todo")] == 1
+
+    other = await todo.execute({"action": "list"}, other_context)
+    assert other.data["count"] == 0
+
+    await todo.execute({"action": "create", "title": "Task 2"}, context)
+    result = await todo.execute({"action": "list"}, context)
+    assert result.data["count"] == 2
+    assert metrics.collect()["counters"][("cache_misses", "todo")] == 3
+
+
 @pytest.mark.asyncio
 async def test_list_tasks_with_status_filter(todo, context):
     """Test listing tasks with status filter."""
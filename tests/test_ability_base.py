@@ -1,19 +1,52 @@
 """Tests for the base ability framework."""
 
+import asyncio
+import json
+import time
 from datetime import datetime
 
 import pytest
 
 from bruno_abilities.base.ability_base import (
+    IDEMPOTENCY_KEY,
     AbilityContext,
     AbilityResult,
     BaseAbility,
 )
+from bruno_abilities.base.bulkhead import BulkheadStats
+from bruno_abilities.base.deadline import remaining
+from bruno_abilities.base.idempotency import IdempotencyStore, set_idempotency_store
+from bruno_abilities.base.log_policy import (
+    LEVELS,
+    PolicyLogger,
+    lazy,
+    reload_policies,
+    set_ability_policy,
+)
 from bruno_abilities.base.metadata import (
     AbilityMetadata,
+    CachePolicy,
+    ConcurrencyLimits,
+    LogPolicy,
     ParameterMetadata,
     ParameterType,
 )
+from bruno_abilities.base.metrics import (
+    Histogram,
+    MetricsRegistry,
+    bucket_bounds,
+    bucket_index,
+    get_metrics,
+)
+from bruno_abilities.base.profiler import SamplingProfiler
+from bruno_abilities.base.result_cache import ResultCache, cache_key
+from bruno_abilities.base.tracing import (
+    SpanCollector,
+    inject_trace_context,
+    set_collector,
+    start_span,
+)
+from bruno_abilities.infrastructure.state_manager import StateManager, StateScope
 
 
 class TestAbility(BaseAbility):
@@ -208,3 +241,763 @@ def test_ability_context():
     assert context.user_id == "user123"
     assert context.session_id == "session456"
     assert context.metadata["source"] == "web"
+
+
+class LimitedAbility(BaseAbility):
+    """Ability with bulkhead limits that blocks until released."""
+
+    def __init__(self, limits: ConcurrencyLimits):
+        super().__init__()
+        self.limits = limits
+        self.release = asyncio.Event()
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return AbilityMetadata(
+            name="limited",
+            display_name="Limited",
+            description="Ability with concurrency limits",
+            category="testing",
+            concurrency=self.limits,
+        )
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        await self.release.wait()
+        return AbilityResult(success=True, data=context.user_id)
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_rejects_when_queue_full():
+    """Test per-ability limits with a bounded wait queue."""
+    ability = LimitedAbility(ConcurrencyLimits(max_in_flight=2, max_queue=1))
+    calls = [
+        asyncio.create_task(ability.execute({}, AbilityContext(user_id=f"u{i}"))) for i in range(3)
+    ]
+    await asyncio.sleep(0)
+
+    rejected = await ability.execute({}, AbilityContext(user_id="late"))
+
+    assert not rejected.success
+    assert rejected.metadata["rejected"] is True
+    assert ability.bulkhead_stats.in_flight == 2
+    assert ability.bulkhead_stats.queued == 1
+    assert ability.bulkhead_stats.rejected == 1
+
+    ability.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert all(result.success for result in results)
+    assert ability.bulkhead_stats == BulkheadStats(
+        in_flight=0, queued=0, rejected=1, tracked_users=0
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_limits_each_user_separately():
+    """Test that one user's burst does not block other users."""
+    ability = LimitedAbility(ConcurrencyLimits(max_in_flight_per_user=1))
+    first = asyncio.create_task(ability.execute({}, AbilityContext(user_id="noisy")))
+    await asyncio.sleep(0)
+
+    assert not (await ability.execute({}, AbilityContext(user_id="noisy"))).success
+    other = asyncio.create_task(ability.execute({}, AbilityContext(user_id="quiet")))
+    await asyncio.sleep(0)
+
+    assert ability.bulkhead_stats.tracked_users == 2
+    ability.release.set()
+    assert (await first).success and (await other).success
+    assert ability.bulkhead_stats.tracked_users == 0
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_cancelled_waiter_frees_queue():
+    """Test that cancelling a queued call removes it from the queue."""
+    ability = LimitedAbility(ConcurrencyLimits(max_in_flight=1, max_queue=1))
+    running = asyncio.create_task(ability.execute({}, AbilityContext(user_id="a")))
+    await asyncio.sleep(0)
+    queued = asyncio.create_task(ability.execute({}, AbilityContext(user_id="b")))
+    await asyncio.sleep(0)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    assert ability.bulkhead_stats.queued == 0
+    ability.release.set()
+    assert (await running).success
+    assert ability.bulkhead_stats.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_no_bulkhead_without_limits():
+    """Test that abilities without limits have no bulkhead."""
+    ability = TestAbility()
+    await ability.execute({"message": "hi"}, AbilityContext(user_id="u1"))
+
+    assert ability.bulkhead_stats is None
+
+
+def test_histogram_buckets_bound_relative_error():
+    """Test that histogram buckets stay within 12.5% of the recorded value."""
+    for value in (0, 1, 15, 16, 17, 1000, 123_456, 10**9, 3 * 10**12):
+        lower, upper = bucket_bounds(bucket_index(value))
+        assert lower <= value < upper
+        assert upper - lower <= max(1, value / 8)
+
+
+def test_histogram_quantiles():
+    """Test histogram quantile estimates."""
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(value * 1000)
+
+    assert histogram.count == 1000
+    assert histogram.max == 1_000_000
+    assert histogram.quantile(0.5) == pytest.approx(500_000, rel=0.07)
+    assert histogram.quantile(0.99) == pytest.approx(990_000, rel=0.07)
+    assert histogram.quantile(1.0) <= 1_000_000
+    assert Histogram().quantile(0.5) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_execute_records_metrics():
+    """Test that execute records latency by action and outcome."""
+    metrics = get_metrics()
+    metrics.reset()
+    ability = TestAbility()
+    context = AbilityContext(user_id="u1")
+
+    await ability.execute({"message": "hi", "action": "Echo"}, context)
+    await ability.execute({}, context)
+
+    ok = metrics.histogram("test_ability", "echo", "success")
+    assert ok is not None and ok.count == 1
+    assert metrics.histogram("test_ability", "", "invalid").count == 1
+    assert metrics.collect()["counters"] == {("validation_failures", "test_ability"): 1}
+
+
+@pytest.mark.asyncio
+async def test_execute_records_rejections():
+    """Test that bulkhead rejections are counted."""
+    metrics = get_metrics()
+    metrics.reset()
+    ability = LimitedAbility(ConcurrencyLimits(max_in_flight=1, max_queue=1))
+    context = AbilityContext(user_id="u1")
+
+    tasks = [asyncio.create_task(ability.execute({}, context)) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    ability.release.set()
+    await asyncio.gather(*tasks)
+
+    assert metrics.histogram("limited", "", "rejected").count == 1
+    assert metrics.collect()["counters"][("rejections", "limited")] == 1
+
+
+def test_metrics_series_limit():
+    """Test that label sets beyond the limit are folded together."""
+    metrics = MetricsRegistry(max_series=2)
+    for action in ("a", "b", "c", "d"):
+        metrics.observe("x", action, "success", 100)
+
+    assert metrics.histogram("x", "c", "success") is None
+    assert metrics.histogram("x", "other", "success").count == 2
+
+
+def test_metrics_gauges_are_weak():
+    """Test that gauges of collected owners stop reporting."""
+
+    class Owner:
+        def __init__(self, value):
+            self.value = value
+
+        def read(self):
+            return self.value
+
+    metrics = MetricsRegistry()
+    first, second = Owner(2), Owner(3)
+    metrics.register_gauge("things", first.read, "Things")
+    metrics.register_gauge("things", second.read)
+    assert metrics.collect()["gauges"] == {"things": 5}
+
+    del second
+    assert metrics.collect()["gauges"] == {"things": 2}
+
+
+def test_metrics_render_prometheus():
+    """Test the Prometheus exposition output."""
+    metrics = MetricsRegistry()
+    metrics.observe("timer", "create", "success", 1500)
+    metrics.observe("timer", "create", "success", 2_000_000)
+    metrics.increment("errors", "timer")
+    metrics.register_gauge("active_timers", lambda: 4, "Timers running or paused")
+
+    text = metrics.render_prometheus()
+
+    labels = 'ability="timer",action="create",outcome="success"'
+    assert "# TYPE bruno_ability_duration_seconds histogram" in text
+    assert f'bruno_ability_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"bruno_ability_duration_seconds_count{{{labels}}} 2" in text
+    assert 'bruno_ability_errors_total{ability="timer"} 1' in text
+    assert "bruno_active_timers 4.0" in text
+
+
+@pytest.fixture
+def collector():
+    """Span collector installed for the duration of a test."""
+    collector = SpanCollector()
+    set_collector(collector)
+    yield collector
+    set_collector(None)
+
+
+def test_tracing_disabled_by_default():
+    """Test that spans are no-ops without a collector."""
+    with start_span("noop") as span:
+        span.set_attribute("key", "value")
+
+    assert not span.is_recording
+
+
+@pytest.mark.asyncio
+async def test_execute_records_span_tree(collector):
+    """Test that execute records nested spans for its phases."""
+    ability = TestAbility()
+
+    await ability.execute({"message": "hi", "action": "echo"}, AbilityContext(user_id="u1"))
+
+    (spans,) = collector.traces().values()
+    assert [span.name for span in spans] == ["ability.execute", "ability.validate", "ability.run"]
+    root = spans[0]
+    assert root.parent_id is None
+    assert all(span.parent_id == root.context.span_id for span in spans[1:])
+    assert root.attributes == {
+        "ability.name": "test_ability",
+        "ability.action": "echo",
+        "ability.outcome": "success",
+    }
+
+
+@pytest.mark.asyncio
+async def test_execute_continues_trace_from_metadata(collector):
+    """Test that a traceparent in the context metadata becomes the parent."""
+    ability = TestAbility()
+    with start_span("caller") as caller:
+        metadata = {}
+        inject_trace_context(metadata)
+    collector.clear()
+
+    await ability.execute({"message": "hi"}, AbilityContext(user_id="u1", metadata=metadata))
+
+    root = collector.spans()[-1]
+    assert root.name == "ability.execute"
+    assert root.context.trace_id == caller.context.trace_id
+    assert root.parent_id == caller.context.span_id
+
+
+@pytest.mark.asyncio
+async def test_failed_validation_marks_span(collector):
+    """Test that an exception escaping a span is recorded as its error."""
+    ability = TestAbility()
+
+    await ability.execute({}, AbilityContext(user_id="u1"))
+
+    validate = next(span for span in collector.spans() if span.name == "ability.validate")
+    assert validate.error is not None
+
+
+def test_span_collector_is_bounded_and_exports_otlp(collector, tmp_path):
+    """Test the ring buffer and OTLP/JSON export."""
+    bounded = SpanCollector(capacity=2)
+    set_collector(bounded)
+    for name in ("a", "b", "c"):
+        with start_span(name, {"count": 1, "ok": True}):
+            pass
+    assert [span.name for span in bounded.spans()] == ["b", "c"]
+
+    path = tmp_path / "traces.jsonl"
+    assert bounded.export(path) == 2
+    assert bounded.spans() == []
+
+    (line,) = path.read_text().splitlines()
+    spans = json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["b", "c"]
+    assert spans[0]["attributes"] == [
+        {"key": "count", "value": {"intValue": "1"}},
+        {"key": "ok", "value": {"boolValue": True}},
+    ]
+    assert len(spans[0]["traceId"]) == 32 and "parentSpanId" not in spans[0]
+
+
+class BusyAbility(BaseAbility):
+    """Ability burning CPU for the profiler tests."""
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return AbilityMetadata(
+            name="busy",
+            display_name="Busy",
+            description="Spins for a while",
+            category="testing",
+        )
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        return AbilityResult(success=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["signal", "thread"])
+async def test_profiler_attributes_samples_to_ability(mode, tmp_path):
+    """Test that samples are attributed to the executing ability and action."""
+    profiler = SamplingProfiler(interval=0.005, mode=mode)
+    profiler.start()
+    try:
+        assert profiler.mode == mode
+        await BusyAbility().execute({"action": "Spin"}, AbilityContext(user_id="u1"))
+    finally:
+        profiler.stop()
+
+    assert not profiler.running
+    counts = profiler.by_ability()
+    assert counts.get("[busy:spin]", 0) > 10
+
+    folded = profiler.folded(ability="busy")
+    lines = folded.splitlines()
+    assert lines and all(line.startswith("[busy:spin];") for line in lines)
+    assert any("BusyAbility._execute" in line for line in lines)
+    _, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+
+    assert profiler.dump(tmp_path / "busy.folded", ability="busy") == len(lines)
+
+
+def test_profiler_caps_distinct_stacks():
+    """Test that stacks beyond max_stacks are counted as truncated."""
+    profiler = SamplingProfiler(max_stacks=1)
+    profiler._record("[a]", ())
+    profiler._record("[b]", ())
+
+    assert profiler.by_ability() == {"[a]": 1, "[truncated]": 1}
+    profiler.reset()
+    assert profiler.samples == 0
+
+
+class RecordingLogger:
+    """Stand-in for the structlog logger behind a PolicyLogger."""
+
+    def __init__(self):
+        self.events = []
+
+    def __getattr__(self, method):
+        return lambda event, **fields: self.events.append((method, event, fields))
+
+
+@pytest.fixture
+def policy_logger():
+    """Policy logger for a 'logged' ability, recording emitted events."""
+    logger = PolicyLogger("test", ability="logged")
+    logger._logger = RecordingLogger()
+    yield logger
+    set_ability_policy("logged", None)
+
+
+def test_log_policy_level_skips_field_evaluation(policy_logger):
+    """Test that events below the level are dropped without evaluating fields."""
+    set_ability_policy("logged", LogPolicy(level="warning"))
+    evaluated = []
+
+    policy_logger.info("Dropped", value=lazy(lambda: evaluated.append(1)))
+    assert evaluated == []
+    assert not policy_logger.is_enabled("info")
+
+    policy_logger.warning("Kept", value=lazy(lambda: "computed"))
+    assert policy_logger._logger.events == [("warning", "Kept", {"value": "computed"})]
+
+
+def test_log_policy_sampling(policy_logger):
+    """Test that sampling drops debug/info events but never warnings."""
+    set_ability_policy("logged", LogPolicy(sample_rate=0.0))
+    for _ in range(20):
+        policy_logger.info("Sampled out")
+    policy_logger.error("Always logged")
+    assert [event for _, event, _ in policy_logger._logger.events] == ["Always logged"]
+
+    set_ability_policy("logged", LogPolicy(sample_rate=0.5))
+    for _ in range(200):
+        policy_logger.info("Sampled")
+    sampled = policy_logger._logger.events[1:]
+    assert 0 < len(sampled) < 200
+    assert all(fields == {"sample_rate": 0.5} for _, _, fields in sampled)
+
+
+def test_log_policy_redacts_and_truncates(policy_logger):
+    """Test that emitted fields are redacted and size-capped."""
+    set_ability_policy("logged", LogPolicy(max_field_length=16, max_items=2))
+    parameters = {"password": "hunter2", "note": "x" * 40}
+
+    policy_logger.info("Executing", parameters=parameters, token="abc", items=[1, 2, 3])
+
+    _, _, fields = policy_logger._logger.events[0]
+    assert fields["token"] == "[redacted]"
+    assert fields["parameters"]["password"] == "[redacted]"
+    assert fields["parameters"]["note"] == "x" * 16 + "...(+24 chars)"
+    assert fields["items"] == [1, 2, "...(+1 items)"]
+    assert parameters["password"] == "hunter2"  # Caller's dict is untouched
+
+
+def test_log_policy_environment_overrides_metadata(policy_logger, monkeypatch):
+    """Test that per-ability environment variables take precedence."""
+    set_ability_policy("logged", LogPolicy(level="debug"))
+    monkeypatch.setenv("BRUNO_LOG_LEVEL", "info")
+    monkeypatch.setenv("BRUNO_LOG_LEVEL_LOGGED", "error")
+    set_ability_policy("logged", LogPolicy(level="debug"))  # Re-resolve
+
+    assert policy_logger.is_enabled("error")
+    assert not policy_logger.is_enabled("warning")
+
+
+def test_log_policy_ignores_malformed_environment(policy_logger, monkeypatch):
+    """Test that invalid environment values fall back to the defaults."""
+    monkeypatch.setenv("BRUNO_LOG_LEVEL", "verbose")
+    monkeypatch.setenv("BRUNO_LOG_SAMPLE_RATE", "often")
+    reload_policies()
+
+    assert policy_logger.policy.level == LEVELS["info"]
+    assert policy_logger.policy.sample_rate == 1.0
+    policy_logger.info("Still logged")
+    assert [event for _, event, _ in policy_logger._logger.events] == ["Still logged"]
+
+
+def test_log_policy_clamps_sample_rate(policy_logger, monkeypatch):
+    """Test that sample rates from the environment are clamped to [0, 1]."""
+    monkeypatch.setenv("BRUNO_LOG_SAMPLE_RATE", "5")
+    reload_policies()
+    assert policy_logger.policy.sample_rate == 1.0
+
+    monkeypatch.setenv("BRUNO_LOG_SAMPLE_RATE", "-1")
+    reload_policies()
+    assert policy_logger.policy.sample_rate == 0.0
+
+
+@pytest.mark.asyncio
+async def test_malformed_log_environment_does_not_break_execute(monkeypatch):
+    """Test that abilities keep working with an invalid logging variable."""
+    monkeypatch.setenv("BRUNO_LOG_LEVEL", "verbose")
+    reload_policies()
+
+    result = await TestAbility().execute({"message": "hi"}, AbilityContext(user_id="u1"))
+
+    assert result.success is True
+
+
+@pytest.mark.asyncio
+async def test_ability_applies_metadata_log_policy():
+    """Test that execute logs through the policy declared in the metadata."""
+
+    class QuietAbility(TestAbility):
+        @property
+        def metadata(self) -> AbilityMetadata:
+            metadata = super().metadata
+            metadata.name = "quiet"
+            metadata.logging = LogPolicy(level="error")
+            return metadata
+
+    ability = QuietAbility()
+    ability._logger._logger = RecordingLogger()
+    try:
+        await ability.execute({"message": "hi"}, AbilityContext(user_id="u1"))
+        await ability.execute({}, AbilityContext(user_id="u1"))
+    finally:
+        set_ability_policy("quiet", None)
+
+    assert ability._logger.ability == "quiet"
+    assert [event for _, event, _ in ability._logger._logger.events] == ["Ability validation error"]
+
+
+def test_result_cache_lru_and_generations():
+    """Test LRU eviction and generation-based invalidation."""
+    cache = ResultCache(["list"], max_entries=2)
+    result = AbilityResult(success=True)
+
+    for name in ("a", "b"):
+        cache.put("u1", name, cache.generation("u1"), result)
+    assert cache.get("u1", "a") is result  # "b" is now least recently used
+    cache.put("u1", "c", cache.generation("u1"), result)
+    assert cache.get("u1", "b") is None
+    assert len(cache) == 2
+
+    # A result computed before an invalidation is not stored
+    generation = cache.generation("u1")
+    cache.invalidate("u1")
+    cache.put("u1", "d", generation, result)
+    assert cache.get("u1", "a") is None
+    assert cache.get("u1", "d") is None
+
+    assert cache_key({"action": "List", "b": 1, "a": [1]}) == cache_key(
+        {"a": [1], "action": "list", "b": 1}
+    )
+
+
+class CoalescingAbility(BaseAbility):
+    """Ability sharing identical concurrent calls, blocking until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        self.runs = 0
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return AbilityMetadata(
+            name="coalescing",
+            display_name="Coalescing",
+            description="Ability with request coalescing",
+            category="testing",
+            cache=CachePolicy(read_actions=["search"], max_entries=1, ttl=1e-9),
+            coalesce=True,
+        )
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        self.runs += 1
+        await self.release.wait()
+        return AbilityResult(success=True, data=context.user_id)
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_reads_are_coalesced():
+    """Test that one execution serves identical concurrent read calls."""
+    metrics = get_metrics()
+    metrics.reset()
+    ability = CoalescingAbility()
+    context = AbilityContext(user_id="u1")
+
+    calls = [
+        asyncio.create_task(ability.execute({"action": "search", "q": "x"}, context))
+        for _ in range(3)
+    ]
+    other_user = asyncio.create_task(
+        ability.execute({"action": "search", "q": "x"}, AbilityContext(user_id="u2"))
+    )
+    await asyncio.sleep(0)
+    ability.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert results[0] is results[1] is results[2]
+    assert results[0].data == "u1"
+    assert (await other_user).data == "u2"
+    assert ability.runs == 2
+    assert metrics.collect()["counters"][("coalesced", "coalescing")] == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_coalesced_only_with_idempotency_key():
+    """Test that write actions need an idempotency key to be shared."""
+    ability = CoalescingAbility()
+    plain = AbilityContext(user_id="u1")
+    keyed = AbilityContext(user_id="u1", metadata={IDEMPOTENCY_KEY: "k1"})
+
+    calls = [
+        asyncio.create_task(ability.execute({"action": "create"}, context))
+        for context in (plain, plain, keyed, keyed)
+    ]
+    await asyncio.sleep(0)
+    ability.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert ability.runs == 3
+    assert results[2] is results[3]
+
+
+@pytest.mark.asyncio
+async def test_coalesced_waiter_runs_when_leader_is_cancelled():
+    """Test that cancelling the shared execution does not fail its waiters."""
+    ability = CoalescingAbility()
+    context = AbilityContext(user_id="u1")
+
+    leader = asyncio.create_task(ability.execute({"action": "search"}, context))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(ability.execute({"action": "search"}, context))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    ability.release.set()
+
+    assert (await waiter).success
+    assert ability.runs == 2
+    assert leader.cancelled()
+
+
+@pytest.fixture
+def idempotency_store():
+    """Fresh global idempotency store."""
+    store = IdempotencyStore()
+    set_idempotency_store(store)
+    yield store
+    set_idempotency_store(None)
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_replays_stored_result(idempotency_store):
+    """Test that a retried keyed write returns the first result without running."""
+    metrics = get_metrics()
+    metrics.reset()
+    ability = CoalescingAbility()
+    ability.release.set()
+    context = AbilityContext(user_id="u1", metadata={IDEMPOTENCY_KEY: "k1"})
+
+    first = await ability.execute({"action": "create"}, context)
+    retry = await ability.execute({"action": "create"}, context)
+
+    assert ability.runs == 1
+    assert retry.data == first.data
+    assert retry.metadata["idempotent_replay"] is True
+    assert metrics.collect()["counters"][("idempotent_replays", "coalescing")] == 1
+
+    other_user = AbilityContext(user_id="u2", metadata={IDEMPOTENCY_KEY: "k1"})
+    await ability.execute({"action": "create"}, other_user)
+    assert ability.runs == 2
+
+    # Read-only actions ignore the key
+    await ability.execute({"action": "search"}, context)
+    await ability.execute({"action": "search"}, context)
+    assert ability.runs == 4
+
+
+@pytest.mark.asyncio
+async def test_idempotency_key_reused_with_other_parameters(idempotency_store):
+    """Test that a key cannot be replayed for different parameters."""
+    ability = TestAbility()
+    context = AbilityContext(user_id="u1", metadata={IDEMPOTENCY_KEY: "k1"})
+
+    assert (await ability.execute({"message": "one"}, context)).success
+    result = await ability.execute({"message": "two"}, context)
+
+    assert not result.success
+    assert "different parameters" in result.error
+
+
+@pytest.mark.asyncio
+async def test_concurrent_key_reuse_with_other_parameters(idempotency_store):
+    """Test that a key in flight rejects calls with different parameters."""
+    ability = CoalescingAbility()
+    context = AbilityContext(user_id="u1", metadata={IDEMPOTENCY_KEY: "k1"})
+
+    first = asyncio.create_task(ability.execute({"action": "create", "n": 1}, context))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(ability.execute({"action": "create", "n": 2}, context))
+    await asyncio.sleep(0)
+    ability.release.set()
+    first, second = await asyncio.gather(first, second)
+
+    assert first.success
+    assert not second.success
+    assert "different parameters" in second.error
+    assert ability.runs == 1
+    assert (await idempotency_store.get("coalescing", "u1", "k1")).fingerprint == cache_key(
+        {"action": "create", "n": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test_idempotency_store_bounds_and_persistence(tmp_path):
+    """Test eviction, expiry and reloading records from the state manager."""
+    result = AbilityResult(success=True, data={"timer_id": "t1"})
+
+    bounded = IdempotencyStore(max_entries=1)
+    await bounded.put("a", "u1", "k1", "{}", result)
+    await bounded.put("a", "u1", "k2", "{}", result)
+    assert len(bounded) == 1
+    assert await bounded.get("a", "u1", "k1") is None
+
+    expired = IdempotencyStore(ttl=0)
+    await expired.put("a", "u1", "k1", "{}", result)
+    assert await expired.get("a", "u1", "k1") is None
+
+    await IdempotencyStore(state_manager=StateManager(storage_path=tmp_path)).put(
+        "a", "u1", "k1", "{}", result
+    )
+    reloaded = IdempotencyStore(state_manager=StateManager(storage_path=tmp_path))
+    record = await reloaded.get("a", "u1", "k1")
+    assert record is not None
+    assert record.result.data == {"timer_id": "t1"}
+
+
+@pytest.mark.asyncio
+async def test_idempotency_store_deletes_persisted_records(tmp_path):
+    """Test that persisted records are deleted on eviction and once expired."""
+    manager = StateManager(storage_path=tmp_path)
+    result = AbilityResult(success=True)
+
+    async def persisted_keys():
+        return [key async for key, _ in manager.scan("idempotency:", scope=StateScope.USER)]
+
+    bounded = IdempotencyStore(max_entries=1, state_manager=manager)
+    await bounded.put("a", "u1", "k1", "{}", result)
+    await bounded.put("a", "u1", "k2", "{}", result)
+    assert len(await persisted_keys()) == 1
+    await bounded.discard("a", "u1", "k2")
+
+    # Expired records are swept on a later put, without looking them up
+    expiring = IdempotencyStore(ttl=0.05, state_manager=manager, sweep_interval=0)
+    await expiring.put("a", "u1", "old", "{}", result)
+    await asyncio.sleep(0.1)
+    await expiring.put("a", "u2", "new", "{}", result)
+    await expiring._sweep_task
+
+    assert len(await persisted_keys()) == 1
+    assert await expiring.get("a", "u2", "new") is not None
+
+
+@pytest.mark.asyncio
+async def test_idempotency_store_hashes_persisted_keys(tmp_path):
+    """Test that client-supplied keys cannot escape the state directory."""
+    storage = tmp_path / "state"
+    result = AbilityResult(success=True)
+
+    store = IdempotencyStore(state_manager=StateManager(storage_path=storage))
+    await store.put("a", "u1", "../../../../x", "{}", result)
+
+    reloaded = IdempotencyStore(state_manager=StateManager(storage_path=storage))
+    assert await reloaded.get("a", "u1", "../../../../x") is not None
+    files = [path for path in tmp_path.rglob("*") if path.is_file()]
+    assert files
+    assert all(storage in path.parents and ".." not in path.name for path in files)
+
+
+@pytest.mark.asyncio
+async def test_execute_fails_fast_past_deadline():
+    """Test that an exhausted deadline fails the request without running it."""
+    metrics = get_metrics()
+    metrics.reset()
+    ability = LimitedAbility(ConcurrencyLimits())
+    context = AbilityContext(user_id="u1", deadline=time.time() - 1)
+
+    assert context.remaining() < 0
+    result = await ability.execute({}, context)
+
+    assert not result.success
+    assert result.metadata["deadline_exceeded"] is True
+    assert metrics.collect()["counters"] == {("deadline_exceeded", "limited"): 1}
+
+
+@pytest.mark.asyncio
+async def test_execute_stops_at_deadline():
+    """Test that execute returns once the deadline passes and exposes it to nested code."""
+    seen = []
+
+    class DeadlineAbility(LimitedAbility):
+        async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+            seen.append(remaining())
+            return await super()._execute(parameters, context)
+
+    ability = DeadlineAbility(ConcurrencyLimits())
+    started = time.monotonic()
+    result = await ability.execute({}, AbilityContext(user_id="u1", deadline=time.time() + 0.05))
+
+    assert not result.success
+    assert result.error == "Deadline exceeded"
+    assert time.monotonic() - started < 1.0
+    assert 0 < seen[0] <= 0.05
+    assert remaining() is None
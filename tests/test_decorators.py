@@ -1,10 +1,21 @@
 """Tests for decorators."""
 
 import asyncio
+import time
 
 import pytest
 
-from bruno_abilities.base.decorators import rate_limit, retry, timeout
+from bruno_abilities.base.deadline import DeadlineExceededError, deadline_scope
+from bruno_abilities.base.decorators import (
+    CircuitOpenError,
+    CircuitState,
+    RateLimiter,
+    RetryBudget,
+    circuit_breaker,
+    rate_limit,
+    retry,
+    timeout,
+)
 
 
 @pytest.mark.asyncio
@@ -58,6 +69,121 @@ async def test_retry_all_fail():
     assert call_count == 3
 
 
+@pytest.mark.asyncio
+async def test_retry_gives_up_before_exceeding_time_budget():
+    """Test that retry raises instead of sleeping past its time budget."""
+    call_count = 0
+
+    @retry(max_attempts=5, delay=1.0, jitter=False, time_budget=0.5)
+    async def always_fails():
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Always fails")
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    with pytest.raises(ValueError):
+        await always_fails()
+
+    assert call_count == 1
+    assert loop.time() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_retry_budget_is_shared():
+    """Test that an exhausted retry budget stops retries across functions."""
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2)
+    calls = []
+
+    @retry(max_attempts=3, delay=0.001, budget=budget)
+    async def first():
+        calls.append("first")
+        raise ValueError("fails")
+
+    @retry(max_attempts=3, delay=0.001, budget=budget)
+    async def second():
+        calls.append("second")
+        raise ValueError("fails")
+
+    for func in (first, second):
+        with pytest.raises(ValueError):
+            await func()
+
+    assert calls == ["first", "first", "first", "second"]
+    assert budget.tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_opens_and_recovers():
+    """Test closed -> open -> half-open -> closed transitions."""
+    healthy = False
+
+    @circuit_breaker(failure_rate=0.5, window=10.0, min_calls=4, reset_timeout=0.05)
+    async def backend():
+        if not healthy:
+            raise ConnectionError("down")
+        return "ok"
+
+    breaker = backend.breaker
+    for _ in range(4):
+        with pytest.raises(ConnectionError):
+            await backend()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError) as error:
+        await backend()
+    assert error.value.retry_after <= 0.05
+
+    await asyncio.sleep(0.06)
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(ConnectionError):
+        await backend()  # Failed probe reopens the circuit
+    assert breaker.state == CircuitState.OPEN
+
+    await asyncio.sleep(0.06)
+    healthy = True
+    assert await backend() == "ok"
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.counts == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_uses_failure_rate():
+    """Test that occasional failures below the rate keep the circuit closed."""
+    outcomes = iter([True, True, False] * 4)
+
+    @circuit_breaker(failure_rate=0.5, min_calls=4)
+    async def backend():
+        if not next(outcomes):
+            raise ConnectionError("down")
+
+    for _ in range(12):
+        try:
+            await backend()
+        except ConnectionError:
+            pass
+
+    assert backend.breaker.state == CircuitState.CLOSED
+    assert backend.breaker.counts == (8, 4)
+
+
+@pytest.mark.asyncio
+async def test_retry_does_not_retry_open_circuit():
+    """Test that retry gives up immediately on an open circuit."""
+    call_count = 0
+
+    @retry(max_attempts=3, delay=0.001)
+    @circuit_breaker(min_calls=1, reset_timeout=60.0)
+    async def backend():
+        nonlocal call_count
+        call_count += 1
+        raise ConnectionError("down")
+
+    with pytest.raises(CircuitOpenError):
+        await backend()
+    assert call_count == 1
+
+
 @pytest.mark.asyncio
 async def test_timeout_success():
     """Test timeout decorator with successful execution."""
@@ -127,3 +253,66 @@ async def test_rate_limit_different_keys():
     assert result2 == "done-user2"
     assert result3 == "done-user1"
     assert result4 == "done-user2"
+
+
+@pytest.mark.asyncio
+async def test_timeout_shortened_to_deadline():
+    """Test that timeout stops at the request deadline when it comes first."""
+
+    @timeout(10.0)
+    async def slow_function():
+        await asyncio.sleep(1.0)
+
+    with deadline_scope(time.time() + 0.05):
+        with pytest.raises(DeadlineExceededError):
+            await slow_function()
+
+    with deadline_scope(time.time() - 1):
+        with pytest.raises(DeadlineExceededError):
+            await slow_function()
+
+
+@pytest.mark.asyncio
+async def test_retry_honors_deadline():
+    """Test that retry fails fast instead of sleeping past the deadline."""
+    call_count = 0
+
+    @retry(max_attempts=5, delay=1.0, jitter=False)
+    async def always_fails():
+        nonlocal call_count
+        call_count += 1
+        raise ValueError("Always fails")
+
+    started = time.monotonic()
+    with deadline_scope(time.time() + 0.5):
+        with pytest.raises(ValueError):
+            await always_fails()
+
+    assert call_count == 1
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_does_not_sleep_past_deadline():
+    """Test that a rate limit wait longer than the time left fails immediately."""
+    limiter = RateLimiter(max_calls=1, time_window=60.0)
+    await limiter.acquire("user123")
+
+    started = time.monotonic()
+    with deadline_scope(time.time() + 1.0):
+        with pytest.raises(DeadlineExceededError):
+            await limiter.acquire("user123")
+
+    assert time.monotonic() - started < 0.5
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_rejects_past_deadline():
+    """Test that no token is granted once the deadline has passed."""
+    limiter = RateLimiter(max_calls=5, time_window=60.0)
+
+    with deadline_scope(time.time() - 1):
+        with pytest.raises(DeadlineExceededError):
+            await limiter.acquire("user123")
+
+    assert limiter.calls["user123"] == []
@@ -0,0 +1,713 @@
+"""Tests for the ability registry."""
+
+import asyncio
+import importlib.metadata
+import json
+import sys
+
+import pytest
+
+from bruno_abilities.abilities.todo_ability import TodoAbility
+from bruno_abilities.base.ability_base import AbilityContext, AbilityResult, BaseAbility
+from bruno_abilities.base.metadata import AbilityMetadata
+from bruno_abilities.registry.discovery import AbilityDiscovery
+from bruno_abilities.registry.discovery_cache import CachedAbility, DiscoveryCache
+from bruno_abilities.registry.lazy import LazyAbility
+from bruno_abilities.registry.lifecycle import LifecycleManager
+from bruno_abilities.registry.registry import AbilityRegistry
+from bruno_abilities.registry.search_index import AbilitySearchIndex
+from bruno_abilities.registry.workers import WorkerAbility, WorkerPool
+
+
+class StubAbility(BaseAbility):
+    """Ability with configurable metadata for registry tests."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str = "Stub ability",
+        category: str = "testing",
+        tags: list[str] | None = None,
+        aliases: list[str] | None = None,
+    ) -> None:
+        super().__init__()
+        self._metadata = AbilityMetadata(
+            name=name,
+            display_name=name.title(),
+            description=description,
+            category=category,
+            tags=tags or [],
+            aliases=aliases or [],
+        )
+
+    @property
+    def metadata(self) -> AbilityMetadata:
+        return self._metadata
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        return AbilityResult(success=True, data={"ability": self._metadata.name})
+
+
+@pytest.fixture
+async def registry():
+    """Registry with a few stub abilities."""
+    registry = AbilityRegistry()
+    await registry.register(
+        StubAbility("timer", "Countdown timers", tags=["time"], aliases=["countdown"])
+    )
+    await registry.register(
+        StubAbility("alarm", "Wake up at a time", tags=["time", "timer"], aliases=["wake me"])
+    )
+    await registry.register(StubAbility("notes", "Take notes, set a timer reminder"))
+    return registry
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_by_field(registry):
+    """Test that name matches outrank tag and description matches."""
+    results = [ability.metadata.name for ability in registry.search("timer")]
+
+    assert results == ["timer", "alarm", "notes"]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_metadata_semantics(registry):
+    """Test that indexed search finds the same abilities as matches_query."""
+    for query in ["t", "ti", "wake", "COUNT", "set a", "zzz", ""]:
+        expected = {
+            ability.metadata.name
+            for ability in registry._abilities.values()
+            if ability.metadata.matches_query(query)
+        }
+        found = {ability.metadata.name for ability in registry.search(query)}
+        assert found == expected, query
+
+
+@pytest.mark.asyncio
+async def test_search_limit_and_enabled_only(registry):
+    """Test result limits and disabled abilities."""
+    await registry.disable("timer")
+
+    assert len(registry.search("timer", limit=1)) == 1
+    assert [a.metadata.name for a in registry.search("timer", enabled_only=True)] == [
+        "alarm",
+        "notes",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_index_cleared_on_unregister(registry):
+    """Test that unregistered abilities leave the index."""
+    await registry.unregister("timer")
+
+    assert [a.metadata.name for a in registry.search("countdown")] == []
+
+
+def test_search_index_reindex_replaces_entry():
+    """Test that re-adding an ability drops its old fields."""
+    index = AbilitySearchIndex()
+    index.add(StubAbility("music", aliases=["songs"]).metadata)
+    index.add(StubAbility("music", aliases=["tunes"]).metadata)
+
+    assert index.search("songs") == []
+    assert [name for name, _ in index.search("tunes")] == ["music"]
+    assert len(index) == 1
+
+
+@pytest.mark.asyncio
+async def test_function_schema_bundle_cached_until_change(registry):
+    """Test that schema bundles are reused until the registry changes."""
+    bundle = registry.get_function_schemas()
+
+    assert [schema["name"] for schema in bundle.schemas] == ["alarm", "notes", "timer"]
+    assert json.loads(bundle.payload) == list(bundle.schemas)
+    assert registry.get_function_schemas() is bundle
+
+    await registry.disable("timer")
+    changed = registry.get_function_schemas()
+
+    assert changed.etag != bundle.etag
+    assert [schema["name"] for schema in changed.schemas] == ["alarm", "notes"]
+
+    await registry.enable("timer")
+
+    assert registry.get_function_schemas().etag == bundle.etag
+
+
+@pytest.mark.asyncio
+async def test_function_schema_bundle_filters(registry):
+    """Test bundles for category and tag filters."""
+    await registry.register(StubAbility("weather", category="info"))
+
+    assert [s["name"] for s in registry.get_function_schemas(category="info").schemas] == [
+        "weather"
+    ]
+    assert [s["name"] for s in registry.get_function_schemas(tag="TIME").schemas] == [
+        "alarm",
+        "timer",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_resolves_near_misses(registry):
+    """Test fuzzy resolution of separators, plurals and typos."""
+    await registry.register(StubAbility("todo", aliases=["task", "todo list"]))
+
+    assert registry.get("set_timer", fuzzy=True) is None
+    await registry.register(StubAbility("reminder", aliases=["set timer"]))
+
+    assert registry.get("set_timer", fuzzy=True).metadata.name == "reminder"
+    assert registry.get("timers", fuzzy=True).metadata.name == "timer"
+    assert registry.get("Todo-List", fuzzy=True).metadata.name == "todo"
+    assert registry.get("alrm", fuzzy=True).metadata.name == "alarm"
+    assert registry.get("weather", fuzzy=True) is None
+
+
+@pytest.mark.asyncio
+async def test_get_is_exact_by_default(registry):
+    """Test that near misses do not silently resolve to another ability."""
+    assert registry.get("timer").metadata.name == "timer"
+    assert registry.get("Countdown").metadata.name == "timer"
+    assert registry.get("timers") is None
+    assert registry.get("node") is None
+    assert registry.resolve("node").name == "notes"
+
+
+@pytest.mark.asyncio
+async def test_resolve_reports_confidence(registry):
+    """Test that confidence drops as matches get less exact."""
+    exact = registry.resolve("countdown")
+    normalized = registry.resolve("count_downs")
+    typo = registry.resolve("countdwn")
+
+    assert exact.name == normalized.name == typo.name == "timer"
+    assert exact.confidence == 1.0
+    assert 1.0 > normalized.confidence > typo.confidence > 0.5
+    assert registry.resolve("xyz") is None
+
+
+@pytest.mark.asyncio
+async def test_resolver_forgets_unregistered(registry):
+    """Test that cached resolutions are dropped on unregister."""
+    assert registry.resolve("timers").name == "timer"
+
+    await registry.unregister("timer")
+
+    assert registry.resolve("timers") is None
+
+
+@pytest.mark.asyncio
+async def test_list_abilities_reuses_snapshot_views(registry):
+    """Test that listings are shared until the registry changes."""
+    snapshot = registry.snapshot
+    enabled = registry.list_abilities(enabled_only=True)
+
+    assert enabled == ["alarm", "notes", "timer"]
+    enabled.append("caller-owned")  # Callers get their own list
+    assert registry.list_abilities(enabled_only=True) == ["alarm", "notes", "timer"]
+    assert snapshot.list_names(enabled_only=True) is snapshot.list_names(enabled_only=True)
+    assert snapshot.list_names(tag="TIME") is snapshot.list_names(tag="time")
+
+    await registry.disable("alarm")
+
+    assert registry.list_abilities(enabled_only=True) == ["notes", "timer"]
+    assert registry.list_abilities(tag="time", enabled_only=True) == ["timer"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_is_immutable_and_consistent(registry):
+    """Test that a held snapshot is unaffected by later changes."""
+    snapshot = registry.snapshot
+
+    await registry.unregister("timer")
+    await registry.register(StubAbility("weather", category="info"))
+
+    assert snapshot.names == ("alarm", "notes", "timer")
+    assert snapshot.get("countdown").metadata.name == "timer"
+    assert registry.snapshot.names == ("alarm", "notes", "weather")
+    assert registry.snapshot.version > snapshot.version
+    with pytest.raises(TypeError):
+        snapshot.abilities["other"] = None
+
+
+class TimedAbility(StubAbility):
+    """Stub ability recording when it initializes and cleans up."""
+
+    def __init__(self, name: str, events: list[str], delay: float = 0.0, fail: bool = False):
+        super().__init__(name)
+        self._events = events
+        self._delay = delay
+        self._fail = fail
+
+    async def _initialize(self) -> None:
+        self._events.append(f"start:{self.metadata.name}")
+        await asyncio.sleep(self._delay)
+        if self._fail:
+            raise RuntimeError("boom")
+        self._events.append(f"ready:{self.metadata.name}")
+
+    async def _cleanup(self) -> None:
+        await asyncio.sleep(self._delay)
+        self._events.append(f"cleanup:{self.metadata.name}")
+
+
+@pytest.mark.asyncio
+async def test_initialize_all_starts_abilities_when_dependencies_ready():
+    """Test that abilities start as soon as their own dependencies finish."""
+    events: list[str] = []
+    registry = AbilityRegistry()
+    await registry.register(TimedAbility("slow", events, delay=0.2))
+    await registry.register(TimedAbility("fast", events, delay=0.01))
+    await registry.register(TimedAbility("child", events), dependencies=["fast"])
+    await registry.register(TimedAbility("late", events), dependencies=["slow", "child"])
+
+    results = await registry.initialize_all()
+
+    assert results == {"slow": True, "fast": True, "child": True, "late": True}
+    assert events.index("start:child") < events.index("ready:slow")
+    assert events.index("start:late") > events.index("ready:slow")
+
+
+@pytest.mark.asyncio
+async def test_initialize_all_skips_unsatisfied_dependencies():
+    """Test failed, missing, disabled and cyclic dependencies."""
+    events: list[str] = []
+    registry = AbilityRegistry()
+    await registry.register(TimedAbility("broken", events, fail=True))
+    await registry.register(TimedAbility("after_broken", events), dependencies=["broken"])
+    await registry.register(TimedAbility("orphan", events), dependencies=["missing"])
+    await registry.register(TimedAbility("off", events), enabled=False)
+    await registry.register(TimedAbility("needs_off", events), dependencies=["off"])
+    await registry.register(TimedAbility("a", events), dependencies=["b"])
+    await registry.register(TimedAbility("b", events), dependencies=["a"])
+    await registry.register(TimedAbility("ok", events))
+
+    results = await registry.initialize_all()
+
+    assert results == {
+        "a": False,
+        "after_broken": False,
+        "b": False,
+        "broken": False,
+        "needs_off": False,
+        "ok": True,
+        "orphan": False,
+    }
+    assert "start:after_broken" not in events
+
+
+@pytest.mark.asyncio
+async def test_cleanup_all_runs_in_reverse_order_with_timeout():
+    """Test that dependents clean up first and slow cleanups time out."""
+    events: list[str] = []
+    registry = AbilityRegistry()
+    await registry.register(TimedAbility("base", events))
+    await registry.register(TimedAbility("stuck", events, delay=5), dependencies=["base"])
+    await registry.register(TimedAbility("top", events), dependencies=["base"])
+    await registry.initialize_all()
+
+    results = await registry.cleanup_all(timeout=0.05)
+
+    assert results == {"base": True, "stuck": False, "top": True}
+    assert events.index("cleanup:top") < events.index("cleanup:base")
+
+
+@pytest.mark.asyncio
+async def test_cleanup_all_includes_blocked_abilities():
+    """Test that abilities in cycles or with missing dependencies are cleaned up."""
+    events: list[str] = []
+    registry = AbilityRegistry()
+    await registry.register(TimedAbility("base", events))
+    await registry.register(TimedAbility("a", events), dependencies=["b", "base"])
+    await registry.register(TimedAbility("b", events), dependencies=["a"])
+    await registry.register(TimedAbility("orphan", events), dependencies=["missing", "base"])
+    for name in ["base", "a", "b", "orphan"]:
+        await registry.get(name).initialize()  # e.g. on first use
+
+    results = await registry.cleanup_all()
+
+    assert results == {"a": True, "b": True, "base": True, "orphan": True}
+    assert events.index("cleanup:a") < events.index("cleanup:base")
+    assert events.index("cleanup:orphan") < events.index("cleanup:base")
+    assert not any(registry.get(name).is_initialized for name in results)
+
+
+@pytest.mark.asyncio
+async def test_lifecycle_initialize_with_dependencies():
+    """Test dependency-ordered initialization in the lifecycle manager."""
+    events: list[str] = []
+    abilities = {name: TimedAbility(name, events) for name in ["a", "b", "c", "d"]}
+    manager = LifecycleManager()
+
+    results = await manager.initialize_with_dependencies(
+        abilities, {"b": ["a"], "c": ["b"], "d": ["d"]}
+    )
+
+    assert results == {"a": True, "b": True, "c": True, "d": False}
+    assert events.index("ready:a") < events.index("start:b") < events.index("start:c")
+    assert manager.is_ready("c")
+
+
+LAZY_MODULE = """
+import asyncio
+
+from bruno_abilities.base.ability_base import AbilityResult, BaseAbility
+from bruno_abilities.base.metadata import AbilityMetadata
+
+EVENTS = []
+
+
+class CountingAbility(BaseAbility):
+    def __init__(self):
+        super().__init__()
+        EVENTS.append("construct")
+
+    @property
+    def metadata(self):
+        return AbilityMetadata(
+            name="counting", display_name="Counting", description="Counts", category="test"
+        )
+
+    async def _initialize(self):
+        await asyncio.sleep(0.01)
+        EVENTS.append("initialize")
+
+    async def _cleanup(self):
+        EVENTS.append("cleanup")
+
+    async def _execute(self, parameters, context):
+        return AbilityResult(success=True, data=len(EVENTS))
+
+
+# Whether FlakyAbility's configuration is available
+CONFIGURED = False
+
+
+class FlakyAbility(CountingAbility):
+    def __init__(self):
+        if not CONFIGURED:
+            raise RuntimeError("configuration not available")
+        super().__init__()
+"""
+
+
+@pytest.fixture
+def lazy_module(tmp_path, monkeypatch):
+    """Importable module defining an ability that records its lifecycle."""
+    module_name = f"lazy_counting_{tmp_path.name}"
+    (tmp_path / f"{module_name}.py").write_text(LAZY_MODULE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield module_name
+    sys.modules.pop(module_name, None)
+
+
+@pytest.mark.asyncio
+async def test_lazy_ability_loads_once_on_first_execute(lazy_module):
+    """Test that concurrent first calls share one import and initialization."""
+    metadata = AbilityMetadata(
+        name="counting", display_name="Counting", description="Counts", category="test"
+    )
+    ability = LazyAbility(metadata, lazy_module, "CountingAbility")
+    registry = AbilityRegistry()
+    await registry.register(ability)
+    await registry.initialize_all()
+
+    assert lazy_module not in sys.modules
+    assert registry.search("count") == [ability]
+
+    context = AbilityContext(user_id="u1")
+    results = await asyncio.gather(*(ability.execute({}, context) for _ in range(5)))
+
+    assert all(result.success for result in results)
+    assert sys.modules[lazy_module].EVENTS == ["construct", "initialize"]
+
+    await registry.cleanup_all()
+
+    assert sys.modules[lazy_module].EVENTS[-1] == "cleanup"
+    assert not ability.is_loaded
+
+
+@pytest.mark.asyncio
+async def test_lazy_ability_unloads_when_idle(lazy_module):
+    """Test that the idle policy cleans up and a later call reloads."""
+    metadata = AbilityMetadata(
+        name="counting", display_name="Counting", description="Counts", category="test"
+    )
+    ability = LazyAbility(metadata, lazy_module, "CountingAbility", idle_timeout=0.05)
+    context = AbilityContext(user_id="u1")
+
+    await ability.execute({}, context)
+    await asyncio.sleep(0.15)
+
+    events = sys.modules[lazy_module].EVENTS
+    assert events == ["construct", "initialize", "cleanup"]
+    assert not ability.is_loaded
+
+    assert (await ability.execute({}, context)).success
+    assert events[-2:] == ["construct", "initialize"]
+    await ability.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_lazy_ability_reports_load_errors():
+    """Test that a missing module fails the call instead of raising."""
+    metadata = AbilityMetadata(
+        name="missing", display_name="Missing", description="Missing", category="test"
+    )
+    ability = LazyAbility(metadata, "no_such_module_for_tests", "Missing")
+
+    result = await ability.execute({}, AbilityContext(user_id="u1"))
+
+    assert not result.success
+    assert "failed to load" in result.error
+
+
+def test_discover_lazy_defers_known_entry_points(lazy_module, monkeypatch):
+    """Test that entry points with known metadata become proxies."""
+    entry_points = [
+        importlib.metadata.EntryPoint(
+            name="counting", value=f"{lazy_module}:CountingAbility", group="bruno.abilities"
+        ),
+        importlib.metadata.EntryPoint(
+            name="other", value=f"{lazy_module}:CountingAbility", group="bruno.abilities"
+        ),
+    ]
+    monkeypatch.setattr(
+        AbilityDiscovery, "_select_entry_points", staticmethod(lambda: entry_points)
+    )
+    metadata = AbilityMetadata(
+        name="counting", display_name="Counting", description="Counts", category="test"
+    )
+
+    abilities = AbilityDiscovery.discover_lazy({"counting": metadata})
+
+    assert isinstance(abilities["counting"], LazyAbility)
+    assert not isinstance(abilities["other"], LazyAbility)
+    assert sys.modules[lazy_module].EVENTS == ["construct"]
+
+
+def test_discovery_cache_skips_entry_points_on_hit(lazy_module, tmp_path, monkeypatch):
+    """Test that a warm cache avoids the entry point scan and imports."""
+    entry_points = [
+        importlib.metadata.EntryPoint(
+            name="counting", value=f"{lazy_module}:CountingAbility", group="bruno.abilities"
+        )
+    ]
+    scans = []
+
+    def select_entry_points():
+        scans.append(1)
+        return entry_points
+
+    monkeypatch.setattr(AbilityDiscovery, "_select_entry_points", staticmethod(select_entry_points))
+    cache = DiscoveryCache(tmp_path / "cache" / "discovery.json")
+
+    cold = AbilityDiscovery.discover_cached(cache)
+
+    assert not isinstance(cold["counting"], LazyAbility)
+    assert scans == [1]
+
+    sys.modules.pop(lazy_module)
+    warm = AbilityDiscovery.discover_cached(cache)
+
+    assert scans == [1]
+    assert lazy_module not in sys.modules
+    assert isinstance(warm["counting"], LazyAbility)
+    assert warm["counting"].metadata == cold["counting"].metadata
+
+
+def test_discovery_cache_retries_failed_entry_points(lazy_module, tmp_path, monkeypatch):
+    """Test that an ability failing to instantiate is not cached as absent."""
+    entry_points = [
+        importlib.metadata.EntryPoint(
+            name="flaky", value=f"{lazy_module}:FlakyAbility", group="bruno.abilities"
+        )
+    ]
+    monkeypatch.setattr(
+        AbilityDiscovery, "_select_entry_points", staticmethod(lambda: entry_points)
+    )
+    cache = DiscoveryCache(tmp_path / "cache" / "discovery.json")
+
+    assert AbilityDiscovery.discover_cached(cache) == {}
+
+    sys.modules[lazy_module].CONFIGURED = True  # e.g. the missing setting is fixed
+    recovered = AbilityDiscovery.discover_cached(cache)
+
+    assert "flaky" in recovered
+    assert "flaky" in AbilityDiscovery.discover_cached(cache)
+
+
+def test_discovery_cache_invalidated_by_package_changes(tmp_path):
+    """Test that fingerprints change when distributions change."""
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "pkg-1.0.dist-info").mkdir()
+    cache = DiscoveryCache(tmp_path / "discovery.json")
+
+    before = DiscoveryCache.fingerprint([str(site)])
+    cache.store({"x": CachedAbility("x", "mod", "Cls")}, before)
+
+    assert cache.load(before)["x"].module_path == "mod"
+
+    (site / "pkg-1.0.dist-info").rename(site / "pkg-2.0.dist-info")
+    after = DiscoveryCache.fingerprint([str(site)])
+
+    assert after != before
+    assert cache.load(after) is None
+
+
+def test_discovery_cache_round_trips_parameter_types(tmp_path):
+    """Test that cached metadata keeps parameter types."""
+    from bruno_abilities.abilities.timer_ability import TimerAbility
+
+    metadata = TimerAbility().metadata
+    cache = DiscoveryCache(tmp_path / "discovery.json")
+    cache.store({"timer": CachedAbility("timer", "m", "C", metadata)}, "fp")
+
+    assert cache.load("fp")["timer"].metadata == metadata
+
+
+class VersionedAbility(StubAbility):
+    """Stub ability with a slow execute and exportable state."""
+
+    def __init__(self, version: int, delay: float = 0.0):
+        super().__init__("versioned", aliases=["ver"])
+        self.version = version
+        self.delay = delay
+        self.counter = 0
+        self.cleaned_up_with_in_flight: int | None = None
+
+    async def _execute(self, parameters: dict, context: AbilityContext) -> AbilityResult:
+        self.counter += 1
+        await asyncio.sleep(self.delay)
+        return AbilityResult(success=True, data=self.version)
+
+    async def _cleanup(self) -> None:
+        self.cleaned_up_with_in_flight = self.in_flight
+
+    async def export_state(self) -> dict:
+        return {"counter": self.counter}
+
+    async def import_state(self, state: dict) -> None:
+        self.counter = state["counter"]
+
+
+@pytest.mark.asyncio
+async def test_replace_drains_in_flight_executions():
+    """Test that in-flight calls finish on the old instance before cleanup."""
+    registry = AbilityRegistry()
+    old = VersionedAbility(1, delay=0.1)
+    await registry.register(old, dependencies=["other"])
+    context = AbilityContext(user_id="u1")
+
+    in_flight = asyncio.create_task(registry.get("ver").execute({}, context))
+    await asyncio.sleep(0.01)
+
+    new = VersionedAbility(2)
+    await registry.replace("versioned", new)
+
+    assert registry.get("ver") is new
+    assert new.is_initialized
+    assert new.counter == 1
+    assert registry.get_dependencies("versioned") == ["other"]
+    assert (await registry.get("versioned").execute({}, context)).data == 2
+    assert old.cleaned_up_with_in_flight is None
+
+    assert (await in_flight).data == 1
+    await registry.wait_retired()
+
+    assert old.cleaned_up_with_in_flight == 0
+    assert not old.is_initialized
+
+
+@pytest.mark.asyncio
+async def test_replace_validates_target():
+    """Test replace errors for unknown names and mismatched instances."""
+    registry = AbilityRegistry()
+    await registry.register(VersionedAbility(1))
+
+    with pytest.raises(KeyError):
+        await registry.replace("missing", StubAbility("missing"))
+    with pytest.raises(ValueError):
+        await registry.replace("versioned", StubAbility("other"))
+
+
+@pytest.mark.asyncio
+async def test_unregister_cleans_up_after_drain_outside_lock():
+    """Test that unregister does not hold the lock while draining."""
+    registry = AbilityRegistry()
+    old = VersionedAbility(1, delay=0.1)
+    await registry.register(old)
+    in_flight = asyncio.create_task(old.execute({}, AbilityContext(user_id="u1")))
+    await asyncio.sleep(0.01)
+
+    unregister = asyncio.create_task(registry.unregister("versioned"))
+    await asyncio.sleep(0.01)
+
+    assert registry.get("versioned", fuzzy=False) is None
+    await asyncio.wait_for(registry.register(StubAbility("weather")), timeout=0.05)
+
+    await unregister
+    assert (await in_flight).success
+    assert old.cleaned_up_with_in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_offload_cpu_bound_routes_users_to_sticky_workers():
+    """Test that CPU-bound abilities run in workers pinned per user."""
+    registry = AbilityRegistry()
+    await registry.register(TodoAbility())
+    await registry.register(StubAbility("timer"))
+    pool = WorkerPool(size=2)
+    users = ["alice", "bob"]
+    assert pool.worker_index(users[0]) != pool.worker_index(users[1])
+
+    try:
+        assert await registry.offload_cpu_bound(pool) == ["todo"]
+        todo = registry.get("todo")
+        assert isinstance(todo, WorkerAbility)
+
+        for user in users:
+            context = AbilityContext(user_id=user)
+            created = await todo.execute({"action": "create", "title": f"{user} task"}, context)
+            assert created.success, created.error
+
+        for user in users:
+            listed = await todo.execute({"action": "list"}, AbilityContext(user_id=user))
+            assert [task["title"] for task in listed.data["tasks"]] == [f"{user} task"]
+
+        invalid = await todo.execute({}, AbilityContext(user_id="alice"))
+        assert not invalid.success
+    finally:
+        await pool.close()
+
+    with pytest.raises(RuntimeError):
+        await pool.execute("m", "C", {}, AbilityContext(user_id="alice"))
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_starts_workers_off_the_event_loop():
+    """Test that starting workers leaves the event loop responsive."""
+    pool = WorkerPool(size=2)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0)
+
+    ticker = asyncio.create_task(tick())
+    try:
+        # Concurrent first requests to a worker start it once
+        workers = await asyncio.gather(*(pool._get_worker(index) for index in [0, 0, 1, 1]))
+        assert workers[0] is workers[1] and workers[2] is workers[3]
+        assert workers[0] is not workers[2]
+
+        await pool.start()  # Already running workers are kept
+        assert pool._workers == [workers[0], workers[2]]
+    finally:
+        ticker.cancel()
+        await pool.close()
+
+    assert ticks > 1
@@ -0,0 +1,589 @@
+"""Tests for the state manager and its persistence codecs."""
+
+import asyncio
+import json
+import os
+import pickle
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from bruno_abilities.base.deadline import DeadlineExceededError, deadline_scope
+from bruno_abilities.base.tracing import SpanCollector, set_collector
+from bruno_abilities.infrastructure import (
+    CodecRegistry,
+    FileStateBackend,
+    StateCodec,
+    StateConflictError,
+    StateManager,
+    StateScope,
+)
+from bruno_abilities.schemas import Task, TaskStatus
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """State manager persisting into a temporary directory."""
+    return StateManager(storage_path=tmp_path)
+
+
+def test_codec_roundtrip_primitives():
+    """Test that primitive records survive an encode/decode cycle."""
+    codec = StateCodec()
+    record = {"key": "k", "value": {"a": [1, 2.5, None, True, "x", b"raw"]}}
+
+    data = codec.encode(record)
+
+    assert data[0] == 1  # format version byte
+    assert codec.decode(data) == record
+
+
+def test_codec_roundtrip_custom_types():
+    """Test that registered types are restored."""
+    codec = StateCodec()
+    now = datetime.now()
+    task = Task(task_id="t1", title="Write tests", user_id="u1", created_at=now, updated_at=now)
+    record = {
+        "value": {
+            "when": now,
+            "duration": timedelta(minutes=5, microseconds=7),
+            "pair": (1, 2),
+            "ids": {"a", "b"},
+            "task": task,
+        }
+    }
+
+    decoded = codec.decode(codec.encode(record))["value"]
+
+    assert decoded["when"] == now
+    assert decoded["duration"] == timedelta(minutes=5, microseconds=7)
+    assert decoded["pair"] == (1, 2)
+    assert decoded["ids"] == {"a", "b"}
+    assert decoded["task"] == task
+    assert decoded["task"].status == TaskStatus.TODO
+
+
+def test_codec_roundtrips_registered_enums():
+    """Test that registered enums come back as members, others as values."""
+    codec = StateCodec()
+    record = {"status": TaskStatus.COMPLETED, "scope": StateScope.USER}
+
+    decoded = codec.decode(codec.encode(record))
+
+    assert decoded["status"] is TaskStatus.COMPLETED
+    assert type(decoded["scope"]) is str
+    assert decoded["scope"] == "user"
+
+
+def test_codec_dict_keys():
+    """Test that primitive-like keys are stored and other keys are rejected."""
+    codec = StateCodec()
+    record = {"value": {TaskStatus.COMPLETED: 1, (1, "a"): 2, 3: 3}}
+
+    assert codec.decode(codec.encode(record)) == {"value": {"completed": 1, (1, "a"): 2, 3: 3}}
+    with pytest.raises(TypeError):
+        codec.encode({"value": {date(2025, 1, 1): 1}})
+
+
+def test_codec_compresses_large_records():
+    """Test that records above the threshold are compressed."""
+    codec = StateCodec(compress_threshold=64)
+    record = {"value": "x" * 10_000}
+
+    data = codec.encode(record)
+
+    assert len(data) < 1_000
+    assert codec.decode(data) == record
+
+
+def test_codec_rejects_unregistered_types():
+    """Test that unknown types fail instead of falling back to pickle."""
+
+    class Opaque:
+        pass
+
+    with pytest.raises(TypeError):
+        StateCodec().encode({"value": Opaque()})
+
+
+def test_codec_rejects_unknown_tags():
+    """Test that decoding only restores registered tags."""
+    writer = StateCodec()
+    reader = StateCodec(registry=CodecRegistry())
+
+    with pytest.raises(ValueError):
+        reader.decode(writer.encode({"value": timedelta(seconds=1)}))
+
+
+def test_codec_decodes_legacy_json():
+    """Test that legacy JSON records still load."""
+    record = {"key": "k", "value": [1, 2, 3]}
+
+    assert StateCodec().decode(json.dumps(record, indent=2).encode()) == record
+
+
+@pytest.mark.asyncio
+async def test_persisted_state_reloads(tmp_path):
+    """Test that persisted values are reloaded by a fresh manager."""
+    now = datetime.now()
+    manager = StateManager(storage_path=tmp_path)
+    await manager.set("last_run", now, scope=StateScope.USER, user_id="u1")
+
+    reloaded = StateManager(storage_path=tmp_path)
+    value = await reloaded.get("last_run", scope=StateScope.USER, user_id="u1")
+
+    assert value == now
+    assert list((tmp_path / "user").glob("*.state"))
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_record_loads(tmp_path):
+    """Test that records written by older versions are still readable."""
+    scope_dir = tmp_path / "user"
+    scope_dir.mkdir()
+    record = {
+        "key": "count",
+        "value": 3,
+        "scope": "user",
+        "ability_name": None,
+        "user_id": "u1",
+        "session_id": None,
+        "created_at": 1.0,
+        "updated_at": 1.0,
+        "metadata": {},
+    }
+    (scope_dir / "count_user_u1.json").write_text(json.dumps(record, indent=2))
+
+    manager = StateManager(storage_path=tmp_path)
+
+    assert await manager.get("count", scope=StateScope.USER, user_id="u1") == 3
+
+    await manager.set("count", 4, scope=StateScope.USER, user_id="u1")
+    assert not (scope_dir / "count_user_u1.json").exists()
+
+
+def _write_legacy_pickle(scope_dir, value):
+    """Write a record the way versions using pickle persisted state."""
+    scope_dir.mkdir(exist_ok=True)
+    record = {
+        "key": "count",
+        "value": value,
+        "scope": StateScope.USER,
+        "ability_name": None,
+        "user_id": "u1",
+        "session_id": None,
+        "created_at": 1.0,
+        "updated_at": 1.0,
+        "metadata": {},
+    }
+    pickle_path = scope_dir / "count_user_u1.pkl"
+    pickle_path.write_bytes(pickle.dumps(record))
+    return pickle_path
+
+
+@pytest.mark.asyncio
+async def test_legacy_pickle_record_kept_without_opt_in(tmp_path):
+    """Test that pickle records are neither loaded nor deleted by default."""
+    pickle_path = _write_legacy_pickle(tmp_path / "user", 3)
+    original = pickle_path.read_bytes()
+    manager = StateManager(storage_path=tmp_path)
+
+    assert await manager.get("count", scope=StateScope.USER, user_id="u1") is None
+
+    await manager.set("count", 4, scope=StateScope.USER, user_id="u1")
+    assert pickle_path.read_bytes() == original
+
+
+@pytest.mark.asyncio
+async def test_legacy_pickle_record_migrated_with_opt_in(tmp_path):
+    """Test that opting in loads pickle records and rewrites them once."""
+    pickle_path = _write_legacy_pickle(tmp_path / "user", {"due": datetime(2025, 1, 1)})
+    manager = StateManager(storage_path=tmp_path, migrate_pickle=True)
+
+    value = await manager.get("count", scope=StateScope.USER, user_id="u1")
+
+    assert value == {"due": datetime(2025, 1, 1)}
+    assert not pickle_path.exists()
+    reloaded = StateManager(storage_path=tmp_path)
+    assert await reloaded.get("count", scope=StateScope.USER, user_id="u1") == value
+
+
+@pytest.mark.asyncio
+async def test_legacy_pickle_record_with_unsupported_keys_stays_readable(tmp_path):
+    """Test that a pickle record the codec cannot store is loaded and kept."""
+    pickle_path = _write_legacy_pickle(tmp_path / "user", {date(2025, 1, 1): 1})
+    manager = StateManager(storage_path=tmp_path, migrate_pickle=True)
+
+    value = await manager.get("count", scope=StateScope.USER, user_id="u1")
+
+    assert value == {date(2025, 1, 1): 1}
+    assert pickle_path.exists()
+
+
+@pytest.mark.asyncio
+async def test_delete_removes_persisted_record(state_manager, tmp_path):
+    """Test that deleting a key removes its file."""
+    await state_manager.set("k", "v", scope=StateScope.GLOBAL)
+
+    assert await state_manager.delete("k", scope=StateScope.GLOBAL)
+    assert not list((tmp_path / "global").iterdir())
+
+
+@pytest.mark.asyncio
+async def test_set_many_and_get_many(state_manager):
+    """Test bulk writes and reads."""
+    await state_manager.set_many(
+        {"task:1": "a", "task:2": "b"}, scope=StateScope.USER, user_id="u1"
+    )
+
+    values = await state_manager.get_many(
+        ["task:1", "task:2", "task:3"], scope=StateScope.USER, user_id="u1", default="-"
+    )
+
+    assert values == {"task:1": "a", "task:2": "b", "task:3": "-"}
+
+
+@pytest.mark.asyncio
+async def test_delete_many_counts_unloaded_entries(tmp_path):
+    """Test that bulk deletes reach persisted entries that were never loaded."""
+    writer = StateManager(storage_path=tmp_path)
+    await writer.set_many({"a": 1, "b": 2}, scope=StateScope.USER, user_id="u1")
+
+    manager = StateManager(storage_path=tmp_path)
+    deleted = await manager.delete_many(["a", "b", "c"], scope=StateScope.USER, user_id="u1")
+
+    assert deleted == 2
+    assert await manager.get("a", scope=StateScope.USER, user_id="u1") is None
+
+
+@pytest.mark.asyncio
+async def test_scan_includes_persisted_entries(tmp_path):
+    """Test prefix scans over loaded and persisted entries."""
+    writer = StateManager(storage_path=tmp_path)
+    await writer.set_many({"task:1": "a", "task:2": "b"}, scope=StateScope.USER, user_id="u1")
+    await writer.set("task:9", "other", scope=StateScope.USER, user_id="u2")
+    await writer.set("note:1", "n", scope=StateScope.USER, user_id="u1")
+
+    manager = StateManager(storage_path=tmp_path)
+    results = [item async for item in manager.scan("task:", StateScope.USER, user_id="u1")]
+
+    assert results == [("task:1", "a"), ("task:2", "b")]
+
+
+@pytest.mark.asyncio
+async def test_transaction_commits_on_exit(state_manager, tmp_path):
+    """Test that transactions apply all changes in one journaled write."""
+    await state_manager.set("old", 1, scope=StateScope.GLOBAL)
+
+    async with state_manager.transaction() as txn:
+        txn.set("new", 2, scope=StateScope.GLOBAL)
+        txn.delete("old", scope=StateScope.GLOBAL)
+        assert await state_manager.get("new", scope=StateScope.GLOBAL) is None
+
+    assert await state_manager.get("new", scope=StateScope.GLOBAL) == 2
+    assert await state_manager.get("old", scope=StateScope.GLOBAL) is None
+    assert not (tmp_path / FileStateBackend.JOURNAL_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_transaction_discards_on_error(state_manager):
+    """Test that a failing transaction block applies nothing."""
+    with pytest.raises(RuntimeError):
+        async with state_manager.transaction() as txn:
+            txn.set("k", "v", scope=StateScope.GLOBAL)
+            raise RuntimeError("boom")
+
+    assert await state_manager.get("k", scope=StateScope.GLOBAL) is None
+
+
+def test_backend_replays_interrupted_batch(tmp_path):
+    """Test that a leftover journal is applied when the backend opens."""
+    codec = StateCodec()
+    record = {"key": "k", "value": 1, "scope": "global"}
+    journal = {"puts": [["global", "k", record]], "deletes": []}
+    (tmp_path / FileStateBackend.JOURNAL_NAME).write_bytes(codec.encode(journal))
+
+    backend = FileStateBackend(tmp_path, codec)
+
+    assert backend.load("global", "k") == record
+    assert not (tmp_path / FileStateBackend.JOURNAL_NAME).exists()
+
+
+@pytest.mark.asyncio
+async def test_clear_scope_includes_unloaded_entries(tmp_path):
+    """Test that filtered clears reach persisted entries through the index."""
+    writer = StateManager(storage_path=tmp_path)
+    await writer.set_many({"a": 1, "b": 2}, scope=StateScope.USER, user_id="u1")
+    await writer.set("a", 3, scope=StateScope.USER, user_id="u2")
+
+    manager = StateManager(storage_path=tmp_path)
+    await manager.get("a", scope=StateScope.USER, user_id="u1")
+
+    assert await manager.clear_scope(StateScope.USER, user_id="u1") == 2
+    assert await manager.get("b", scope=StateScope.USER, user_id="u1") is None
+    assert await manager.get("a", scope=StateScope.USER, user_id="u2") == 3
+
+
+@pytest.mark.asyncio
+async def test_clear_scope_by_session(state_manager):
+    """Test session teardown through the in-memory index."""
+    await state_manager.set("draft", "x", session_id="s1", ability_name="notes")
+    await state_manager.set("draft", "y", session_id="s2", ability_name="notes")
+
+    assert await state_manager.clear_scope(StateScope.SESSION, session_id="s1") == 1
+    assert await state_manager.get("draft", session_id="s2", ability_name="notes") == "y"
+
+
+@pytest.mark.asyncio
+async def test_purge_user_across_scopes(tmp_path):
+    """Test that a user purge removes entries from every scope."""
+    manager = StateManager(storage_path=tmp_path)
+    await manager.set("prefs", {}, scope=StateScope.USER, user_id="u1")
+    await manager.set("counter", 1, scope=StateScope.ABILITY, ability_name="todo", user_id="u1")
+    await manager.set("shared", 1, scope=StateScope.GLOBAL)
+
+    assert await manager.purge_user("u1") == 2
+    assert await manager.get("shared", scope=StateScope.GLOBAL) == 1
+
+
+@pytest.mark.asyncio
+async def test_rebuild_indexes_covers_legacy_records(tmp_path):
+    """Test that records without index entries become purgeable."""
+    scope_dir = tmp_path / "user"
+    scope_dir.mkdir()
+    record = {
+        "key": "count",
+        "value": 3,
+        "scope": "user",
+        "user_id": "u1",
+        "created_at": 1.0,
+        "updated_at": 1.0,
+    }
+    (scope_dir / "count_user_u1.json").write_text(json.dumps(record))
+
+    manager = StateManager(storage_path=tmp_path)
+    await manager.rebuild_indexes()
+
+    assert await manager.clear_scope(StateScope.USER, user_id="u1") == 1
+    assert not (scope_dir / "count_user_u1.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_multiprocess_readers_see_other_writers(tmp_path):
+    """Test that cached entries are reloaded after another writer changes them."""
+    writer = StateManager(storage_path=tmp_path, multiprocess=True)
+    reader = StateManager(storage_path=tmp_path, multiprocess=True)
+
+    await writer.set("count", 1, scope=StateScope.USER, user_id="u1")
+    assert await reader.get("count", scope=StateScope.USER, user_id="u1") == 1
+
+    await writer.set("count", 2, scope=StateScope.USER, user_id="u1")
+    assert await reader.get("count", scope=StateScope.USER, user_id="u1") == 2
+
+    await writer.delete("count", scope=StateScope.USER, user_id="u1")
+    assert await reader.get("count", scope=StateScope.USER, user_id="u1") is None
+
+
+@pytest.mark.asyncio
+async def test_multiprocess_changelog_rotation_invalidates_cache(tmp_path):
+    """Test that a rotated change log drops every cached entry."""
+    writer = StateManager(
+        backend=FileStateBackend(tmp_path, multiprocess=True, max_changelog_bytes=64)
+    )
+    reader = StateManager(storage_path=tmp_path, multiprocess=True)
+
+    await writer.set("a", 1, scope=StateScope.GLOBAL)
+    assert await reader.get("a", scope=StateScope.GLOBAL) == 1
+
+    for value in range(2, 6):
+        await writer.set("a", value, scope=StateScope.GLOBAL)
+
+    assert await reader.get("a", scope=StateScope.GLOBAL) == 5
+
+
+def test_multiprocess_poll_skips_own_changes(tmp_path):
+    """Test that a backend does not report its own writes."""
+    first = FileStateBackend(tmp_path, multiprocess=True)
+    second = FileStateBackend(tmp_path, multiprocess=True)
+
+    first.write("global", "k", {"key": "k", "value": 1})
+
+    assert first.poll_changes() == set()
+    assert second.poll_changes() == {("global", "k")}
+    assert second.poll_changes() == set()
+
+
+def _record_sync_calls(monkeypatch) -> list[str]:
+    """Record fsync and replace calls made by the backend."""
+    calls = []
+    real_fsync, real_replace = os.fsync, os.replace
+    monkeypatch.setattr(os, "fsync", lambda fd: calls.append("fsync") or real_fsync(fd))
+    monkeypatch.setattr(os, "replace", lambda *a: calls.append("replace") or real_replace(*a))
+    return calls
+
+
+def test_backend_syncs_records_before_rename(tmp_path, monkeypatch):
+    """Test that durable record files and their directory are synced around the rename."""
+    calls = _record_sync_calls(monkeypatch)
+
+    FileStateBackend(tmp_path, durable=True).write("global", "k", {"key": "k", "value": 1})
+
+    assert calls == ["fsync", "replace", "fsync"]
+
+
+def test_backend_skips_record_sync_by_default(tmp_path, monkeypatch):
+    """Test that single-process writes are not synced unless durable."""
+    calls = _record_sync_calls(monkeypatch)
+
+    FileStateBackend(tmp_path).write("user", "k", {"key": "k", "value": 1, "user_id": "u"})
+
+    assert "fsync" not in calls
+    assert FileStateBackend(tmp_path, multiprocess=True).durable
+
+
+def test_backend_syncs_index_markers_when_durable(tmp_path, monkeypatch):
+    """Test that durable writes also sync the index markers."""
+    calls = _record_sync_calls(monkeypatch)
+
+    FileStateBackend(tmp_path, durable=True).write(
+        "user", "k", {"key": "k", "value": 1, "user_id": "u"}
+    )
+
+    assert calls == ["fsync", "replace", "fsync"] * 2
+
+
+def test_backend_syncs_batches_by_default(tmp_path, monkeypatch):
+    """Test that batch journals and their records are synced in every mode."""
+    calls = _record_sync_calls(monkeypatch)
+
+    FileStateBackend(tmp_path).write_batch(
+        [("global", "a", {"key": "a", "value": 1}), ("global", "b", {"key": "b", "value": 2})],
+        [],
+    )
+
+    # Journal, then both records, each synced around its rename
+    assert calls == ["fsync", "replace", "fsync"] * 3
+
+
+def test_backend_close_releases_lock_fd(tmp_path):
+    """Test that closing a multi-process backend closes its lock file."""
+    backend = FileStateBackend(tmp_path, multiprocess=True)
+    backend.write("global", "k", {"key": "k", "value": 1})
+    lock_fd = backend._lock_fd
+
+    backend.close()
+
+    with pytest.raises(OSError):
+        os.fstat(lock_fd)
+    backend.write("global", "k", {"key": "k", "value": 2})  # Reopened on demand
+    assert backend.load("global", "k")["value"] == 2
+    backend.close()
+
+
+@pytest.mark.asyncio
+async def test_entry_versions_increase(tmp_path):
+    """Test that every write bumps the entry version, across reloads."""
+    manager = StateManager(storage_path=tmp_path)
+    assert await manager.get_with_version("k", scope=StateScope.GLOBAL) == (None, 0)
+
+    await manager.set("k", "a", scope=StateScope.GLOBAL)
+    await manager.set("k", "b", scope=StateScope.GLOBAL)
+
+    reloaded = StateManager(storage_path=tmp_path)
+    assert await reloaded.get_with_version("k", scope=StateScope.GLOBAL) == ("b", 2)
+
+    await reloaded.set_many({"k": "c"}, scope=StateScope.GLOBAL)
+    assert await reloaded.get_with_version("k", scope=StateScope.GLOBAL) == ("c", 3)
+
+
+@pytest.mark.asyncio
+async def test_compare_and_set(state_manager):
+    """Test that stale versions are rejected."""
+    assert await state_manager.compare_and_set("k", 0, "first", scope=StateScope.USER, user_id="u1")
+    assert not await state_manager.compare_and_set(
+        "k", 0, "stale", scope=StateScope.USER, user_id="u1"
+    )
+    assert await state_manager.compare_and_set(
+        "k", 1, "second", scope=StateScope.USER, user_id="u1"
+    )
+
+    assert await state_manager.get("k", scope=StateScope.USER, user_id="u1") == "second"
+
+
+@pytest.mark.asyncio
+async def test_update_concurrent_increments(state_manager):
+    """Test that concurrent optimistic updates do not lose increments."""
+
+    async def slow_increment(value):
+        await asyncio.sleep(0)
+        return value + 1
+
+    await asyncio.gather(
+        *(
+            state_manager.update("count", slow_increment, default=0, max_attempts=20)
+            for _ in range(10)
+        )
+    )
+
+    assert await state_manager.get("count") == 10
+
+
+@pytest.mark.asyncio
+async def test_update_raises_after_repeated_conflicts(state_manager):
+    """Test that update gives up when it keeps losing."""
+
+    async def interfering(value):
+        await state_manager.set("k", "other")
+        return "mine"
+
+    with pytest.raises(StateConflictError):
+        await state_manager.update("k", interfering, max_attempts=3)
+
+
+@pytest.mark.asyncio
+async def test_multiprocess_compare_and_set_sees_other_writers(tmp_path):
+    """Test that version checks use the stored record in multi-process mode."""
+    first = StateManager(storage_path=tmp_path, multiprocess=True)
+    second = StateManager(storage_path=tmp_path, multiprocess=True)
+
+    await first.set("k", 1, scope=StateScope.GLOBAL)
+    _, version = await second.get_with_version("k", scope=StateScope.GLOBAL)
+    await first.set("k", 2, scope=StateScope.GLOBAL)
+
+    assert not await second.compare_and_set("k", version, 3, scope=StateScope.GLOBAL)
+    assert await second.update("k", lambda n: n + 10, scope=StateScope.GLOBAL) == 12
+
+
+@pytest.mark.asyncio
+async def test_state_operations_emit_spans(state_manager):
+    """Test that state operations and backend I/O are traced."""
+    collector = SpanCollector()
+    set_collector(collector)
+    try:
+        await state_manager.set("k", 1, scope=StateScope.USER, user_id="u1")
+    finally:
+        set_collector(None)
+
+    spans = {span.name: span for span in collector.spans()}
+    write = spans["state.backend.write"]
+    assert write.parent_id == spans["state.set"].context.span_id
+    assert write.attributes == {"state.scope": "user"}
+
+
+@pytest.mark.asyncio
+async def test_state_access_honors_deadline(state_manager):
+    """Test that state operations fail fast past the deadline and leave state unchanged."""
+    await state_manager.set("key", "old", scope=StateScope.USER, user_id="u1")
+
+    with deadline_scope(time.time() - 1):
+        with pytest.raises(DeadlineExceededError):
+            await state_manager.set("key", "new", scope=StateScope.USER, user_id="u1")
+
+    assert await state_manager.get("key", scope=StateScope.USER, user_id="u1") == "old"
+
+    # Waiting for the state lock stops at the deadline
+    async with state_manager._lock:
+        with deadline_scope(time.time() + 0.05):
+            with pytest.raises(DeadlineExceededError):
+                await state_manager.get("key", scope=StateScope.USER, user_id="u1")